@@ -68,11 +68,9 @@ async def store_chat_batch(
     )
     
     # Get the latest timestamp for unique identifier
-    if chat_messages and any(msg.get("date") for msg in chat_messages):
-        latest_timestamp_str = max(
-            msg["date"] for msg in chat_messages if msg.get("date")
-        )
-        batch_timestamp = latest_timestamp_str
+    dates = [msg["date"] for msg in chat_messages if msg.get("date")]
+    if dates:
+        batch_timestamp = max(dates)
     else:
         batch_timestamp = datetime.now().isoformat()
     
@@ -96,7 +94,8 @@ async def store_chat_batch(
     
     SessionLocal = db_manager.get_session_factory()
     
-    with SessionLocal() as db:
+    # Keep committed attributes loaded so reading the generated ids does not re-SELECT
+    with SessionLocal(expire_on_commit=False) as db:
         # Check if source data already exists by content hash
         existing_source = (
             db.query(SourceData)
@@ -152,7 +151,6 @@ async def store_chat_batch(
         
         db.add(source_data)
         db.commit()
-        db.refresh(source_data)
 
         raw_data_source = RawDataSource(
             topic_name=topic_name,
@@ -171,8 +169,6 @@ async def store_chat_batch(
         
         db.add(raw_data_source)
         db.commit()
-        db.refresh(raw_data_source)
-        db.refresh(content_store)
         
         logger.info(f"Stored chat batch as SourceData: {source_data.id} and RawDataSource: {raw_data_source.id}")
         
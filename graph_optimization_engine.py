@@ -22,8 +22,9 @@ from pathlib import Path
 import os
 
 from knowledge_graph.query import search_relationships_by_vector_similarity
+from setting.base import GRAPH_OPTIMIZATION_LLM_PROVIDER, GRAPH_OPTIMIZATION_LLM_MODEL
 from setting.db import db_manager
-from opt.helper import GRAPH_OPTIMIZATION_ACTION_SYSTEM_PROMPT_WO_MR, extract_issues
+from opt.helper import detect_graph_issues
 from opt.evaluator import batch_evaluate_issues, Issue
 from llm.factory import LLMInterface
 from knowledge_graph.models import Entity, Relationship, SourceGraphMapping
@@ -44,8 +45,8 @@ logger = logging.getLogger(__name__)
 class LLMConfig:
     """LLM configuration for optimization and critique"""
 
-    optimization_provider: str = "openai_like"
-    optimization_model: str = "graph_optimization_14b"
+    optimization_provider: str = GRAPH_OPTIMIZATION_LLM_PROVIDER
+    optimization_model: str = GRAPH_OPTIMIZATION_LLM_MODEL
     critique_provider: str = "bedrock"
     critique_model: str = "us.anthropic.claude-sonnet-4-20250514-v1:0"
     max_tokens: Optional[int] = None
@@ -122,25 +123,25 @@ class VectorSearchGraphProvider(GraphDataProvider):
             entities = {}
             relationships = {}
 
-            for index, row in res.iterrows():
-                entities[row["source_entity_id"]] = {
-                    "id": row["source_entity_id"],
-                    "name": row["source_entity_name"],
-                    "description": row["source_entity_description"],
-                    "attributes": row["source_entity_attributes"],
+            for row in res.itertuples(index=False):
+                entities[row.source_entity_id] = {
+                    "id": row.source_entity_id,
+                    "name": row.source_entity_name,
+                    "description": row.source_entity_description,
+                    "attributes": row.source_entity_attributes,
                 }
-                entities[row["target_entity_id"]] = {
-                    "id": row["target_entity_id"],
-                    "name": row["target_entity_name"],
-                    "description": row["target_entity_description"],
-                    "attributes": row["target_entity_attributes"],
+                entities[row.target_entity_id] = {
+                    "id": row.target_entity_id,
+                    "name": row.target_entity_name,
+                    "description": row.target_entity_description,
+                    "attributes": row.target_entity_attributes,
                 }
-                relationships[row["id"]] = {
-                    "id": row["id"],
-                    "source_entity": row["source_entity_name"],
-                    "target_entity": row["target_entity_name"],
-                    "description": row["relationship_desc"],
-                    "attributes": row["attributes"],
+                relationships[row.id] = {
+                    "id": row.id,
+                    "source_entity": row.source_entity_name,
+                    "target_entity": row.target_entity_name,
+                    "description": row.relationship_desc,
+                    "attributes": row.attributes,
                 }
 
             return GraphData(
@@ -175,14 +176,7 @@ class IssueDetector:
     ) -> List[Issue]:
         """Detect quality issues in the provided graph data"""
         try:
-            prompt = (
-                GRAPH_OPTIMIZATION_ACTION_SYSTEM_PROMPT_WO_MR
-                + " Now Optimize the following graph:\n"
-                + json.dumps(graph_data.to_dict(), indent=2, ensure_ascii=False)
-            )
-
-            response = self.llm_client.generate(prompt)
-            analysis_list = extract_issues(response)
+            analysis_list = detect_graph_issues(self.llm_client, graph_data.to_dict())
 
             issues = []
             for analysis in analysis_list.values():
@@ -2,6 +2,7 @@ import uuid
 from sqlalchemy import (
     BigInteger,
     Column,
+    Computed,
     String,
     Text,
     ForeignKey,
@@ -12,7 +13,7 @@ from sqlalchemy import (
 )
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.dialects.mysql import LONGTEXT
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import deferred, relationship
 from sqlalchemy.sql import func
 
 from tidb_vector.sqlalchemy import VectorType
@@ -257,6 +258,18 @@ class KnowledgeBlock(Base):
         comment="SHA-256 hash for deduplication",
     )
     attributes = Column(JSON, nullable=True)
+    # Generated from attributes so topic-scoped vector searches can use an index.
+    # VIRTUAL since TiDB can only add stored generated columns at table creation;
+    # deferred so ORM loads do not depend on the column having been migrated.
+    topic_name = deferred(
+        Column(
+            String(255),
+            Computed(
+                "JSON_UNQUOTE(JSON_EXTRACT(attributes, '$.topic_name'))",
+                persisted=False,
+            ),
+        )
+    )
     created_at = Column(DateTime, default=func.current_timestamp())
     updated_at = Column(
         DateTime, default=func.current_timestamp(), onupdate=func.current_timestamp()
@@ -271,6 +284,12 @@ class KnowledgeBlock(Base):
         Index("idx_knowledge_blocks_hash", "hash"),
         Index("idx_knowledge_blocks_type", "knowledge_type"),
         Index("idx_knowledge_blocks_name", "name"),
+        Index(
+            "idx_knowledge_blocks_topic_type_created",
+            "topic_name",
+            "knowledge_type",
+            "created_at",
+        ),
     )
 
     def __repr__(self):
@@ -311,6 +330,18 @@ class Relationship(Base):
     # fixed 4096 dimension embedding for knowledge graph, fix it later
     relationship_desc_vec = Column(VectorType(4096), nullable=True)
     attributes = Column(JSON, nullable=True)
+    # Generated from attributes so topic-scoped vector searches can use an index.
+    # VIRTUAL since TiDB can only add stored generated columns at table creation;
+    # deferred so ORM loads do not depend on the column having been migrated.
+    topic_name = deferred(
+        Column(
+            String(255),
+            Computed(
+                "JSON_UNQUOTE(JSON_EXTRACT(attributes, '$.topic_name'))",
+                persisted=False,
+            ),
+        )
+    )
     created_at = Column(DateTime, default=func.current_timestamp())
     updated_at = Column(
         DateTime, default=func.current_timestamp(), onupdate=func.current_timestamp()
@@ -324,6 +355,7 @@ class Relationship(Base):
         Index("idx_relationships_source", "source_entity_id"),
         Index("idx_relationships_target", "target_entity_id"),
         Index("idx_relationships_pair", "source_entity_id", "target_entity_id"),
+        Index("idx_relationships_topic_created", "topic_name", "created_at"),
     )
 
     def __repr__(self):
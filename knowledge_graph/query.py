@@ -2,7 +2,7 @@ import logging
 import pandas as pd
 from typing import List, Dict, Optional
 from sqlalchemy.orm import Session
-from sqlalchemy import text, func
+from sqlalchemy import text, func, bindparam
 from sqlalchemy.orm import joinedload
 from sqlalchemy.orm import aliased
 
@@ -12,11 +12,39 @@ from knowledge_graph.models import (
     AnalysisBlueprint,
     SourceGraphMapping,
 )
+from tidb_vector.sqlalchemy import VectorType
 from setting.db import SessionLocal, db_manager
 from llm.embedding import get_text_embedding
 
 logger = logging.getLogger(__name__)
 
+# Built once at import; query_vector is bound as a vector so embeddings can be
+# passed as-is
+_RELATIONSHIP_SIMILARITY_QUERY = text(
+    """
+        SELECT 
+            r.id,
+            e1.id as source_entity_id,
+            e1.name as source_entity_name,
+            e1.description as source_entity_description,
+            e1.attributes as source_entity_attributes,
+            r.relationship_desc,
+            e2.id as target_entity_id,
+            e2.name as target_entity_name,
+            e2.description as target_entity_description,
+            e2.attributes as target_entity_attributes,
+            r.attributes,
+            r.created_at,
+            VEC_COSINE_DISTANCE(r.relationship_desc_vec, :query_vector) as similarity_distance,
+            (1 - VEC_COSINE_DISTANCE(r.relationship_desc_vec, :query_vector)) as similarity_score
+        FROM relationships r
+        JOIN entities e1 ON r.source_entity_id = e1.id
+        JOIN entities e2 ON r.target_entity_id = e2.id
+        WHERE r.relationship_desc_vec IS NOT NULL
+        ORDER BY similarity_distance ASC LIMIT :top_k
+    """
+).bindparams(bindparam("query_vector", type_=VectorType()))
+
 
 class NarrativeGraphQuery:
     """Query interface for narrative knowledge graphs with multi-database support"""
@@ -243,33 +271,10 @@ def search_relationships_by_vector_similarity(
         query_embedding = get_text_embedding(query)
         session_factory = db_manager.get_session_factory(database_uri)
         with session_factory() as db:
-            # Build the base query with vector similarity search
-            base_query = """
-                SELECT 
-                    r.id,
-                    e1.id as source_entity_id,
-                    e1.name as source_entity_name,
-                    e1.description as source_entity_description,
-                    e1.attributes as source_entity_attributes,
-                    r.relationship_desc,
-                    e2.id as target_entity_id,
-                    e2.name as target_entity_name,
-                    e2.description as target_entity_description,
-                    e2.attributes as target_entity_attributes,
-                    r.attributes,
-                    r.created_at,
-                    VEC_COSINE_DISTANCE(r.relationship_desc_vec, :query_vector) as similarity_distance,
-                    (1 - VEC_COSINE_DISTANCE(r.relationship_desc_vec, :query_vector)) as similarity_score
-                FROM relationships r
-                JOIN entities e1 ON r.source_entity_id = e1.id
-                JOIN entities e2 ON r.target_entity_id = e2.id
-                WHERE r.relationship_desc_vec IS NOT NULL
-                ORDER BY similarity_distance ASC LIMIT :top_k
-            """
 
-            params = {"query_vector": str(query_embedding), "top_k": top_k * 5}
+            params = {"query_vector": query_embedding, "top_k": top_k * 5}
 
-            result = db.execute(text(base_query), params)
+            result = db.execute(_RELATIONSHIP_SIMILARITY_QUERY, params)
             columns = [
                 "id",
                 "source_entity_id",
@@ -69,6 +69,25 @@ class BaseLLMProvider(ABC):
         return {}
 
     def _update_kwargs(self, kwargs: dict) -> dict:
+        # json_schema / json_mode ask OpenAI-compatible servers to constrain
+        # output to a schema or to any JSON object
+        json_schema = kwargs.pop("json_schema", None)
+        json_mode = kwargs.pop("json_mode", False)
+        # Only needed by providers that size the context window themselves
+        kwargs.pop("prompt_tokens", None)
+        if json_schema is not None:
+            kwargs.setdefault(
+                "response_format",
+                {
+                    "type": "json_schema",
+                    "json_schema": {
+                        "name": json_schema.get("title", "response"),
+                        "schema": json_schema,
+                    },
+                },
+            )
+        elif json_mode:
+            kwargs.setdefault("response_format", {"type": "json_object"})
         # if config exists both in default and kwargs, use kwargs
         for key, value in self._get_default_model_config().items():
             if key in kwargs:
@@ -4,9 +4,12 @@ import os
 
 from setting.base import EMBEDDING_MODEL, EMBEDDING_BASE_URL, EMBEDDING_MODEL_API_KEY
 
+import functools
 import hashlib
 import math
-from typing import List
+import threading
+from collections import OrderedDict
+from typing import List, Tuple
 
 # Fix proxy issues for localhost connections
 os.environ['NO_PROXY'] = '127.0.0.1,localhost'
@@ -15,20 +18,105 @@ os.environ['NO_PROXY'] = '127.0.0.1,localhost'
 for proxy_var in ['HTTP_PROXY', 'HTTPS_PROXY', 'http_proxy', 'https_proxy']:
     os.environ.pop(proxy_var, None)
 
-def get_text_embedding(text: str):
-    embedding_model = openai.OpenAI(
+def normalize_embedding(vector: List[float]) -> List[float]:
+    """
+    Scale a vector to unit L2 norm.
+
+    Stored and query embeddings are kept normalized so that, once older rows
+    have been re-normalized (normalize_embeddings.py), vector search can rank
+    by inner product, which equals cosine similarity for unit vectors.
+
+    Components are rounded to 9 significant digits, the precision of the
+    float32 VECTOR column, so the text literal sent to TiDB carries no digits
+    the database would discard.
+    """
+    norm = math.sqrt(sum(x * x for x in vector))
+    if norm == 0:
+        return [float(f"{x:.9g}") for x in vector]
+    return [float(f"{x / norm:.9g}") for x in vector]
+
+
+@functools.lru_cache(maxsize=None)
+def _embedding_client():
+    # One client per process so its HTTP connection pool is reused
+    return openai.OpenAI(
         base_url=EMBEDDING_BASE_URL,
         api_key=EMBEDDING_MODEL_API_KEY,
     )
+
+
+def get_text_embedding(text: str):
+    embedding_model = _embedding_client()
     text = text.replace("\n", " ")
-    return (
+    return normalize_embedding(
         embedding_model.embeddings.create(input=[text], model=EMBEDDING_MODEL).data[0].embedding
     )
 
 
+def get_text_embeddings(texts: List[str]) -> List[List[float]]:
+    """Embed several texts with a single request, preserving input order"""
+    if not texts:
+        return []
+    embedding_model = _embedding_client()
+    response = embedding_model.embeddings.create(
+        input=[text.replace("\n", " ") for text in texts], model=EMBEDDING_MODEL
+    )
+    ordered = sorted(response.data, key=lambda item: item.index)
+    return [normalize_embedding(item.embedding) for item in ordered]
+
+
+# Refined or merged graph elements often keep their text, so earlier embeddings are reused
+_EMBEDDING_CACHE_SIZE = 4096
+_embedding_cache: "OrderedDict[str, Tuple[float, ...]]" = OrderedDict()
+_embedding_cache_lock = threading.Lock()
+
+
+def _cache_get(text: str):
+    with _embedding_cache_lock:
+        vector = _embedding_cache.get(text)
+        if vector is not None:
+            _embedding_cache.move_to_end(text)
+        return vector
+
+
+def _cache_put(text: str, vector: List[float]) -> None:
+    with _embedding_cache_lock:
+        _embedding_cache[text] = tuple(vector)
+        _embedding_cache.move_to_end(text)
+        while len(_embedding_cache) > _EMBEDDING_CACHE_SIZE:
+            _embedding_cache.popitem(last=False)
+
+
+def get_cached_text_embedding(text: str) -> List[float]:
+    """get_text_embedding, reusing the vector of a recently embedded identical text"""
+    vector = _cache_get(text)
+    if vector is None:
+        vector = get_text_embedding(text)
+        _cache_put(text, vector)
+    return list(vector)
+
+
+def get_cached_text_embeddings(texts: List[str]) -> List[List[float]]:
+    """Embed texts in input order, sending only uncached ones in a single request"""
+    vectors = {text: _cache_get(text) for text in texts}
+    missing = [text for text, vector in vectors.items() if vector is None]
+    for text, vector in zip(missing, get_text_embeddings(missing)):
+        _cache_put(text, vector)
+        vectors[text] = vector
+    return [list(vectors[text]) for text in texts]
+
+
 def get_entity_description_embedding(name: str, description: str):
-    combined_text = f"{name}: {description}"
-    return get_text_embedding(combined_text)
+    return get_cached_text_embedding(f"{name}: {description}")
+
+
+def get_entity_description_embeddings_batch(
+    pairs: List[Tuple[str, str]]
+) -> List[List[float]]:
+    """Embed (name, description) pairs, sending only uncached texts in one request"""
+    return get_cached_text_embeddings(
+        [f"{name}: {description}" for name, description in pairs]
+    )
 
 
 def get_entity_metadata_embedding(metadata: dict):
@@ -1,11 +1,12 @@
 import os
 from typing import Optional, Generator
 import requests
+from requests.adapters import HTTPAdapter
 import json
 import logging
 
 from llm.base import BaseLLMProvider
-from setting.base import OLLAMA_BASE_URL
+from setting.base import OLLAMA_BASE_URL, OLLAMA_KEEP_ALIVE
 
 logger = logging.getLogger(__name__)
 
@@ -18,6 +19,11 @@ class OllamaProvider(BaseLLMProvider):
     def __init__(self, model: str, **kwargs):
         super().__init__(model, **kwargs)
         self.ollama_base_url = OLLAMA_BASE_URL
+        # Keep connections alive across calls, including concurrent ones
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
 
     def generate(
         self, prompt: str, system_prompt: Optional[str] = None, **kwargs
@@ -27,9 +33,17 @@ class OllamaProvider(BaseLLMProvider):
         else:
             full_prompt = prompt
 
+        json_schema = kwargs.pop("json_schema", None)
+        json_mode = kwargs.pop("json_mode", False)
+        prompt_tokens = kwargs.pop("prompt_tokens", None)
         options = {}
         if "max_tokens" in kwargs:
-            options["num_ctx"] = kwargs.pop("max_tokens")
+            if prompt_tokens is None:
+                options["num_ctx"] = kwargs.pop("max_tokens")
+            else:
+                # max_tokens caps the output; the window must also hold the prompt
+                options["num_predict"] = kwargs.pop("max_tokens")
+                options["num_ctx"] = prompt_tokens + options["num_predict"]
         options.update(kwargs)
 
         data = {
@@ -38,8 +52,14 @@ class OllamaProvider(BaseLLMProvider):
             "stream": False,
             "options": options,
         }
+        if OLLAMA_KEEP_ALIVE:
+            data["keep_alive"] = OLLAMA_KEEP_ALIVE
+        if json_schema is not None:
+            data["format"] = json_schema
+        elif json_mode:
+            data["format"] = "json"
         response = self._retry_with_exponential_backoff(
-            requests.post, f"{self.ollama_base_url}/api/generate", json=data
+            self.session.post, f"{self.ollama_base_url}/api/generate", json=data
         )
         response.raise_for_status()
         return response.json()["response"].strip()
@@ -63,9 +83,17 @@ class OllamaProvider(BaseLLMProvider):
         else:
             full_prompt = prompt
 
+        json_schema = kwargs.pop("json_schema", None)
+        json_mode = kwargs.pop("json_mode", False)
+        prompt_tokens = kwargs.pop("prompt_tokens", None)
         options = {}
         if "max_tokens" in kwargs:
-            options["num_ctx"] = kwargs.pop("max_tokens")
+            if prompt_tokens is None:
+                options["num_ctx"] = kwargs.pop("max_tokens")
+            else:
+                # max_tokens caps the output; the window must also hold the prompt
+                options["num_predict"] = kwargs.pop("max_tokens")
+                options["num_ctx"] = prompt_tokens + options["num_predict"]
         options.update(kwargs)
 
         try:
@@ -75,8 +103,14 @@ class OllamaProvider(BaseLLMProvider):
                 "options": options,
                 "stream": True,
             }
-
-            response = requests.post(
+            if OLLAMA_KEEP_ALIVE:
+                data["keep_alive"] = OLLAMA_KEEP_ALIVE
+            if json_schema is not None:
+                data["format"] = json_schema
+            elif json_mode:
+                data["format"] = "json"
+
+            response = self.session.post(
                 f"{self.ollama_base_url}/api/generate", json=data, stream=True
             )
 
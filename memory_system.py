@@ -1,10 +1,16 @@
+import copy
 import json
 import logging
 import hashlib
+import math
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any, Tuple, Callable
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_, text
+from sqlalchemy import func, and_, text, bindparam
+from tidb_vector.sqlalchemy import VectorType
 
 from knowledge_graph.models import (
     SourceData,
@@ -18,7 +24,7 @@ from knowledge_graph.knowledge import KnowledgeBuilder
 from knowledge_graph.graph import NarrativeKnowledgeGraphBuilder
 from setting.db import db_manager
 from llm.factory import LLMInterface
-from llm.embedding import get_text_embedding
+from llm.embedding import get_text_embedding, normalize_embedding
 
 logger = logging.getLogger(__name__)
 
@@ -108,23 +114,169 @@ def generate_topic_name_for_personal_memory(user_id: str) -> str:
     return f"The personal information of {user_id}"
 
 
-def _generate_build_id_for_chat_batch(chat_link: str, database_uri: str = "") -> str:
+# Ranked by cosine distance, which does not depend on stored vector norms;
+# rows written before embeddings were normalized may not be unit length until
+# normalize_embeddings.py has been run against the database.
+_CONVERSATION_SUMMARY_SQL = """
+    SELECT 
+        kb.id,
+        kb.name,
+        kb.content,
+        kb.context,
+        kb.attributes,
+        kb.created_at,
+        VEC_COSINE_DISTANCE(kb.content_vec, :query_vector) as similarity_distance,
+        (1 - VEC_COSINE_DISTANCE(kb.content_vec, :query_vector)) as similarity_score
+    FROM knowledge_blocks kb
+    WHERE kb.topic_name = :topic_name
+      AND kb.knowledge_type = :knowledge_type
+      AND kb.content_vec IS NOT NULL
+      {time_filter_sql}
+    ORDER BY similarity_distance ASC 
+    LIMIT :top_k
+"""
+
+_USER_INSIGHT_SQL = """
+    SELECT 
+        r.id,
+        e1.id as source_entity_id,
+        e1.name as source_entity_name,
+        e1.description as source_entity_description,
+        e1.attributes as source_entity_attributes,
+        r.relationship_desc,
+        e2.id as target_entity_id,
+        e2.name as target_entity_name,
+        e2.description as target_entity_description,
+        e2.attributes as target_entity_attributes,
+        r.attributes,
+        r.created_at,
+        VEC_COSINE_DISTANCE(r.relationship_desc_vec, :query_vector) as similarity_distance,
+        (1 - VEC_COSINE_DISTANCE(r.relationship_desc_vec, :query_vector)) as similarity_score
+    FROM relationships r
+    JOIN entities e1 ON r.source_entity_id = e1.id
+    JOIN entities e2 ON r.target_entity_id = e2.id
+    WHERE r.topic_name = :topic_name
+      AND r.relationship_desc_vec IS NOT NULL
+      {time_filter_sql}
+    ORDER BY similarity_distance ASC 
+    LIMIT :top_k
+"""
+
+
+def _compile_time_range_variants(sql_template: str, alias: str) -> Dict[Tuple[bool, bool], Any]:
     """
-    Generate a deterministic build_id for chat batch based on chat_link and database_uri.
+    Build the text() statement for every combination of optional time bounds.
+
+    query_vector is bound as a vector so embeddings can be passed as-is.
 
     Args:
-        chat_link: The chat batch link
-        database_uri: The database URI (empty string for local)
+        sql_template: Query with a {time_filter_sql} placeholder
+        alias: Table alias owning the created_at column
 
     Returns:
-        SHA256 hash of the combined string
+        Dict keyed by (has_start, has_end) with the compiled statements
     """
-    # Combine chat_link and database_uri for hash generation
-    combined_string = f"{chat_link}||{database_uri}"
-    
-    # Generate SHA256 hash
-    hash_object = hashlib.sha256(combined_string.encode("utf-8"))
-    return hash_object.hexdigest()
+    variants = {}
+    for has_start in (False, True):
+        for has_end in (False, True):
+            time_conditions = []
+            if has_start:
+                time_conditions.append(f"AND {alias}.created_at >= :start_time")
+            if has_end:
+                time_conditions.append(f"AND {alias}.created_at <= :end_time")
+            variants[(has_start, has_end)] = text(
+                sql_template.format(time_filter_sql=" ".join(time_conditions))
+            ).bindparams(bindparam("query_vector", type_=VectorType()))
+    return variants
+
+
+# Vector similarity search statements, compiled once at import
+_CONVERSATION_SUMMARY_QUERIES = _compile_time_range_variants(_CONVERSATION_SUMMARY_SQL, "kb")
+_USER_INSIGHT_QUERIES = _compile_time_range_variants(_USER_INSIGHT_SQL, "r")
+
+
+def _bind_time_range(params: Dict[str, Any], time_range: Optional[Dict]) -> Tuple[bool, bool]:
+    """Add the time bounds present in time_range to params and report which were set."""
+    has_start = bool(time_range and time_range.get("start"))
+    has_end = bool(time_range and time_range.get("end"))
+    if has_start:
+        params["start_time"] = time_range["start"]
+    if has_end:
+        params["end_time"] = time_range["end"]
+    return has_start, has_end
+
+
+class _SearchResultCache:
+    """
+    Process-wide LRU cache with TTL for memory vector search results.
+
+    Keys use a quantized (L2-normalized, int8-rounded) digest of the query
+    embedding so near-identical queries share an entry, plus a per-topic
+    generation that is bumped whenever this process writes new memory for
+    the topic. The TTL bounds staleness from writes made by other processes
+    such as the graph daemon.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 300.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[Tuple, Tuple[float, List[Dict[str, Any]]]]" = OrderedDict()
+        self._generations: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _embedding_digest(embedding: List[float]) -> str:
+        norm = math.sqrt(sum(x * x for x in embedding)) or 1.0
+        quantized = bytes(round(x / norm * 127) & 0xFF for x in embedding)
+        return hashlib.blake2b(quantized, digest_size=16).hexdigest()
+
+    def make_key(
+        self,
+        kind: str,
+        topic_name: str,
+        embedding: List[float],
+        top_k: int,
+        time_range: Optional[Dict],
+    ) -> Tuple:
+        time_range = time_range or {}
+        with self._lock:
+            generation = self._generations.get(topic_name, 0)
+        return (
+            kind,
+            topic_name,
+            generation,
+            self._embedding_digest(embedding),
+            top_k,
+            time_range.get("start"),
+            time_range.get("end"),
+        )
+
+    def get(self, key: Tuple) -> Optional[List[Dict[str, Any]]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, results = entry
+            if time.monotonic() - stored_at > self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            # Callers may mutate the rows they get back
+            return copy.deepcopy(results)
+
+    def put(self, key: Tuple, results: List[Dict[str, Any]]) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic(), copy.deepcopy(results))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate_topic(self, topic_name: str) -> None:
+        with self._lock:
+            self._generations[topic_name] = self._generations.get(topic_name, 0) + 1
+
+
+_search_result_cache = _SearchResultCache()
 
 
 class PersonalMemorySystem:
@@ -162,6 +314,24 @@ class PersonalMemorySystem:
             llm_client, embedding_func, session_factory
         )
 
+    @staticmethod
+    def _generate_build_id_for_chat_batch(chat_link: str, database_uri: str = "") -> str:
+        """
+        Generate a deterministic build_id for chat batch based on chat_link and database_uri.
+
+        Args:
+            chat_link: The chat batch link
+            database_uri: The database URI (empty string for local)
+
+        Returns:
+            SHA256 hash of "{chat_link}||{database_uri}"
+        """
+        # Feed the parts incrementally instead of building the combined string
+        hash_object = hashlib.sha256(chat_link.encode("utf-8"))
+        hash_object.update(b"||")
+        hash_object.update(database_uri.encode("utf-8"))
+        return hash_object.hexdigest()
+
     def process_chat_batch(
         self,
         chat_messages: List[Dict],
@@ -252,6 +422,7 @@ class PersonalMemorySystem:
         source_data_dict = {
             "id": source_data.id,
             "name": source_data.name,
+            "link": source_data.link,
             "content": self._get_source_content(source_data),
             "attributes": source_data.attributes,
         }
@@ -305,13 +476,14 @@ class PersonalMemorySystem:
         Returns:
             Created SourceData object
         """
+        # Project the dates into a flat list once instead of scanning the
+        # message dicts twice (existence check + max)
+        dates = [msg["date"] for msg in chat_messages if msg.get("date")]
+
         # Get the latest timestamp from the batch for use as a unique identifier
-        if chat_messages and any(msg.get("date") for msg in chat_messages):
+        if dates:
             # Dates are in ISO format, so string comparison is sufficient to find the max
-            latest_timestamp_str = max(
-                msg["date"] for msg in chat_messages if msg.get("date")
-            )
-            batch_timestamp = latest_timestamp_str
+            batch_timestamp = max(dates)
         else:
             # Fallback if for some reason the batch is empty or contains no dates
             batch_timestamp = datetime.now().isoformat()
@@ -334,7 +506,7 @@ class PersonalMemorySystem:
         # Calculate content hash for deduplication
         content_hash = hashlib.sha256(content_json.encode("utf-8")).hexdigest()
 
-        with self.SessionLocal() as db:
+        with self.SessionLocal(expire_on_commit=False) as db:
             # Check if source data already exists by doc_link
             existing_source = (
                 db.query(SourceData).filter(SourceData.link == chat_link).first()
@@ -347,6 +519,7 @@ class PersonalMemorySystem:
                 return {
                     "id": existing_source.id,
                     "name": existing_source.name,
+                    "link": existing_source.link,
                     "content": existing_source.effective_content,
                     "attributes": existing_source.attributes,
                 }
@@ -387,13 +560,12 @@ class PersonalMemorySystem:
 
             db.add(source_data)
             db.commit()
-            db.refresh(source_data)
-            db.refresh(content_store)
 
             logger.info(f"Stored chat batch as SourceData: {source_data.id}")
             return {
                 "id": source_data.id,
                 "name": source_data.name,
+                "link": source_data.link,
                 "content": content_store.content,
                 "attributes": source_data.attributes,
             }
@@ -495,14 +667,14 @@ Generate a concise narrative summary that captures the essence of this conversat
         content_hash = hashlib.sha256(summary_content.encode("utf-8")).hexdigest()
 
         # Create knowledge block
-        with self.SessionLocal() as db:
+        with self.SessionLocal(expire_on_commit=False) as db:
             # Create new block if it doesn't exist
             knowledge_block = KnowledgeBlock(
                 name=f"Chat Summary - {user_id} - {source_data['attributes'].get('conversation_title', 'unknown')} at {source_data['attributes'].get('last_message_date', 'unknown')}",
                 knowledge_type="chat_summary",
                 context=source_data["content"],
                 content=summary_content,
-                content_vec=self.embedding_func(summary_content),
+                content_vec=normalize_embedding(self.embedding_func(summary_content)),
                 hash=content_hash,
                 attributes={"user_id": user_id, "topic_name": topic_name},
             )
@@ -518,7 +690,7 @@ Generate a concise narrative summary that captures the essence of this conversat
             )
             db.add(mapping)
             db.commit()
-            db.refresh(knowledge_block)
+            _search_result_cache.invalidate_topic(topic_name)
 
             logger.info(f"Created summary knowledge block: {knowledge_block.id}")
             return {
@@ -594,23 +766,25 @@ Generate a concise narrative summary that captures the essence of this conversat
             Exception: If task creation fails
         """
         try:
-            # Generate build_id for chat batch using the actual source link
-            # The source_data contains the actual chat_link used to store the batch
-            with self.SessionLocal() as db:
-                source_record = db.query(SourceData).filter(SourceData.id == source_data["id"]).first()
-                if not source_record:
-                    raise Exception(f"Source data not found with id: {source_data['id']}")
-                
-                chat_batch_link = source_record.link
-            # Use empty string for external_db_uri for local mode
-            external_db_uri = ""
-            build_id = _generate_build_id_for_chat_batch(
-                chat_batch_link, external_db_uri
-            )
-
             # Create task record in local database only
             # All task scheduling is centralized in local database
             with self.SessionLocal() as db:
+                # Generate build_id for chat batch using the actual source link.
+                # Callers pass it along with the source data; only look it up
+                # when it is missing.
+                chat_batch_link = source_data.get("link")
+                if not chat_batch_link:
+                    source_record = db.query(SourceData).filter(SourceData.id == source_data["id"]).first()
+                    if not source_record:
+                        raise Exception(f"Source data not found with id: {source_data['id']}")
+
+                    chat_batch_link = source_record.link
+                # Use empty string for external_db_uri for local mode
+                external_db_uri = ""
+                build_id = self._generate_build_id_for_chat_batch(
+                    chat_batch_link, external_db_uri
+                )
+
                 # Check if GraphBuild already exists for this build_id
                 existing_build_status = (
                     db.query(GraphBuild)
@@ -628,7 +802,6 @@ Generate a concise narrative summary that captures the essence of this conversat
                     )
                     existing_build_status.status = "completed"
                     db.commit()
-                    db.refresh(existing_build_status)
                     return build_id
 
                 # Create new GraphBuild record
@@ -714,55 +887,33 @@ Generate a concise narrative summary that captures the essence of this conversat
 
         try:
             # Generate query embedding
-            query_embedding = self.embedding_func(query)
+            query_embedding = normalize_embedding(self.embedding_func(query))
+
+            cache_key = _search_result_cache.make_key(
+                "conversation", topic_name, query_embedding, top_k, time_range
+            )
+            cached_results = _search_result_cache.get(cache_key)
+            if cached_results is not None:
+                return cached_results
 
             with self.SessionLocal() as db:
-                # Build time filter conditions for SQL
-                time_conditions = []
                 params = {
-                    "query_vector": str(query_embedding),
+                    "query_vector": query_embedding,
                     "topic_name": topic_name,
                     "knowledge_type": "chat_summary",
-                    "top_k": top_k * 3,  # Fetch more initially for filtering
+                    "top_k": top_k,
                 }
 
-                if time_range:
-                    if time_range.get("start"):
-                        time_conditions.append("AND kb.created_at >= :start_time")
-                        params["start_time"] = time_range["start"]
-                    if time_range.get("end"):
-                        time_conditions.append("AND kb.created_at <= :end_time")
-                        params["end_time"] = time_range["end"]
-
-                time_filter_sql = " ".join(time_conditions)
-
-                # Vector similarity search query
-                base_query = f"""
-                    SELECT 
-                        kb.id,
-                        kb.name,
-                        kb.content,
-                        kb.context,
-                        kb.attributes,
-                        kb.created_at,
-                        VEC_COSINE_DISTANCE(kb.content_vec, :query_vector) as similarity_distance,
-                        (1 - VEC_COSINE_DISTANCE(kb.content_vec, :query_vector)) as similarity_score
-                    FROM knowledge_blocks kb
-                    WHERE JSON_EXTRACT(kb.attributes, '$.topic_name') = :topic_name
-                      AND kb.knowledge_type = :knowledge_type
-                      AND kb.content_vec IS NOT NULL
-                      {time_filter_sql}
-                    ORDER BY similarity_distance ASC 
-                    LIMIT :top_k
-                """
-
-                result = db.execute(text(base_query), params)
+                has_start, has_end = _bind_time_range(params, time_range)
+                base_query = _CONVERSATION_SUMMARY_QUERIES[(has_start, has_end)]
+
+                result = db.execute(base_query, params)
                 rows = result.fetchall()
 
-                # Convert to structured results and filter by similarity threshold
+                # Convert to structured results
                 results = []
                 for row in rows:
-                    similarity_score = round(1 - row.similarity_distance, 4)
+                    similarity_score = round(row.similarity_score, 4)
                     results.append(
                         {
                             "id": row.id,
@@ -779,9 +930,9 @@ Generate a concise narrative summary that captures the essence of this conversat
                         }
                     )
 
-                # Sort by similarity score and return top k
-                results.sort(key=lambda x: x["similarity_score"], reverse=True)
-                return results[:top_k]
+                # Rows arrive ordered by distance, i.e. by descending similarity
+                _search_result_cache.put(cache_key, results)
+                return results
 
         except Exception as e:
             logger.error(f"Error in conversation summary vector search: {str(e)}")
@@ -800,61 +951,32 @@ Generate a concise narrative summary that captures the essence of this conversat
 
         try:
             # Generate query embedding
-            query_embedding = self.embedding_func(query)
+            query_embedding = normalize_embedding(self.embedding_func(query))
+
+            cache_key = _search_result_cache.make_key(
+                "insights", topic_name, query_embedding, top_k, time_range
+            )
+            cached_results = _search_result_cache.get(cache_key)
+            if cached_results is not None:
+                return cached_results
 
             with self.SessionLocal() as db:
-                # Build time filter conditions for SQL
-                time_conditions = []
                 params = {
-                    "query_vector": str(query_embedding),
+                    "query_vector": query_embedding,
                     "topic_name": topic_name,
-                    "top_k": top_k * 3,  # Fetch more initially for filtering
+                    "top_k": top_k,
                 }
 
-                if time_range:
-                    if time_range.get("start"):
-                        time_conditions.append("AND r.created_at >= :start_time")
-                        params["start_time"] = time_range["start"]
-                    if time_range.get("end"):
-                        time_conditions.append("AND r.created_at <= :end_time")
-                        params["end_time"] = time_range["end"]
-
-                time_filter_sql = " ".join(time_conditions)
-
-                # Vector similarity search query for relationship triplets
-                base_query = f"""
-                    SELECT 
-                        r.id,
-                        e1.id as source_entity_id,
-                        e1.name as source_entity_name,
-                        e1.description as source_entity_description,
-                        e1.attributes as source_entity_attributes,
-                        r.relationship_desc,
-                        e2.id as target_entity_id,
-                        e2.name as target_entity_name,
-                        e2.description as target_entity_description,
-                        e2.attributes as target_entity_attributes,
-                        r.attributes,
-                        r.created_at,
-                        VEC_COSINE_DISTANCE(r.relationship_desc_vec, :query_vector) as similarity_distance,
-                        (1 - VEC_COSINE_DISTANCE(r.relationship_desc_vec, :query_vector)) as similarity_score
-                    FROM relationships r
-                    JOIN entities e1 ON r.source_entity_id = e1.id
-                    JOIN entities e2 ON r.target_entity_id = e2.id
-                    WHERE JSON_EXTRACT(r.attributes, '$.topic_name') = :topic_name
-                      AND r.relationship_desc_vec IS NOT NULL
-                      {time_filter_sql}
-                    ORDER BY similarity_distance ASC 
-                    LIMIT :top_k
-                """
-
-                result = db.execute(text(base_query), params)
+                has_start, has_end = _bind_time_range(params, time_range)
+                base_query = _USER_INSIGHT_QUERIES[(has_start, has_end)]
+
+                result = db.execute(base_query, params)
                 rows = result.fetchall()
 
-                # Convert to structured results and filter by similarity threshold
+                # Convert to structured results
                 results = []
                 for row in rows:
-                    similarity_score = round(1 - row.similarity_distance, 4)
+                    similarity_score = round(row.similarity_score, 4)
                     results.append(
                         {
                             "id": row.id,
@@ -883,9 +1005,9 @@ Generate a concise narrative summary that captures the essence of this conversat
                         }
                     )
 
-                # Sort by similarity score and return top k
-                results.sort(key=lambda x: x["similarity_score"], reverse=True)
-                return results[:top_k]
+                # Rows arrive ordered by distance, i.e. by descending similarity
+                _search_result_cache.put(cache_key, results)
+                return results
 
         except Exception as e:
             logger.error(f"Error in user insights vector search: {str(e)}")
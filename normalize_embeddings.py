@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Re-normalize stored embeddings to unit length.
+
+Embeddings written before llm.embedding.normalize_embedding was introduced may
+have arbitrary norms. Run this once per database before switching vector
+search from cosine distance to inner product ranking.
+
+Usage:
+    python normalize_embeddings.py [--database-uri URI] [--batch-size N]
+"""
+
+import argparse
+import logging
+import math
+
+from knowledge_graph.models import Entity, KnowledgeBlock, Relationship
+from llm.embedding import normalize_embedding
+from setting.db import db_manager
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(message)s")
+logger = logging.getLogger(__name__)
+
+# (model, vector column name)
+EMBEDDING_COLUMNS = (
+    (KnowledgeBlock, "content_vec"),
+    (Entity, "description_vec"),
+    (Relationship, "relationship_desc_vec"),
+)
+
+NORM_TOLERANCE = 1e-6
+
+
+def normalize_column(session_factory, model, column_name: str, batch_size: int) -> int:
+    """
+    Rewrite the vectors of one column that are not unit length.
+
+    Rows are scanned in id order, one batch per transaction.
+
+    Returns:
+        Number of rows updated
+    """
+    column = getattr(model, column_name)
+    updated = 0
+    last_id = None
+    while True:
+        with session_factory() as session:
+            query = session.query(model.id, column).filter(column.isnot(None))
+            if last_id is not None:
+                query = query.filter(model.id > last_id)
+            rows = query.order_by(model.id).limit(batch_size).all()
+            if not rows:
+                break
+            last_id = rows[-1][0]
+
+            update_rows = []
+            for row_id, vector in rows:
+                if vector is None:
+                    continue
+                values = [float(x) for x in vector]
+                norm = math.sqrt(sum(x * x for x in values))
+                if norm == 0 or abs(norm - 1) <= NORM_TOLERANCE:
+                    continue
+                update_rows.append(
+                    {"id": row_id, column_name: normalize_embedding(values)}
+                )
+            if update_rows:
+                session.bulk_update_mappings(model, update_rows)
+                session.commit()
+                updated += len(update_rows)
+        logger.info(f"{model.__tablename__}.{column_name}: {updated} rows normalized so far")
+    return updated
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--database-uri",
+        default=None,
+        help="Database to normalize; defaults to the local DATABASE_URI",
+    )
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    session_factory = db_manager.get_session_factory(args.database_uri)
+    for model, column_name in EMBEDDING_COLUMNS:
+        updated = normalize_column(session_factory, model, column_name, args.batch_size)
+        logger.info(f"Normalized {updated} rows in {model.__tablename__}.{column_name}")
+
+
+if __name__ == "__main__":
+    main()
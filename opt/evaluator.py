@@ -1,13 +1,150 @@
 import json
 import logging
-from typing import Dict, List, Any, Optional
-from dataclasses import dataclass
-
-from utils.json_utils import robust_json_parse
+import hashlib
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from types import MappingProxyType
+from typing import Dict, List, Any, Optional, Tuple
+from dataclasses import dataclass, field
+
+from setting.base import CRITIQUE_CACHE_PATH, CRITIQUE_CACHE_TTL, MAX_PROMPT_TOKENS
+from utils.token import calculate_tokens
+from utils.json_utils import robust_json_parse, dumps_compact, dumps_pretty
 
 logger = logging.getLogger(__name__)
 
 
+ISSUE_CRITIC_PROMPT_TEMPLATE = """You are a knowledge graph quality expert. Your task is to determine if a reported issue actually exists in the given graph.
+
+# Quality Standards
+
+A high-quality knowledge graph should be:
+- **Non-redundant**: Contains unique entities and relationships, avoiding duplication of the same real-world concept or connection.
+- **Coherent**: Entities and relationships form a logical, consistent, and understandable structure representing the domain.
+- **Precise**: Entities and relationships have clear, unambiguous definitions and descriptions, accurately representing specific concepts and connections.
+- **Factually accurate**: All represented knowledge correctly reflects the real world or the intended domain scope.
+- **Efficiently connected**: Features optimal pathways between related entities, avoiding unnecessary or misleading connections while ensuring essential links exist.
+
+
+## Issue Identification Guidelines
+
+{guideline}
+
+# Your Task
+
+## Graph Data:
+{graph_data}
+
+## Reported Issue:
+- **Type**: {issue_type}
+- **{critic_object}**
+- **Reasoning**: {reasoning}
+
+## Evaluation Rules:
+
+**For {issue_type} issues:**
+- **is_valid: true** = The specified entities/relationships DO have the {issue_type_label} problem
+- **is_valid: false** = The specified entities/relationships do NOT have the {issue_type_label} problem
+
+**Important**: The reasoning provided may explain why something is NOT a problem. If the reasoning correctly explains that no problem exists, then is_valid should be FALSE.
+
+**Example**: If reasoning says "entities are not redundant because they serve different purposes" and you agree, then is_valid = false (no redundancy problem exists).
+
+Base your judgment solely on the graph data and the issue type definition above. Response format (surrounding by ```json and ```):
+```json
+{{
+"is_valid": true/false,
+"critique": "Your analysis explaining whether the claimed problem actually exists in the graph, with specific references to graph elements."
+}}
+```"""
+
+
+
+BATCH_ISSUE_CRITIC_PROMPT_TEMPLATE = """You are a knowledge graph quality expert. Your task is to determine, for each reported issue below, if it actually exists in the given graph.
+
+# Quality Standards
+
+A high-quality knowledge graph should be:
+- **Non-redundant**: Contains unique entities and relationships, avoiding duplication of the same real-world concept or connection.
+- **Coherent**: Entities and relationships form a logical, consistent, and understandable structure representing the domain.
+- **Precise**: Entities and relationships have clear, unambiguous definitions and descriptions, accurately representing specific concepts and connections.
+- **Factually accurate**: All represented knowledge correctly reflects the real world or the intended domain scope.
+- **Efficiently connected**: Features optimal pathways between related entities, avoiding unnecessary or misleading connections while ensuring essential links exist.
+
+
+## Issue Identification Guidelines
+
+{guidelines}
+
+# Your Task
+
+## Graph Data:
+{graph_data}
+
+## Reported Issues:
+{issues}
+
+## Evaluation Rules:
+
+Judge every issue independently against its own issue type:
+- **is_valid: true** = The specified entities/relationships DO have the problem named by the issue type
+- **is_valid: false** = The specified entities/relationships do NOT have that problem
+
+**Important**: The reasoning provided may explain why something is NOT a problem. If the reasoning correctly explains that no problem exists, then is_valid should be FALSE.
+
+**Example**: If reasoning says "entities are not redundant because they serve different purposes" and you agree, then is_valid = false (no redundancy problem exists).
+
+Base your judgment solely on the graph data and the issue type definitions above. Return one entry per reported issue, with its idx. Response format (surrounding by ```json and ```):
+```json
+[
+{{
+"idx": 0,
+"is_valid": true/false,
+"critique": "Your analysis explaining whether the claimed problem actually exists in the graph, with specific references to graph elements."
+}}
+]
+```"""
+
+ISSUE_GUIDELINES = MappingProxyType(
+    {
+        "redundancy_entity": """**Redundant Entities**(redundancy_entity):
+
+- Definition: Two or more distinct entity entries represent the exact same real-world entity or concept (identical in type and instance).
+- Identification: Look for highly similar names, aliases, and descriptions that clearly refer to the same thing without meaningful distinction.
+- Exclusion: Do not flag entities as redundant if they represent different levels in a clear hierarchy (e.g., "Artificial Intelligence" vs. "Machine Learning") or distinct concepts that happen to be related (e.g., "Company A" vs. "CEO of Company A").
+""",
+        "redundancy_relationship": """**Redundant Relationships**(redundancy_relationship):
+
+- Definition: Two or more distinct relationship entries connect the same pair of source and target entities (or entities identified as redundant duplicates) with the same semantic meaning.
+- Identification: Look for identical or near-identical source/target entity pairs and relationship types/descriptions that convey the exact same connection. Minor variations in phrasing that don't change the core meaning should still be considered redundant.
+- Example:
+    - Redundant: User → Purchased → Product and Customer → Ordered → Product.
+    - Non-redundant: User → Purchased in 2023 → Product and Customer → Purchased 2024 → Product.
+- Note: Overlap in descriptive text between an entity and a relationship connected to it is generally acceptable for context and should not, by itself, trigger redundancy.
+""",
+        "entity_quality_issue": """**Entity Quality Issues**(entity_quality_issue):
+
+- Definition: Fundamental flaws within a single entity's definition, description, or attributes that significantly hinder its clarity, accuracy, or usability. This is about core problems, not merely lacking detail.
+- Subtypes:
+    - Inconsistent Claims: Contains attributes or information that directly contradict each other (e.g., having mutually exclusive status flags like Status: Active and Status: Deleted). This points to a factual impossibility within the entity's representation.
+    - Meaningless or Fundamentally Vague Description: The description is so generic, placeholder-like, or nonsensical that it provides no usable information to define or distinguish the entity (e.g., "An item", "Data entry", "See notes", "Used for system processes" without any specifics). The description fails its basic purpose.
+    - Ambiguous Definition/Description: The provided name, description, or key attributes are described in a way that could plausibly refer to multiple distinct real-world concepts or entities, lacking the necessary specificity for unambiguous identification within the graph's context (e.g., An entity named "System" with description "Manages data processing" in a graph with multiple such systems).
+""",
+        "relationship_quality_issue": """**Relationship Quality Issues**(relationship_quality_issue):
+
+- Definition: Fundamental flaws within a single relationship's definition or description that obscure its purpose, meaning, or the nature of the connection between the source and target entities. This is about core problems, not merely lacking detail.
+- Subtypes:
+    - Contradictory Definitions: Conflicting attributes or logic.
+    - Fundamentally Unclear or Ambiguous Meaning: The relationship type or description is so vague, generic, or poorly defined that the nature of the connection between the source and target cannot be reliably understood. It fails to convey a specific semantic meaning. (e.g., `System A -- affects --> System B` without any context of how). This covers cases where the essential meaning is missing, making the relationship definition practically useless or open to multiple interpretations.
+    - **Explicit Exclusions (Important!)**:
+        * **Do NOT flag as a quality issue** solely because a description could be more detailed or comprehensive. The focus must remain on whether the *existing* definition is fundamentally flawed (contradictory, ambiguous, unclear).
+""",
+    }
+)
+
+
 @dataclass
 class Issue:
     """Issue data structure"""
@@ -20,10 +157,25 @@ class Issue:
     validation_score: float = 0.0
     critic_evaluations: Dict[str, str] = None
     is_resolved: bool = False
+    # Parsed form of each critic evaluation that parses, so the response is
+    # only parsed once; critics missing here still need (re-)evaluation
+    _parsed_evaluations: Dict[str, Dict[str, Any]] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
 
     def __post_init__(self):
         if self.critic_evaluations is None:
             self.critic_evaluations = {}
+        # Evaluations handed in from outside are validated once here
+        for critic_name, evaluation in self.critic_evaluations.items():
+            if not evaluation:
+                continue
+            try:
+                self._parsed_evaluations[critic_name] = robust_json_parse(
+                    evaluation, "object"
+                )
+            except Exception:
+                pass
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for compatibility"""
@@ -53,60 +205,266 @@ class Issue:
         )
 
 
+# Critic prompt templates by name; a verdict is cached under the template
+# that produced it, versioned by the template text
+CRITIQUE_TEMPLATES = {
+    "single": ISSUE_CRITIC_PROMPT_TEMPLATE,
+    "batch": BATCH_ISSUE_CRITIC_PROMPT_TEMPLATE,
+}
+_CRITIQUE_TEMPLATE_VERSIONS = {
+    name: hashlib.sha256(template.encode("utf-8")).hexdigest()[:16]
+    for name, template in CRITIQUE_TEMPLATES.items()
+}
+
+
+class CritiqueCache:
+    """Disk-backed store of critic responses keyed by issue content, critic name and prompt template, expiring after a TTL"""
+
+    def __init__(self, path: str, ttl: int):
+        self.path = path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        with self._lock, sqlite3.connect(self.path) as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS critiques (key TEXT PRIMARY KEY, response TEXT NOT NULL, created_at REAL NOT NULL)"
+            )
+
+    @staticmethod
+    def make_key(critic_name: str, issue: Issue, template: str) -> str:
+        """Hash everything the critic prompt is built from"""
+        payload = json.dumps(
+            {
+                "critic_name": critic_name,
+                "template": template,
+                "template_version": _CRITIQUE_TEMPLATE_VERSIONS[template],
+                "guideline": get_issue_guideline(issue.issue_type),
+                "issue_type": issue.issue_type,
+                # The verdict does not depend on the order ids were reported in
+                "affected_ids": sorted(issue.affected_ids),
+                "reasoning": issue.reasoning.strip(),
+                "source_graph": issue.source_graph,
+            },
+            sort_keys=True,
+            ensure_ascii=False,
+        )
+        return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        try:
+            with self._lock, sqlite3.connect(self.path) as conn:
+                row = conn.execute(
+                    "SELECT response FROM critiques WHERE key = ? AND created_at >= ?",
+                    (key, time.time() - self.ttl),
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to read critique cache: {e}")
+            return None
+        return row[0] if row else None
+
+    def put(self, key: str, response: str) -> None:
+        try:
+            with self._lock, sqlite3.connect(self.path) as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO critiques (key, response, created_at) VALUES (?, ?, ?)",
+                    (key, response, time.time()),
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to store critique in cache: {e}")
+
+
+_default_critique_cache: Optional[CritiqueCache] = None
+
+
+def get_default_critique_cache() -> Optional[CritiqueCache]:
+    """Return the cache configured by CRITIQUE_CACHE_PATH, or None if disabled"""
+    global _default_critique_cache
+    if _default_critique_cache is None and CRITIQUE_CACHE_PATH:
+        try:
+            _default_critique_cache = CritiqueCache(
+                CRITIQUE_CACHE_PATH, CRITIQUE_CACHE_TTL
+            )
+        except sqlite3.Error as e:
+            logger.warning(f"Critique cache disabled, failed to open {CRITIQUE_CACHE_PATH}: {e}")
+            return None
+    return _default_critique_cache
+
+
 def batch_evaluate_issues(
-    critic_clients: Dict[str, Any], issues: List[Issue]
+    critic_clients: Dict[str, Any],
+    issues: List[Issue],
+    critique_cache: Optional[CritiqueCache] = None,
+    max_workers: int = 32,
+    batch_size: int = 8,
 ) -> List[Issue]:
     """
     Evaluate a list of issues using critic clients.
 
+    Critic calls run concurrently; results are applied to the issues on the
+    calling thread. Uncached issues that share a source graph are sent to a
+    critic together, up to batch_size per request, so the graph is only put
+    in one prompt.
+
     Args:
         critic_clients: Dictionary of critic name -> LLM client
         issues: List of Issue objects to evaluate
+        critique_cache: Store of previous critic responses, defaults to the
+            cache configured by CRITIQUE_CACHE_PATH
+        max_workers: Upper bound on concurrent critic calls
+        batch_size: Most issues judged in a single critic request; 1 keeps
+            one request per issue
 
     Returns:
         List of evaluated Issue objects with updated critic_evaluations and validation_score
     """
     logger.info(f"Evaluating {len(issues)} issues with {len(critic_clients)} critics")
+    if critique_cache is None:
+        critique_cache = get_default_critique_cache()
 
+    results = []
+    groups: Dict[Tuple[str, str], List[Issue]] = {}
     for critic_name, critic_client in critic_clients.items():
-        logger.info(f"Evaluating issues with {critic_name}")
-
         for issue in issues:
             # Skip if already evaluated by this critic
-            if (
-                critic_name in issue.critic_evaluations
-                and issue.critic_evaluations[critic_name]
-            ):
-                try:
-                    robust_json_parse(issue.critic_evaluations[critic_name], "object")
-                    continue  # Skip if valid evaluation exists
-                except:
-                    logger.warning(
-                        f"Invalid critique found for {critic_name}, re-evaluating"
+            if critic_name in issue._parsed_evaluations:
+                continue
+            if issue.critic_evaluations.get(critic_name):
+                logger.warning(
+                    f"Invalid critique found for {critic_name}, re-evaluating"
+                )
+            cached = None
+            if critique_cache is not None:
+                # Either template judges the same issue over the same graph
+                for template in CRITIQUE_TEMPLATES:
+                    cached = critique_cache.get(
+                        critique_cache.make_key(critic_name, issue, template)
                     )
-
-            # Evaluate this issue
-            try:
-                evaluation = evaluate_single_issue(critic_name, critic_client, issue)
-                if evaluation:
-                    issue.critic_evaluations[critic_name] = evaluation
-
-                    # Update validation score if critique is positive
-                    try:
-                        critique_res = robust_json_parse(evaluation, "object")
-                        if critique_res.get("is_valid") is True:
-                            issue.validation_score += 0.9
-                    except:
-                        logger.error(
-                            f"Failed to parse critique for validation score update"
-                        )
-
-            except Exception as e:
-                logger.error(f"Failed to evaluate issue with {critic_name}: {e}")
+                    if cached:
+                        break
+            if cached:
+                logger.info(f"Reusing cached critique from {critic_name}")
+                results.append((critic_name, issue, cached, None))
+                continue
+            graph_key = dumps_compact(issue.source_graph)
+            groups.setdefault((critic_name, graph_key), []).append(issue)
+
+    tasks = []
+    for (critic_name, graph_key), pending in groups.items():
+        for batch in _split_critique_batch(graph_key, pending, batch_size):
+            tasks.append((critic_name, critic_clients[critic_name], batch))
+
+    if tasks:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(tasks))) as executor:
+            future_to_task = {
+                executor.submit(_critique_batch, critic_name, critic_client, batch): (
+                    critic_name,
+                    batch,
+                )
+                for critic_name, critic_client, batch in tasks
+            }
+
+            for future in as_completed(future_to_task):
+                critic_name, batch = future_to_task[future]
+                try:
+                    evaluations = future.result()
+                except Exception as e:
+                    logger.error(f"Failed to evaluate issue with {critic_name}: {e}")
+                    continue
+                for issue, (evaluation, template) in zip(batch, evaluations):
+                    results.append((critic_name, issue, evaluation, template))
+
+    for critic_name, issue, evaluation, template in results:
+        if not evaluation:
+            continue
+
+        issue.critic_evaluations[critic_name] = evaluation
+
+        # Update validation score if critique is positive
+        try:
+            critique_res = robust_json_parse(evaluation, "object")
+        except Exception as parse_error:
+            logger.warning(f"Could not parse evaluation response: {parse_error}")
+            logger.info(f"Raw evaluation response: {evaluation[:200]}...")
+            continue
+
+        issue._parsed_evaluations[critic_name] = critique_res
+        _log_critique(critique_res)
+        if critique_res.get("is_valid") is True:
+            issue.validation_score += 0.9
+        # Only keep critiques that parse
+        if critique_cache is not None and template is not None:
+            critique_cache.put(
+                critique_cache.make_key(critic_name, issue, template), evaluation
+            )
 
     return issues
 
 
+def _split_critique_batch(
+    graph_data: str, pending: List[Issue], batch_size: int
+) -> List[List[Issue]]:
+    """Chunk issues sharing a graph by count and by the prompt token budget"""
+    budget = MAX_PROMPT_TOKENS - calculate_tokens(graph_data)
+    batches, batch, used = [], [], 0
+    for issue in pending:
+        cost = calculate_tokens(issue.reasoning) + calculate_tokens(
+            get_issue_guideline(issue.issue_type)
+        )
+        if batch and (len(batch) >= batch_size or used + cost > budget):
+            batches.append(batch)
+            batch, used = [], 0
+        batch.append(issue)
+        used += cost
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def _critique_batch(
+    critic_name: str, critic_client: Any, issues: List[Issue]
+) -> List[Tuple[Optional[str], str]]:
+    """
+    Judge issues that share a source graph with one critic request.
+
+    Returns:
+        One (evaluation JSON string, template name) per issue, in input order;
+        issues the batch response leaves out are evaluated on their own
+    """
+    if len(issues) == 1:
+        return [(evaluate_single_issue(critic_name, critic_client, issues[0]), "single")]
+
+    evaluations: List[Optional[Tuple[Optional[str], str]]] = [None] * len(issues)
+    response = evaluate_issue_batch(critic_name, critic_client, issues)
+    if response:
+        try:
+            verdicts = robust_json_parse(response, "array")
+        except Exception as e:
+            logger.warning(f"Could not parse batch evaluation from {critic_name}: {e}")
+            verdicts = []
+        for verdict in verdicts:
+            if not isinstance(verdict, dict):
+                continue
+            idx = verdict.get("idx")
+            if isinstance(idx, int) and 0 <= idx < len(issues):
+                evaluations[idx] = (
+                    json.dumps(
+                        {
+                            "is_valid": verdict.get("is_valid"),
+                            "critique": verdict.get("critique"),
+                        },
+                        ensure_ascii=False,
+                    ),
+                    "batch",
+                )
+
+    for idx, issue in enumerate(issues):
+        if evaluations[idx] is None:
+            evaluations[idx] = (
+                evaluate_single_issue(critic_name, critic_client, issue),
+                "single",
+            )
+    return evaluations
+
+
 def evaluate_single_issue(
     critic_name: str, critic_client: Any, issue: Issue
 ) -> Optional[str]:
@@ -119,7 +477,8 @@ def evaluate_single_issue(
         issue: Issue object to evaluate
 
     Returns:
-        Evaluation result as JSON string or None if failed
+        Evaluation result as JSON string or None if failed; parsing and
+        logging the verdict is left to batch_evaluate_issues
     """
 
     # Determine critic object based on issue type
@@ -134,49 +493,15 @@ def evaluate_single_issue(
     guideline = get_issue_guideline(issue.issue_type)
 
     # Build evaluation prompt
-    issue_critic_prompt = f"""You are a knowledge graph quality expert. Your task is to determine if a reported issue actually exists in the given graph.
-
-# Quality Standards
-
-A high-quality knowledge graph should be:
-- **Non-redundant**: Contains unique entities and relationships, avoiding duplication of the same real-world concept or connection.
-- **Coherent**: Entities and relationships form a logical, consistent, and understandable structure representing the domain.
-- **Precise**: Entities and relationships have clear, unambiguous definitions and descriptions, accurately representing specific concepts and connections.
-- **Factually accurate**: All represented knowledge correctly reflects the real world or the intended domain scope.
-- **Efficiently connected**: Features optimal pathways between related entities, avoiding unnecessary or misleading connections while ensuring essential links exist.
-
-
-## Issue Identification Guidelines
-
-{guideline}
-
-# Your Task
-
-## Graph Data:
-{json.dumps(issue.source_graph, indent=2, ensure_ascii=False)}
-
-## Reported Issue:
-- **Type**: {issue.issue_type}
-- **{critic_object}**
-- **Reasoning**: {issue.reasoning}
-
-## Evaluation Rules:
-
-**For {issue.issue_type} issues:**
-- **is_valid: true** = The specified entities/relationships DO have the {issue.issue_type.replace('_', ' ')} problem
-- **is_valid: false** = The specified entities/relationships do NOT have the {issue.issue_type.replace('_', ' ')} problem
-
-**Important**: The reasoning provided may explain why something is NOT a problem. If the reasoning correctly explains that no problem exists, then is_valid should be FALSE.
-
-**Example**: If reasoning says "entities are not redundant because they serve different purposes" and you agree, then is_valid = false (no redundancy problem exists).
-
-Base your judgment solely on the graph data and the issue type definition above. Response format (surrounding by ```json and ```):
-```json
-{{
-"is_valid": true/false,
-"critique": "Your analysis explaining whether the claimed problem actually exists in the graph, with specific references to graph elements."
-}}
-```"""
+    issue_critic_prompt = ISSUE_CRITIC_PROMPT_TEMPLATE.format(
+        guideline=guideline,
+        # Compact separators: the critic does not need indentation
+        graph_data=dumps_compact(issue.source_graph),
+        issue_type=issue.issue_type,
+        issue_type_label=issue.issue_type.replace("_", " "),
+        critic_object=critic_object,
+        reasoning=issue.reasoning,
+    )
 
     # Log detailed issue information
     logger.info(
@@ -186,73 +511,65 @@ Base your judgment solely on the graph data and the issue type definition above.
     logger.info(f"Issue reasoning: {issue.reasoning}")
 
     try:
-        response = critic_client.generate(issue_critic_prompt)
+        return critic_client.generate(issue_critic_prompt)
+    except Exception as e:
+        logger.error(f"Failed to generate critique with {critic_name}: {e}")
+        return None
 
-        # Log the evaluation result
-        if response:
-            try:
-                critique_result = robust_json_parse(response, "object")
-                is_valid = critique_result.get("is_valid", "unknown")
-                critique_text = critique_result.get("critique", "No critique provided")
 
-                logger.info(f"Evaluation result - Is Valid: {is_valid}")
-                logger.info(f"Critique: {critique_text}")
+def evaluate_issue_batch(
+    critic_name: str, critic_client: Any, issues: List[Issue]
+) -> Optional[str]:
+    """
+    Evaluate several issues over the same source graph with one critic call.
 
-                if is_valid is True:
-                    logger.info(f"✅ Issue CONFIRMED as valid quality problem")
-                elif is_valid is False:
-                    logger.info(f"❌ Issue REJECTED as not a real problem")
-                else:
-                    logger.warning(f"⚠️  Issue evaluation result unclear: {is_valid}")
+    Returns:
+        Raw critic response holding a JSON array of {idx, is_valid, critique},
+        or None if the call failed
+    """
+    issue_types = list(dict.fromkeys(issue.issue_type for issue in issues))
+    reported = [
+        {
+            "idx": idx,
+            "issue_type": issue.issue_type,
+            "affected_ids": issue.affected_ids,
+            "reasoning": issue.reasoning,
+        }
+        for idx, issue in enumerate(issues)
+    ]
+    issue_critic_prompt = BATCH_ISSUE_CRITIC_PROMPT_TEMPLATE.format(
+        guidelines="\n".join(get_issue_guideline(t) for t in issue_types),
+        graph_data=dumps_compact(issues[0].source_graph),
+        issues=dumps_pretty(reported),
+    )
 
-            except Exception as parse_error:
-                logger.warning(f"Could not parse evaluation response: {parse_error}")
-                logger.info(f"Raw evaluation response: {response[:200]}...")
+    logger.info(f"Evaluating {len(issues)} issues in one request with {critic_name}")
 
-        return response
+    try:
+        return critic_client.generate(issue_critic_prompt)
     except Exception as e:
-        logger.error(f"Failed to generate critique with {critic_name}: {e}")
+        logger.error(f"Failed to generate batch critique with {critic_name}: {e}")
         return None
 
 
-def get_issue_guideline(issue_type: str) -> str:
-    """Get the evaluation guideline for a specific issue type"""
-
-    guidelines = {
-        "redundancy_entity": """**Redundant Entities**(redundancy_entity):
-
-- Definition: Two or more distinct entity entries represent the exact same real-world entity or concept (identical in type and instance).
-- Identification: Look for highly similar names, aliases, and descriptions that clearly refer to the same thing without meaningful distinction.
-- Exclusion: Do not flag entities as redundant if they represent different levels in a clear hierarchy (e.g., "Artificial Intelligence" vs. "Machine Learning") or distinct concepts that happen to be related (e.g., "Company A" vs. "CEO of Company A").
-""",
-        "redundancy_relationship": """**Redundant Relationships**(redundancy_relationship):
+def _log_critique(critique_result: Dict[str, Any]) -> None:
+    """Log the outcome of a parsed critic evaluation"""
+    is_valid = critique_result.get("is_valid", "unknown")
+    critique_text = critique_result.get("critique", "No critique provided")
 
-- Definition: Two or more distinct relationship entries connect the same pair of source and target entities (or entities identified as redundant duplicates) with the same semantic meaning.
-- Identification: Look for identical or near-identical source/target entity pairs and relationship types/descriptions that convey the exact same connection. Minor variations in phrasing that don't change the core meaning should still be considered redundant.
-- Example:
-    - Redundant: User → Purchased → Product and Customer → Ordered → Product.
-    - Non-redundant: User → Purchased in 2023 → Product and Customer → Purchased 2024 → Product.
-- Note: Overlap in descriptive text between an entity and a relationship connected to it is generally acceptable for context and should not, by itself, trigger redundancy.
-""",
-        "entity_quality_issue": """**Entity Quality Issues**(entity_quality_issue):
+    logger.info(f"Evaluation result - Is Valid: {is_valid}")
+    logger.info(f"Critique: {critique_text}")
 
-- Definition: Fundamental flaws within a single entity's definition, description, or attributes that significantly hinder its clarity, accuracy, or usability. This is about core problems, not merely lacking detail.
-- Subtypes:
-    - Inconsistent Claims: Contains attributes or information that directly contradict each other (e.g., having mutually exclusive status flags like Status: Active and Status: Deleted). This points to a factual impossibility within the entity's representation.
-    - Meaningless or Fundamentally Vague Description: The description is so generic, placeholder-like, or nonsensical that it provides no usable information to define or distinguish the entity (e.g., "An item", "Data entry", "See notes", "Used for system processes" without any specifics). The description fails its basic purpose.
-    - Ambiguous Definition/Description: The provided name, description, or key attributes are described in a way that could plausibly refer to multiple distinct real-world concepts or entities, lacking the necessary specificity for unambiguous identification within the graph's context (e.g., An entity named "System" with description "Manages data processing" in a graph with multiple such systems).
-""",
-        "relationship_quality_issue": """**Relationship Quality Issues**(relationship_quality_issue):
+    if is_valid is True:
+        logger.info(f"✅ Issue CONFIRMED as valid quality problem")
+    elif is_valid is False:
+        logger.info(f"❌ Issue REJECTED as not a real problem")
+    else:
+        logger.warning(f"⚠️  Issue evaluation result unclear: {is_valid}")
 
-- Definition: Fundamental flaws within a single relationship's definition or description that obscure its purpose, meaning, or the nature of the connection between the source and target entities. This is about core problems, not merely lacking detail.
-- Subtypes:
-    - Contradictory Definitions: Conflicting attributes or logic.
-    - Fundamentally Unclear or Ambiguous Meaning: The relationship type or description is so vague, generic, or poorly defined that the nature of the connection between the source and target cannot be reliably understood. It fails to convey a specific semantic meaning. (e.g., `System A -- affects --> System B` without any context of how). This covers cases where the essential meaning is missing, making the relationship definition practically useless or open to multiple interpretations.
-    - **Explicit Exclusions (Important!)**:
-        * **Do NOT flag as a quality issue** solely because a description could be more detailed or comprehensive. The focus must remain on whether the *existing* definition is fundamentally flawed (contradictory, ambiguous, unclear).
-""",
-    }
 
-    return guidelines.get(
+def get_issue_guideline(issue_type: str) -> str:
+    """Get the evaluation guideline for a specific issue type"""
+    return ISSUE_GUIDELINES.get(
         issue_type, "No specific guideline available for this issue type."
     )
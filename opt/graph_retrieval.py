@@ -1,4 +1,3 @@
-import hashlib
 import logging
 from sqlalchemy.orm import Session
 from sqlalchemy import text
@@ -7,6 +6,24 @@ from utils.uuid_utils import validate_uuid_list
 
 logger = logging.getLogger(__name__)
 
+# Stream rows through a server-side cursor instead of materializing the whole
+# result; source data rows carry full document content. A partially consumed
+# streamed result must be closed before the connection can run another query.
+_STREAM_OPTIONS = {"stream_results": True, "yield_per": 1000}
+
+# Keys of the records returned for each kind of row
+_ENTITY_KEYS = ("id", "name", "description", "attributes")
+_RELATIONSHIP_KEYS = (
+    "id",
+    "source_entity_name",
+    "target_entity_name",
+    "source_entity_id",
+    "target_entity_id",
+    "relationship_desc",
+    "attributes",
+)
+_SOURCE_DATA_KEYS = ("id", "name", "content", "link", "source_type", "attributes")
+
 
 def query_entities_by_ids(db: Session, entities_id: list[str]):
     # Validate input IDs to ensure they are proper UUIDs
@@ -19,19 +36,15 @@ def query_entities_by_ids(db: Session, entities_id: list[str]):
     sql = text(
         f"""SELECT id, name, description, attributes from entities where id in :entities_id"""
     )
-    res = db.execute(sql, {"entities_id": valid_ids})
-    entities = {}
+    res = db.execute(
+        sql, {"entities_id": valid_ids}, execution_options=_STREAM_OPTIONS
+    )
 
     try:
-        for row in res.fetchall():
-            entities[row.id] = {
-                "id": row.id,
-                "name": row.name,
-                "description": row.description,
-                "attributes": row.attributes,
-            }
+        entities = {row["id"]: dict(row) for row in res.mappings()}
     except Exception as e:
         logger.error(f"Failed to query entities: {e}")
+        res.close()
         return {}
 
     return entities
@@ -45,27 +58,31 @@ def get_relationship_by_entity_ids(db: Session, entity_ids: list[str]):
         logger.warning("No valid UUIDs provided for relationship query by entity IDs")
         return {}
 
+    # One branch per endpoint column: an OR across both columns keeps the
+    # planner from using their indexes. Rows matching on both sides show up
+    # twice and collapse when keyed by id below.
     sql = text(
         f"""SELECT rel.id, source_entity.name as source_entity_name, target_entity.name as target_entity_name, rel.relationship_desc, rel.attributes
                FROM relationships as rel
                LEFT JOIN entities as source_entity ON rel.source_entity_id = source_entity.id
                LEFT JOIN entities as target_entity ON rel.target_entity_id = target_entity.id
-        where rel.source_entity_id in :entity_ids or rel.target_entity_id in :entity_ids """
+        where rel.source_entity_id in :entity_ids
+        UNION ALL
+        SELECT rel.id, source_entity.name as source_entity_name, target_entity.name as target_entity_name, rel.relationship_desc, rel.attributes
+               FROM relationships as rel
+               LEFT JOIN entities as source_entity ON rel.source_entity_id = source_entity.id
+               LEFT JOIN entities as target_entity ON rel.target_entity_id = target_entity.id
+        where rel.target_entity_id in :entity_ids """
+    )
+    res = db.execute(
+        sql, {"entity_ids": valid_ids}, execution_options=_STREAM_OPTIONS
     )
-    res = db.execute(sql, {"entity_ids": valid_ids})
-    background_relationships = {}
 
     try:
-        for row in res.fetchall():
-            background_relationships[row.id] = {
-                "id": row.id,
-                "source_entity_name": row.source_entity_name,
-                "target_entity_name": row.target_entity_name,
-                "relationship_desc": row.relationship_desc,
-                "attributes": row.attributes,
-            }
+        background_relationships = {row["id"]: dict(row) for row in res.mappings()}
     except Exception as e:
         logger.error(f"Failed to get relationships: {e}")
+        res.close()
         return {}
 
     return background_relationships
@@ -94,22 +111,15 @@ def get_relationship_by_ids(db: Session, relationship_ids: list[str]):
         where rel.id in :relationship_ids
     """
     )
-    res = db.execute(sql, {"relationship_ids": valid_ids})
-    background_relationships = {}
+    res = db.execute(
+        sql, {"relationship_ids": valid_ids}, execution_options=_STREAM_OPTIONS
+    )
 
     try:
-        for row in res.fetchall():
-            background_relationships[row.id] = {
-                "id": row.id,
-                "source_entity_name": row.source_entity_name,
-                "target_entity_name": row.target_entity_name,
-                "source_entity_id": row.source_entity_id,
-                "target_entity_id": row.target_entity_id,
-                "relationship_desc": row.relationship_desc,
-                "attributes": row.attributes,
-            }
+        background_relationships = {row["id"]: dict(row) for row in res.mappings()}
     except Exception as e:
         logger.error(f"Failed to get relationships: {e}")
+        res.close()
         return {}
 
     return background_relationships
@@ -137,21 +147,15 @@ def get_source_data_by_ids(db: Session, source_data_ids: list[str]):
         WHERE sd.id IN :source_data_ids
     """
     )
-    res = db.execute(sql, {"source_data_ids": valid_ids})
-    source_data = {}
+    res = db.execute(
+        sql, {"source_data_ids": valid_ids}, execution_options=_STREAM_OPTIONS
+    )
 
     try:
-        for row in res.fetchall():
-            source_data[row.id] = {
-                "id": row.id,
-                "name": row.name,
-                "content": row.content,
-                "link": row.link,
-                "source_type": row.source_type,
-                "attributes": row.attributes,
-            }
+        source_data = {row["id"]: dict(row) for row in res.mappings()}
     except Exception as e:
         logger.error(f"Failed to get source data: {e}")
+        res.close()
         return {}
 
     return source_data
@@ -177,31 +181,28 @@ def get_source_data_by_entity_ids(db: Session, entity_ids: list[str]):
             sd.content_hash
         FROM source_data as sd
         LEFT JOIN content_store cs ON sd.content_hash = cs.content_hash
-        INNER JOIN source_graph_mapping as sgm ON sd.id = sgm.source_id
-        WHERE sgm.graph_element_type = 'entity' 
-        AND sgm.graph_element_id IN :entity_ids
+        WHERE sd.id IN (
+            SELECT sgm.source_id FROM source_graph_mapping as sgm
+            WHERE sgm.graph_element_type = 'entity'
+            AND sgm.graph_element_id IN :entity_ids
+        )
     """
     )
-    res = db.execute(sql, {"entity_ids": valid_ids})
-    source_data = {}
+    res = db.execute(
+        sql, {"entity_ids": valid_ids}, execution_options=_STREAM_OPTIONS
+    )
 
     try:
-        for row in res.fetchall():
-            # Use content_hash directly from the database instead of calculating it
-            content_hash = (
-                row.content_hash
-                or hashlib.sha256((row.content or "").encode()).hexdigest()
-            )
-            source_data[content_hash] = {
-                "id": row.id,
-                "name": row.name,
-                "content": row.content,
-                "link": row.link,
-                "source_type": row.source_type,
-                "attributes": row.attributes,
+        # Collapse sources sharing the same stored content
+        source_data = {
+            row["content_hash"] or row["id"]: {
+                key: row[key] for key in _SOURCE_DATA_KEYS
             }
+            for row in res.mappings()
+        }
     except Exception as e:
         logger.error(f"Failed to get source data by entity ids: {e}")
+        res.close()
         return {}
 
     return list(source_data.values())
@@ -229,31 +230,316 @@ def get_source_data_by_relationship_ids(db: Session, relationship_ids: list[str]
             sd.content_hash
         FROM source_data as sd
         LEFT JOIN content_store cs ON sd.content_hash = cs.content_hash
-        INNER JOIN source_graph_mapping as sgm ON sd.id = sgm.source_id
-        WHERE sgm.graph_element_type = 'relationship' 
-        AND sgm.graph_element_id IN :relationship_ids
+        WHERE sd.id IN (
+            SELECT sgm.source_id FROM source_graph_mapping as sgm
+            WHERE sgm.graph_element_type = 'relationship'
+            AND sgm.graph_element_id IN :relationship_ids
+        )
     """
     )
-    res = db.execute(sql, {"relationship_ids": valid_ids})
-    source_data = {}
+    res = db.execute(
+        sql, {"relationship_ids": valid_ids}, execution_options=_STREAM_OPTIONS
+    )
 
     try:
-        for row in res.fetchall():
-            # Use content_hash directly from the database instead of calculating it
-            content_hash = (
-                row.content_hash
-                or hashlib.sha256((row.content or "").encode()).hexdigest()
-            )
-            source_data[content_hash] = {
-                "id": row.id,
-                "name": row.name,
-                "content": row.content,
-                "link": row.link,
-                "source_type": row.source_type,
-                "attributes": row.attributes,
+        # Collapse sources sharing the same stored content
+        source_data = {
+            row["content_hash"] or row["id"]: {
+                key: row[key] for key in _SOURCE_DATA_KEYS
             }
+            for row in res.mappings()
+        }
     except Exception as e:
         logger.error(f"Failed to get source data by relationship ids: {e}")
+        res.close()
         return {}
 
     return list(source_data.values())
+
+
+# Column layout shared by every branch of the bundle query. Branches fill the
+# columns they do not own with NULL so the rows can be UNION ALL'ed together
+# and dispatched on the synthetic `kind` column. Every branch aliases its
+# columns since any of them may end up first in the union.
+_BUNDLE_ENTITIES_SQL = """
+        SELECT
+            'entity' as kind, e.id, e.name, e.description, e.attributes,
+            NULL as source_entity_id, NULL as source_entity_name,
+            NULL as target_entity_id, NULL as target_entity_name,
+            NULL as relationship_desc,
+            NULL as content, NULL as link, NULL as source_type, NULL as content_hash,
+            NULL as element_id
+        FROM entities as e
+        WHERE e.id IN :entity_ids
+"""
+
+_BUNDLE_RELATIONSHIPS_SQL = """
+        SELECT
+            'relationship' as kind, rel.id, NULL as name, NULL as description, rel.attributes,
+            source_entity.id as source_entity_id, source_entity.name as source_entity_name,
+            target_entity.id as target_entity_id, target_entity.name as target_entity_name,
+            rel.relationship_desc,
+            NULL as content, NULL as link, NULL as source_type, NULL as content_hash,
+            NULL as element_id
+        FROM relationships as rel
+        LEFT JOIN entities as source_entity ON rel.source_entity_id = source_entity.id
+        LEFT JOIN entities as target_entity ON rel.target_entity_id = target_entity.id
+        WHERE {condition}
+"""
+
+_BUNDLE_SOURCE_DATA_SQL = """
+        SELECT
+            'source_data' as kind, sd.id, sd.name, NULL as description, sd.attributes,
+            NULL as source_entity_id, NULL as source_entity_name,
+            NULL as target_entity_id, NULL as target_entity_name,
+            NULL as relationship_desc,
+            cs.content, sd.link, sd.source_type, sd.content_hash,
+            NULL as element_id
+        FROM source_data as sd
+        LEFT JOIN content_store cs ON sd.content_hash = cs.content_hash
+        WHERE sd.id IN (
+            SELECT sgm.source_id FROM source_graph_mapping as sgm
+            WHERE sgm.graph_element_type = '{element_type}'
+            AND sgm.graph_element_id IN :{ids_param}
+        )
+"""
+
+# Like _BUNDLE_SOURCE_DATA_SQL, but one row per mapping so each source can be
+# attributed to the graph element it belongs to
+_BUNDLE_MAPPED_SOURCE_DATA_SQL = """
+        SELECT
+            'source_data' as kind, sd.id, sd.name, NULL as description, sd.attributes,
+            NULL as source_entity_id, NULL as source_entity_name,
+            NULL as target_entity_id, NULL as target_entity_name,
+            NULL as relationship_desc,
+            cs.content, sd.link, sd.source_type, sd.content_hash,
+            sgm.graph_element_id as element_id
+        FROM source_graph_mapping as sgm
+        JOIN source_data as sd ON sd.id = sgm.source_id
+        LEFT JOIN content_store cs ON sd.content_hash = cs.content_hash
+        WHERE sgm.graph_element_type = '{element_type}'
+        AND sgm.graph_element_id IN :{ids_param}
+"""
+
+
+def fetch_graph_bundle(
+    db: Session,
+    entity_ids: list[str] | None = None,
+    relationship_ids: list[str] | None = None,
+):
+    """
+    Fetch the entities, relationships and source data around a set of graph
+    elements in a single round trip.
+
+    For entity_ids this covers what query_entities_by_ids,
+    get_relationship_by_entity_ids and get_source_data_by_entity_ids return;
+    for relationship_ids what get_relationship_by_ids and
+    get_source_data_by_relationship_ids return.
+
+    Returns:
+        Dict with "entities" (id -> entity), "relationships" (id -> relationship)
+        and "source_data" (list deduplicated by content hash)
+    """
+    bundle = {"entities": {}, "relationships": {}, "source_data": []}
+
+    valid_entity_ids = validate_uuid_list(entity_ids) if entity_ids else []
+    valid_relationship_ids = (
+        validate_uuid_list(relationship_ids) if relationship_ids else []
+    )
+
+    branches = []
+    params = {}
+    if valid_entity_ids:
+        params["entity_ids"] = valid_entity_ids
+        branches.append(_BUNDLE_ENTITIES_SQL)
+        # Split per endpoint like get_relationship_by_entity_ids
+        branches.append(
+            _BUNDLE_RELATIONSHIPS_SQL.format(
+                condition="rel.source_entity_id IN :entity_ids"
+            )
+        )
+        branches.append(
+            _BUNDLE_RELATIONSHIPS_SQL.format(
+                condition="rel.target_entity_id IN :entity_ids"
+            )
+        )
+        branches.append(
+            _BUNDLE_SOURCE_DATA_SQL.format(
+                element_type="entity", ids_param="entity_ids"
+            )
+        )
+    if valid_relationship_ids:
+        params["relationship_ids"] = valid_relationship_ids
+        branches.append(
+            _BUNDLE_RELATIONSHIPS_SQL.format(condition="rel.id IN :relationship_ids")
+        )
+        branches.append(
+            _BUNDLE_SOURCE_DATA_SQL.format(
+                element_type="relationship", ids_param="relationship_ids"
+            )
+        )
+
+    if not branches:
+        logger.warning("No valid UUIDs provided for graph bundle query")
+        return bundle
+
+    res = db.execute(
+        text("\n        UNION ALL\n".join(branches)), params, execution_options=_STREAM_OPTIONS
+    )
+    source_data = {}
+
+    try:
+        for row in res.mappings():
+            kind = row["kind"]
+            if kind == "entity":
+                bundle["entities"][row["id"]] = {key: row[key] for key in _ENTITY_KEYS}
+            elif kind == "relationship":
+                bundle["relationships"][row["id"]] = {
+                    key: row[key] for key in _RELATIONSHIP_KEYS
+                }
+            else:
+                source_data[row["content_hash"] or row["id"]] = {
+                    key: row[key] for key in _SOURCE_DATA_KEYS
+                }
+    except Exception as e:
+        logger.error(f"Failed to fetch graph bundle: {e}")
+        res.close()
+        return {"entities": {}, "relationships": {}, "source_data": []}
+
+    bundle["source_data"] = list(source_data.values())
+    return bundle
+
+
+def fetch_entity_neighborhoods(db: Session, entity_ids: list[str]):
+    """
+    Fetch the bundle of each entity separately, in a single round trip.
+
+    Equivalent to calling fetch_graph_bundle(db, entity_ids=[entity_id]) for
+    every id, without a query per id.
+
+    Returns:
+        Dict of entity id, as passed in, -> bundle shaped like
+        fetch_graph_bundle's result; ids whose entity does not exist are left
+        out
+    """
+    valid_ids = validate_uuid_list(entity_ids) if entity_ids else []
+    if not valid_ids:
+        logger.warning("No valid UUIDs provided for entity neighborhood query")
+        return {}
+
+    branches = [
+        _BUNDLE_ENTITIES_SQL,
+        _BUNDLE_RELATIONSHIPS_SQL.format(condition="rel.source_entity_id IN :entity_ids"),
+        _BUNDLE_RELATIONSHIPS_SQL.format(condition="rel.target_entity_id IN :entity_ids"),
+        _BUNDLE_MAPPED_SOURCE_DATA_SQL.format(
+            element_type="entity", ids_param="entity_ids"
+        ),
+    ]
+    res = db.execute(
+        text("\n        UNION ALL\n".join(branches)),
+        {"entity_ids": valid_ids},
+        execution_options=_STREAM_OPTIONS,
+    )
+    # The id collation is case-insensitive, so rows may spell an id in a
+    # different case than it was requested in
+    requested = {entity_id.lower(): entity_id for entity_id in valid_ids}
+    entities = {}
+    relationships = {key: {} for key in requested}
+    source_data = {key: {} for key in requested}
+
+    try:
+        for row in res.mappings():
+            kind = row["kind"]
+            if kind == "entity":
+                entities[row["id"].lower()] = {key: row[key] for key in _ENTITY_KEYS}
+            elif kind == "relationship":
+                relationship = {key: row[key] for key in _RELATIONSHIP_KEYS}
+                for endpoint in ("source_entity_id", "target_entity_id"):
+                    endpoint_key = (row[endpoint] or "").lower()
+                    if endpoint_key in requested:
+                        relationships[endpoint_key][row["id"]] = relationship
+            else:
+                element_data = source_data.get((row["element_id"] or "").lower())
+                if element_data is None:
+                    continue
+                element_data[row["content_hash"] or row["id"]] = {
+                    key: row[key] for key in _SOURCE_DATA_KEYS
+                }
+    except Exception as e:
+        logger.error(f"Failed to fetch entity neighborhoods: {e}")
+        res.close()
+        return {}
+
+    return {
+        requested[key]: {
+            "entities": {entity["id"]: entity},
+            "relationships": relationships[key],
+            "source_data": list(source_data[key].values()),
+        }
+        for key, entity in entities.items()
+        if key in requested
+    }
+
+
+def fetch_relationship_neighborhoods(db: Session, relationship_ids: list[str]):
+    """
+    Fetch the bundle of each relationship separately, in a single round trip.
+
+    Equivalent to calling fetch_graph_bundle(db, relationship_ids=[relationship_id])
+    for every id, without a query per id.
+
+    Returns:
+        Dict of relationship id, as passed in, -> bundle shaped like
+        fetch_graph_bundle's result; ids whose relationship does not exist
+        are left out
+    """
+    valid_ids = validate_uuid_list(relationship_ids) if relationship_ids else []
+    if not valid_ids:
+        logger.warning("No valid UUIDs provided for relationship neighborhood query")
+        return {}
+
+    branches = [
+        _BUNDLE_RELATIONSHIPS_SQL.format(condition="rel.id IN :relationship_ids"),
+        _BUNDLE_MAPPED_SOURCE_DATA_SQL.format(
+            element_type="relationship", ids_param="relationship_ids"
+        ),
+    ]
+    res = db.execute(
+        text("\n        UNION ALL\n".join(branches)),
+        {"relationship_ids": valid_ids},
+        execution_options=_STREAM_OPTIONS,
+    )
+    # Keyed case-insensitively, like fetch_entity_neighborhoods
+    requested = {
+        relationship_id.lower(): relationship_id for relationship_id in valid_ids
+    }
+    relationships = {}
+    source_data = {key: {} for key in requested}
+
+    try:
+        for row in res.mappings():
+            if row["kind"] == "relationship":
+                relationships[row["id"].lower()] = {
+                    key: row[key] for key in _RELATIONSHIP_KEYS
+                }
+            else:
+                element_data = source_data.get((row["element_id"] or "").lower())
+                if element_data is None:
+                    continue
+                element_data[row["content_hash"] or row["id"]] = {
+                    key: row[key] for key in _SOURCE_DATA_KEYS
+                }
+    except Exception as e:
+        logger.error(f"Failed to fetch relationship neighborhoods: {e}")
+        res.close()
+        return {}
+
+    return {
+        requested[key]: {
+            "entities": {},
+            "relationships": {relationship["id"]: relationship},
+            "source_data": list(source_data[key].values()),
+        }
+        for key, relationship in relationships.items()
+        if key in requested
+    }
@@ -1,7 +1,13 @@
 import json
+import hashlib
 import logging
 
-from utils.json_utils import robust_json_parse
+from typing import Dict, List, Any, Optional
+
+from opt.helper_cache import IssueAnalysisCache, get_default_analysis_cache
+from opt import lsh_prefilter
+from opt.lsh_prefilter import find_redundancy_candidates
+from utils.json_utils import robust_json_parse, fast_json_loads, dumps_pretty
 
 logger = logging.getLogger(__name__)
 
@@ -108,62 +114,167 @@ your detailed reasoning trajectories for graph here
 Now, Please take more time to think and be comprehensive in your issue, ensure your output is valid, complete, and follows the required structure exactly."""
 
 
+_ANALYSIS_PROMPT_PREFIX = "Now Optimize the following graph:\n"
+_REDUNDANCY_CANDIDATES_PROMPT = (
+    "\n\nPairs pre-screened as textually near-identical, confirm or reject each "
+    "as redundancy and still report any other issues:\n"
+)
+
+# Callers send the prompt above unchanged as the system prompt, with the graph
+# in the user message, so provider-side prefix caches can reuse it across
+# calls. The version changes whenever the system prompt, the user message
+# format or the redundancy pre-screen settings do.
+GRAPH_OPTIMIZATION_PROMPT_VERSION = hashlib.sha256(
+    "\0".join(
+        [
+            GRAPH_OPTIMIZATION_ACTION_SYSTEM_PROMPT_WO_MR,
+            _ANALYSIS_PROMPT_PREFIX,
+            _REDUNDANCY_CANDIDATES_PROMPT,
+            f"lsh:{lsh_prefilter.NUM_PERM}:{lsh_prefilter.BANDS}:"
+            f"{lsh_prefilter.SHINGLE_SIZE}:{lsh_prefilter.SIMILARITY_THRESHOLD}",
+        ]
+    ).encode("utf-8")
+).hexdigest()[:16]
+
+
+def _parse_issue_array(response: str) -> List[Dict[str, Any]]:
+    """
+    Parse the issue array from an analysis response.
+
+    The prompt pins the output to a trailing ```json block, so slice out the
+    last one and parse it directly; anything else goes through
+    robust_json_parse.
+    """
+    start = response.rfind("```json")
+    if start != -1:
+        end = response.find("```", start + 7)
+        if end != -1:
+            try:
+                analysis_tags = fast_json_loads(response[start + 7 : end])
+                if isinstance(analysis_tags, list):
+                    return analysis_tags
+            except ValueError:
+                pass
+    return robust_json_parse(response, "array")
+
+
+# issue_type -> (result category, min affected ids, max affected ids)
+_ISSUE_CATEGORIES = {
+    "redundancy_entity": ("entity_redundancy_issues", 2, None),
+    "redundancy_relationship": ("relationship_redundancy_issues", 2, None),
+    "entity_quality_issue": ("entity_quality_issues", 1, None),
+    "relationship_quality_issue": ("relationship_quality_issues", 1, None),
+    "missing_relationship": ("missing_relationship_issues", 2, 2),
+}
+
+# Canonical copies of the small set of repeated values, so issues parsed from
+# many responses share one string object instead of one per issue
+_CANONICAL_STRINGS = {
+    value: value
+    for value in (*_ISSUE_CATEGORIES, "low", "moderate", "high", "very_high")
+}
+
+
+def _empty_categories() -> Dict[str, List[Dict[str, Any]]]:
+    return {category: [] for category, _, _ in _ISSUE_CATEGORIES.values()}
+
+
 def extract_issues(response: str):
     try:
-        analysis_tags = robust_json_parse(response, "array")
+        analysis_tags = _parse_issue_array(response)
     except Exception as e:
         logger.error(
             f"Error extracting issues from response: {e}, response: {response}"
         )
-        return {
-            "entity_redundancy_issues": [],
-            "relationship_redundancy_issues": [],
-            "entity_quality_issues": [],
-            "relationship_quality_issues": [],
-            "missing_relationship_issues": [],
-        }
-
-    entity_redundancy_issues = []
-    relationship_redundancy_issues = []
-    entity_quality_issues = []
-    relationship_quality_issues = []
-    missing_relationship_issues = []
+        return _empty_categories()
+
+    return _categorize_issues(analysis_tags)
+
+
+def _categorize_issues(analysis_tags: List[Dict[str, Any]]):
+    categorized = _empty_categories()
 
     # Process each analysis tag
     for analysis in analysis_tags:
-        # Extract issue_type and affected_ids
-        issue_type = analysis.get("issue_type", None)
-        affected_ids = analysis.get("affected_ids", [])
-        reasoning = analysis.get("reasoning", None)
-        confidence = analysis.get("confidence", None)
+        if not isinstance(analysis, dict):
+            continue
+        get = analysis.get
+        issue_type = get("issue_type")
+        entry = _ISSUE_CATEGORIES.get(issue_type)
+        if entry is None:
+            continue
 
-        if not issue_type or not affected_ids or not reasoning or not confidence:
+        category, min_ids, max_ids = entry
+        affected_ids = get("affected_ids")
+        reasoning = get("reasoning")
+        confidence = get("confidence")
+        if not affected_ids or not reasoning or not confidence:
+            continue
+        if len(affected_ids) < min_ids or (
+            max_ids is not None and len(affected_ids) > max_ids
+        ):
             continue
 
-        issue = {
-            "issue_type": issue_type,
-            "affected_ids": affected_ids,
-            "reasoning": reasoning,
-            "confidence": confidence,
-            "facto_search": "",
-        }
-
-        # Categorize by issue type
-        if issue_type == "redundancy_entity" and len(affected_ids) >= 2:
-            entity_redundancy_issues.append(issue)
-        elif issue_type == "redundancy_relationship" and len(affected_ids) >= 2:
-            relationship_redundancy_issues.append(issue)
-        elif issue_type == "entity_quality_issue":
-            entity_quality_issues.append(issue)
-        elif issue_type == "relationship_quality_issue":
-            relationship_quality_issues.append(issue)
-        elif issue_type == "missing_relationship" and len(affected_ids) == 2:
-            missing_relationship_issues.append(issue)
-
-    return {
-        "entity_redundancy_issues": entity_redundancy_issues,
-        "relationship_redundancy_issues": relationship_redundancy_issues,
-        "entity_quality_issues": entity_quality_issues,
-        "relationship_quality_issues": relationship_quality_issues,
-        "missing_relationship_issues": missing_relationship_issues,
-    }
+        if isinstance(confidence, str):
+            confidence = _CANONICAL_STRINGS.get(confidence, confidence)
+
+        categorized[category].append(
+            {
+                "issue_type": _CANONICAL_STRINGS[issue_type],
+                "affected_ids": affected_ids,
+                "reasoning": reasoning,
+                "confidence": confidence,
+                "facto_search": "",
+            }
+        )
+
+    return categorized
+
+
+def detect_graph_issues(
+    llm_client,
+    graph_data: Dict[str, Any],
+    analysis_cache: Optional[IssueAnalysisCache] = None,
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Ask the LLM to analyze a graph and return the issues found by category.
+
+    Args:
+        llm_client: LLM client used for the analysis
+        graph_data: Graph with "entities" and "relationships" to analyze
+        analysis_cache: Store of previous analyses, defaults to the cache
+            configured by ANALYSIS_CACHE_PATH
+
+    Returns:
+        Issues categorized as returned by extract_issues
+    """
+    if analysis_cache is None:
+        analysis_cache = get_default_analysis_cache()
+
+    cache_key = None
+    if analysis_cache is not None:
+        model = getattr(getattr(llm_client, "provider", None), "model", "")
+        cache_key = analysis_cache.make_key(
+            model, GRAPH_OPTIMIZATION_PROMPT_VERSION, graph_data
+        )
+        cached = analysis_cache.get(cache_key)
+        if cached is not None:
+            logger.info("Reusing cached issue analysis")
+            return cached
+
+    prompt = _ANALYSIS_PROMPT_PREFIX + dumps_pretty(graph_data)
+    candidates = find_redundancy_candidates(graph_data)
+    if any(candidates.values()):
+        prompt += _REDUNDANCY_CANDIDATES_PROMPT + json.dumps(
+            candidates, ensure_ascii=False
+        )
+    response = llm_client.generate(
+        prompt, system_prompt=GRAPH_OPTIMIZATION_ACTION_SYSTEM_PROMPT_WO_MR
+    )
+    analysis = extract_issues(response)
+
+    # An empty analysis may be a response that failed to parse, keep only
+    # analyses that found something
+    if cache_key is not None and any(analysis.values()):
+        analysis_cache.put(cache_key, analysis)
+    return analysis
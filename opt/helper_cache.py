@@ -0,0 +1,72 @@
+import json
+import logging
+import hashlib
+import sqlite3
+import threading
+from typing import Dict, List, Any, Optional
+
+from setting.base import ANALYSIS_CACHE_PATH
+
+logger = logging.getLogger(__name__)
+
+
+class IssueAnalysisCache:
+    """Disk-backed store of categorized issue analyses keyed by graph content and prompt version"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        with self._lock, sqlite3.connect(self.path) as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS issue_analyses (key TEXT PRIMARY KEY, analysis TEXT NOT NULL)"
+            )
+
+    @staticmethod
+    def make_key(model: str, prompt_version: str, graph_data: Dict[str, Any]) -> str:
+        """Hash everything the analysis prompt is built from"""
+        payload = json.dumps(
+            {
+                "model": model,
+                "prompt_version": prompt_version,
+                "graph_data": graph_data,
+            },
+            sort_keys=True,
+            ensure_ascii=False,
+        )
+        return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, List[Dict[str, Any]]]]:
+        try:
+            with self._lock, sqlite3.connect(self.path) as conn:
+                row = conn.execute(
+                    "SELECT analysis FROM issue_analyses WHERE key = ?", (key,)
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to read issue analysis cache: {e}")
+            return None
+        return json.loads(row[0]) if row else None
+
+    def put(self, key: str, analysis: Dict[str, List[Dict[str, Any]]]) -> None:
+        try:
+            with self._lock, sqlite3.connect(self.path) as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO issue_analyses (key, analysis) VALUES (?, ?)",
+                    (key, json.dumps(analysis, ensure_ascii=False)),
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to store issue analysis in cache: {e}")
+
+
+_default_analysis_cache: Optional[IssueAnalysisCache] = None
+
+
+def get_default_analysis_cache() -> Optional[IssueAnalysisCache]:
+    """Return the cache configured by ANALYSIS_CACHE_PATH, or None if disabled"""
+    global _default_analysis_cache
+    if _default_analysis_cache is None and ANALYSIS_CACHE_PATH:
+        try:
+            _default_analysis_cache = IssueAnalysisCache(ANALYSIS_CACHE_PATH)
+        except sqlite3.Error as e:
+            logger.warning(f"Issue analysis cache disabled, failed to open {ANALYSIS_CACHE_PATH}: {e}")
+            return None
+    return _default_analysis_cache
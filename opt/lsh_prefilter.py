@@ -0,0 +1,97 @@
+import random
+import zlib
+from itertools import combinations
+from typing import Any, Callable, Dict, List, Tuple
+
+# 16 bands of 8 rows put the LSH threshold near (1/16) ** (1/8) ~= 0.71
+NUM_PERM = 128
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+SHINGLE_SIZE = 5
+SIMILARITY_THRESHOLD = 0.7
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+# Fixed seed so signatures, and therefore prompts and cache keys, are stable
+_rng = random.Random(1)
+_PERMUTATIONS = [
+    (_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME))
+    for _ in range(NUM_PERM)
+]
+
+
+def _shingles(text: str) -> set:
+    text = " ".join(text.lower().split())
+    if len(text) <= SHINGLE_SIZE:
+        return {text} if text else set()
+    return {text[i : i + SHINGLE_SIZE] for i in range(len(text) - SHINGLE_SIZE + 1)}
+
+
+def _minhash(shingles: set) -> Tuple[int, ...]:
+    hashes = [zlib.crc32(shingle.encode("utf-8")) for shingle in shingles]
+    return tuple(
+        min(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for h in hashes)
+        for a, b in _PERMUTATIONS
+    )
+
+
+def find_similar_pairs(
+    items: List[Dict[str, Any]], text_of: Callable[[Dict[str, Any]], str]
+) -> List[List[str]]:
+    """
+    Find pairs of items whose texts are likely near-duplicates.
+
+    Items are bucketed by MinHash-LSH over character shingles, and pairs
+    sharing a bucket are kept when their estimated Jaccard similarity reaches
+    SIMILARITY_THRESHOLD.
+
+    Args:
+        items: Records with an "id"
+        text_of: Returns the text to compare for an item
+
+    Returns:
+        List of [id, id] pairs, in input order
+    """
+    signatures = {}
+    for item in items:
+        shingles = _shingles(text_of(item) or "")
+        if shingles:
+            signatures[item["id"]] = _minhash(shingles)
+
+    buckets: Dict[Tuple[int, Tuple[int, ...]], List[str]] = {}
+    for item_id, signature in signatures.items():
+        for band in range(BANDS):
+            band_key = (band, signature[band * ROWS : (band + 1) * ROWS])
+            buckets.setdefault(band_key, []).append(item_id)
+
+    order = {item_id: index for index, item_id in enumerate(signatures)}
+    candidates = set()
+    for bucket in buckets.values():
+        if len(bucket) > 1:
+            candidates.update(combinations(bucket, 2))
+
+    pairs = []
+    ordered = sorted(candidates, key=lambda pair: (order[pair[0]], order[pair[1]]))
+    for first, second in ordered:
+        matches = sum(a == b for a, b in zip(signatures[first], signatures[second]))
+        if matches / NUM_PERM >= SIMILARITY_THRESHOLD:
+            pairs.append([first, second])
+    return pairs
+
+
+def find_redundancy_candidates(graph_data: Dict[str, Any]) -> Dict[str, List[List[str]]]:
+    """Pre-screen a graph for entity and relationship pairs that look redundant"""
+    return {
+        "entities": find_similar_pairs(
+            graph_data.get("entities", []),
+            lambda entity: f"{entity.get('name') or ''} {entity.get('description') or ''}",
+        ),
+        "relationships": find_similar_pairs(
+            graph_data.get("relationships", []),
+            lambda rel: (
+                f"{rel.get('source_entity') or ''} {rel.get('target_entity') or ''} "
+                f"{rel.get('description') or ''}"
+            ),
+        ),
+    }
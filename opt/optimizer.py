@@ -1,48 +1,309 @@
+import functools
+import hashlib
 import json
+import math
 import os
+import re
+import time
+import uuid
 import logging
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
+from pydantic import BaseModel, Field, ValidationError
+from sqlalchemy import case, or_
 from setting.db import db_manager
-from utils.json_utils import robust_json_parse
+from utils.json_utils import dumps_compact, robust_json_parse
 from utils.token import calculate_tokens
 from opt.graph_retrieval import (
-    query_entities_by_ids,
-    get_relationship_by_entity_ids,
-    get_relationship_by_ids,
-    get_source_data_by_entity_ids,
-    get_source_data_by_relationship_ids,
+    fetch_entity_neighborhoods,
+    fetch_graph_bundle,
+    fetch_relationship_neighborhoods,
 )
+from opt.optimizer_cache import get_default_improvement_cache
 from llm.embedding import (
     get_entity_description_embedding,
-    get_text_embedding,
+    get_entity_description_embeddings_batch,
+    get_cached_text_embedding,
+    get_cached_text_embeddings,
 )
 
 logger = logging.getLogger(__name__)
 
-##### refine entity
+##### prompt context
 
 
-def improve_entity_quality(llm_client, issue, entity, relationships, source_data_list):
+def _format_relationship(relationship):
+    return f"""{relationship['source_entity_name']} -> {relationship['target_entity_name']}: {relationship['relationship_desc']}"""
+
+
+def _format_relationship_with_ids(relationship):
+    return f"""{relationship['source_entity_name']}(source_entity_id={relationship['source_entity_id']}) -> {relationship['target_entity_name']}(target_entity_id={relationship['target_entity_id']}): {relationship['relationship_desc']}"""
+
+
+_TERM_RE = re.compile(r"\w+")
+
+
+def _issue_query_text(issue, entities):
+    parts = [issue.get("reasoning") or ""]
+    if isinstance(entities, dict):
+        entities = entities.values()
+    for entity in entities:
+        parts.append(entity.get("name") or "")
+        parts.append(entity.get("description") or "")
+    return " ".join(parts)
+
+
+def _rank_source_data(source_data_list, query_text):
+    """Order source data by TF-IDF cosine similarity to the query text, best first"""
+    if len(source_data_list) < 2 or not query_text:
+        return list(source_data_list)
+
+    doc_terms = [
+        Counter(_TERM_RE.findall((source_data.get("content") or "").lower()))
+        for source_data in source_data_list
+    ]
+    doc_freq = Counter(term for terms in doc_terms for term in terms)
+    num_docs = len(doc_terms)
+
+    def weigh(terms):
+        return {
+            term: count * (math.log((1 + num_docs) / (1 + doc_freq[term])) + 1)
+            for term, count in terms.items()
+        }
+
+    query_vec = weigh(Counter(_TERM_RE.findall(query_text.lower())))
+    query_norm = math.sqrt(sum(w * w for w in query_vec.values()))
+    if query_norm == 0:
+        return list(source_data_list)
+
+    scores = []
+    for terms in doc_terms:
+        doc_vec = weigh(terms)
+        doc_norm = math.sqrt(sum(w * w for w in doc_vec.values()))
+        dot = sum(w * doc_vec.get(term, 0.0) for term, w in query_vec.items())
+        scores.append(dot / (query_norm * doc_norm) if doc_norm else 0.0)
+
+    order = sorted(range(num_docs), key=lambda index: -scores[index])
+    return [source_data_list[index] for index in order]
+
+
+def _select_prompt_context(
+    relationships,
+    source_data_list,
+    format_relationship,
+    query_text=None,
+    relationship_budget=30000,
+    total_budget=70000,
+):
+    """
+    Pick the relationship lines and source data that fit a prompt's token budget.
+
+    Relationships are formatted with format_relationship, with duplicate lines
+    collapsed, and kept until they would exceed relationship_budget; source
+    data then fills the remainder of total_budget, most relevant to
+    query_text first when it is given.
+    """
+    if query_text:
+        source_data_list = _rank_source_data(source_data_list, query_text)
+
+    # Redundant relationships often format to the same line; send it once
+    # with a count instead of repeating it
+    line_counts = Counter(
+        format_relationship(relationship) for relationship in relationships.values()
+    )
+
     format_relationships = []
+    append = format_relationships.append
+    count_tokens = calculate_tokens
     consumed_tokens = 0
-    for relationship in relationships.values():
-        relationship_str = f"""{relationship['source_entity_name']} -> {relationship['target_entity_name']}: {relationship['relationship_desc']}"""
-        consumed_tokens += calculate_tokens(relationship_str)
-        if consumed_tokens > 30000:
+    for relationship_str, count in line_counts.items():
+        if count > 1:
+            relationship_str = f"{relationship_str} [x{count}]"
+        relationship_tokens = count_tokens(relationship_str)
+        if consumed_tokens + relationship_tokens > relationship_budget:
             break
-        format_relationships.append(relationship_str)
+        consumed_tokens += relationship_tokens
+        append(relationship_str)
 
-    consumed_tokens = calculate_tokens(json.dumps(format_relationships, indent=2))
+    # Quotes and separators around each line in the prompt's JSON
+    consumed_tokens += len(format_relationships) * 2 + 2
 
-    # make the token won't exceed 65536
+    # make the token won't exceed 65536; besides the content, each source
+    # carries its keys, id, name, link and type in the prompt's JSON
     selected_source_data = []
     for source_data in source_data_list:
-        consumed_tokens += calculate_tokens(source_data["content"])
-        if consumed_tokens > 70000:
-            selected_source_data = selected_source_data[:-1]
+        source_tokens = count_tokens(source_data["content"] or "") + 32
+        if consumed_tokens + source_tokens > total_budget:
             break
+        consumed_tokens += source_tokens
         selected_source_data.append(source_data)
 
+    return format_relationships, selected_source_data
+
+
+_ENTITY_TEXT_RE = re.compile(
+    r'"name"\s*:\s*"((?:[^"\\]|\\.)*)"\s*,\s*"description"\s*:\s*"((?:[^"\\]|\\.)*)"'
+)
+_STREAM_ERROR_PREFIX = "Error: "
+
+
+def _generate_entity_with_embedding_prefetch(
+    llm_client, prompt, unchanged_texts=frozenset(), **kwargs
+):
+    """
+    Stream an entity-producing completion and start embedding the entity's
+    name and description as soon as both have been generated.
+
+    The embedding lands in the description embedding cache, so the later
+    database update picks it up instead of waiting on a fresh request.
+    (name, description) pairs in unchanged_texts are not embedded, as the
+    update keeps their stored vector. Falls back to a plain (retried)
+    generate call if streaming fails.
+    """
+    response_text = ""
+    last_chunk = ""
+    prefetched = False
+    try:
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            for chunk in llm_client.generate_stream(prompt, **kwargs):
+                response_text += chunk
+                last_chunk = chunk
+                if prefetched or '"' not in chunk:
+                    continue
+                match = _ENTITY_TEXT_RE.search(response_text)
+                if match:
+                    prefetched = True
+                    try:
+                        name, description = (
+                            json.loads(f'"{value}"') for value in match.groups()
+                        )
+                    except ValueError:
+                        continue
+                    if (name, description) not in unchanged_texts:
+                        executor.submit(
+                            get_entity_description_embedding, name, description
+                        )
+    except Exception as e:
+        logger.warning(f"Streaming generation failed, retrying without stream: {e}")
+        return llm_client.generate(prompt, **kwargs)
+    # Providers report stream failures as a final "Error: ..." chunk rather
+    # than raising, so the partial text must not be parsed as the answer
+    if last_chunk.startswith(_STREAM_ERROR_PREFIX):
+        logger.warning(
+            f"Streaming generation failed, retrying without stream: {last_chunk}"
+        )
+        return llm_client.generate(prompt, **kwargs)
+    return response_text
+
+
+def _parse_improvement(response, llm_client, model=None):
+    """
+    Parse an LLM improvement, validating against ``model`` first when given.
+
+    Returns:
+        (result, repaired) where repaired tells whether the LLM had to fix the
+        JSON; repaired results are not cached
+    """
+    if model is not None:
+        try:
+            # Fields the response left out stay out, so callers can tell a
+            # missing key from an empty value
+            return (
+                model.model_validate_json(response).model_dump(exclude_unset=True),
+                False,
+            )
+        except (ValidationError, TypeError):
+            pass
+    try:
+        return robust_json_parse(response, "object"), False
+    except ValueError:
+        return robust_json_parse(response, "object", llm_client), True
+
+
+def _hash_code(digest, code):
+    """Feed a code object's bytecode and constants, nested code included, to digest"""
+    digest.update(code.co_code)
+    for const in code.co_consts:
+        # Code objects repr with their address and frozensets in hash order,
+        # so neither repr is stable across processes
+        if isinstance(const, type(code)):
+            _hash_code(digest, const)
+        elif isinstance(const, frozenset):
+            digest.update(repr(sorted(map(repr, const))).encode("utf-8"))
+        else:
+            digest.update(repr(const).encode("utf-8"))
+
+
+def _cache_improvement(task, required_keys, instructions=""):
+    """
+    Reuse a recent LLM result for the same issue and graph elements, so that
+    retried or backfilled runs do not pay for the same fix twice.
+
+    The decorated function returns (result, repaired). Only results that are
+    dicts with all ``required_keys`` and needed no LLM repair are cached. The
+    key includes a hash of the function's bytecode and constants (where its
+    prompt template lives) and ``instructions``, so editing a prompt
+    invalidates earlier results.
+    """
+
+    def decorator(func):
+        digest = hashlib.blake2b(instructions.encode("utf-8"), digest_size=8)
+        _hash_code(digest, func.__code__)
+        prompt_version = digest.hexdigest()
+
+        @functools.wraps(func)
+        def wrapper(llm_client, issue, entities, relationships, source_data_list):
+            cache = get_default_improvement_cache()
+            if cache is None:
+                return func(
+                    llm_client, issue, entities, relationships, source_data_list
+                )[0]
+
+            model = getattr(getattr(llm_client, "provider", None), "model", "")
+            cache_key = cache.make_key(
+                f"{task}:{prompt_version}:{model}",
+                issue,
+                entities,
+                relationships,
+                [
+                    source_data.get("content_hash") or source_data.get("id")
+                    for source_data in source_data_list
+                ],
+            )
+            cached = cache.get(cache_key)
+            if cached is not None:
+                logger.info(f"Reusing cached {task} result for {issue['affected_ids']}")
+                return cached
+
+            result, repaired = func(
+                llm_client, issue, entities, relationships, source_data_list
+            )
+            if (
+                not repaired
+                and isinstance(result, dict)
+                and all(key in result for key in required_keys)
+            ):
+                cache.put(cache_key, result)
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+##### refine entity
+
+
+@_cache_improvement("improve_entity_quality", ("name", "description", "attributes"))
+def improve_entity_quality(llm_client, issue, entity, relationships, source_data_list):
+    format_relationships, selected_source_data = _select_prompt_context(
+        relationships,
+        source_data_list,
+        _format_relationship,
+        query_text=_issue_query_text(issue, entity),
+    )
+
     improve_entity_quality_prompt = f"""You are an expert assistant specializing in technologies and knowledge graph curation, tasked with rectifying quality issues within a single entity.
 
 ## Objective
@@ -55,22 +316,22 @@ You will be provided with the following information:
 
 1.  **Entity Quality Issue (`issue`):** Describes the specific quality problem(s) with the entity that needs to be addressed.
     ```json
-    {json.dumps(issue, indent=2)}
+    {dumps_compact(issue)}
     ```
 
 2.  **Entity to Improve (`entity_to_improve`):** The entity object refered in the issue.
     ```json
-    {json.dumps(entity, indent=2)}
+    {dumps_compact(entity)}
     ```
 
 3.  **Background Information:** Use this to gain a deeper understanding, resolve inconsistencies/ambiguities, and enrich the entity, ensuring all *genuinely relevant* context informs the improvement process.
     * **Relevant Relationships (`relationships`):** Describes how the problematic entity relates to other entities. Use this to understand its functional role, dependencies, and interactions to clarify its identity and purpose.
         ```json
-        {json.dumps(format_relationships, indent=2)}
+        {dumps_compact(format_relationships)}
         ```
     * **Relevant Source Knowledge (`source_data`):** Text snippets related to the entity. Identify and extract *truly valuable details* from these source data to correct, clarify, and enhance the entity's description and metadata. Prioritize information that resolves the identified quality issues.
         ```json
-        {json.dumps(selected_source_data, indent=2)}
+        {dumps_compact(selected_source_data)}
         ```
 
 ## Core Principles for Entity Improvement
@@ -134,63 +395,80 @@ Based on all the provided information and guidelines, exercising your expert jud
     try:
         token_count = calculate_tokens(improve_entity_quality_prompt)
         logger.info(f"improve entity quality prompt token count: {token_count}")
-        response = llm_client.generate(
-            improve_entity_quality_prompt, max_tokens=token_count + 1024
+        response = _generate_entity_with_embedding_prefetch(
+            llm_client,
+            improve_entity_quality_prompt,
+            unchanged_texts={
+                (current["name"], current["description"])
+                for current in entity.values()
+            },
+            max_tokens=token_count + 1024,
+            json_mode=True,
         )
-        return robust_json_parse(response, "object", llm_client)
+        return _parse_improvement(response, llm_client)
     except Exception as e:
         logger.error(f"Failed to improve entity quality: {e}")
-        return None
+        return None, False
 
 
 def process_entity_quality_issue(
-    session_factory, llm_client, entity_model, relationship_model, row_index, row_issue
+    session_factory,
+    llm_client,
+    entity_model,
+    relationship_model,
+    row_index,
+    row_issue,
+    max_workers=8,
 ):
     resolved_entities = {}
 
+    with session_factory() as session:
+        neighborhoods = fetch_entity_neighborhoods(session, row_issue["affected_ids"])
+
     for affected_id in row_issue["affected_ids"]:
+        if affected_id not in neighborhoods:
+            logger.error(f"Failed to find entity({row_index}) {affected_id}")
+            return False
+
+    def improve_one(affected_id):
         entity_quality_issue = {
             "issue_type": row_issue["issue_type"],
             "reasoning": row_issue["reasoning"],
             "affected_ids": [affected_id],
         }
-
         logger.info(
             f"process entity quality issue ({row_index}), {entity_quality_issue}"
         )
-        with session_factory() as session:
-            try:
-                entities = query_entities_by_ids(
-                    session, entity_quality_issue["affected_ids"]
-                )
-                logger.info(f"Pendding entities({row_index})", entities)
-                if len(entities) == 0:
-                    logger.error(f"Failed to find entity({row_index}) {affected_id}")
-                    return False
-
-                relationships = get_relationship_by_entity_ids(
-                    session, entity_quality_issue["affected_ids"]
-                )
-
-                source_data_list = get_source_data_by_entity_ids(
-                    session, entity_quality_issue["affected_ids"]
-                )
+        bundle = neighborhoods[affected_id]
+        entities = bundle["entities"]
+        logger.debug("pending entities(%s): %d items", row_index, len(entities))
+        return improve_entity_quality(
+            llm_client,
+            entity_quality_issue,
+            entities,
+            bundle["relationships"],
+            bundle["source_data"],
+        )
 
-                updated_entity = improve_entity_quality(
-                    llm_client,
-                    entity_quality_issue,
-                    entities,
-                    relationships,
-                    source_data_list,
-                )
-                logger.info(f"updated entity: {updated_entity}")
-                resolved_entities[affected_id] = updated_entity
+    # Entities are improved independently, so their LLM calls can overlap
+    with ThreadPoolExecutor(
+        max_workers=max(1, min(max_workers, len(row_issue["affected_ids"])))
+    ) as executor:
+        future_to_id = {
+            executor.submit(improve_one, affected_id): affected_id
+            for affected_id in row_issue["affected_ids"]
+        }
+        for future in as_completed(future_to_id):
+            affected_id = future_to_id[future]
+            try:
+                updated_entity = future.result()
             except Exception as e:
-                # No rollback needed for read-only operations
                 logger.error(
                     f"Failed to improve entity quality({row_index}) {affected_id}: {e}"
                 )
                 continue
+            logger.info(f"updated entity: {updated_entity}")
+            resolved_entities[affected_id] = updated_entity
 
     # Phase 2: Batch update all successfully processed entities
     if not resolved_entities:
@@ -201,53 +479,80 @@ def process_entity_quality_issue(
         f"Starting batch update for {len(resolved_entities)} entities({row_index})"
     )
 
+    for affected_id, updated_entity in resolved_entities.items():
+        if not (
+            updated_entity is not None
+            and isinstance(updated_entity, dict)
+            and "name" in updated_entity
+            and "description" in updated_entity
+            and "attributes" in updated_entity
+        ):
+            logger.error(
+                f"Failed to improve entity quality({row_index}), which is invalid or empty. {updated_entity}"
+            )
+            return False
+
     with session_factory() as session:
         try:
+            # Keyed case-insensitively, like fetch_entity_neighborhoods
+            existing_entities = {
+                row.id.lower(): row
+                for row in session.query(
+                    entity_model.id,
+                    entity_model.name,
+                    entity_model.description,
+                    entity_model.attributes,
+                    entity_model.description_vec.is_(None).label("missing_vec"),
+                ).filter(entity_model.id.in_(list(resolved_entities)))
+            }
+
+            update_rows = []
+            pending_embeddings = []
             for affected_id, updated_entity in resolved_entities.items():
-                if (
-                    updated_entity is not None
-                    and isinstance(updated_entity, dict)
-                    and "name" in updated_entity
-                    and "description" in updated_entity
-                    and "attributes" in updated_entity
-                ):
-                    existing_entity = (
-                        session.query(entity_model)
-                        .filter(entity_model.id == affected_id)
-                        .first()
-                    )
-                    if existing_entity is not None:
-                        existing_entity.name = updated_entity["name"]
-                        existing_entity.description = updated_entity["description"]
-                        new_attributes = updated_entity.get("attributes", {})
-                        if isinstance(new_attributes, str):
-                            new_attributes = json.loads(new_attributes)
-                        # Safely preserve existing topic_name and category
-                        existing_attrs = existing_entity.attributes or {}
-                        if "topic_name" in existing_attrs:
-                            new_attributes["topic_name"] = existing_attrs["topic_name"]
-                        if "category" in existing_attrs:
-                            new_attributes["category"] = existing_attrs["category"]
-                        existing_entity.attributes = new_attributes
-                        existing_entity.description_vec = (
-                            get_entity_description_embedding(
-                                updated_entity["name"], updated_entity["description"]
-                            )
-                        )
-                        session.add(existing_entity)
-                        logger.info(
-                            f"Success update entity({row_index}) {affected_id} to {updated_entity}"
-                        )
-                    else:
-                        logger.error(
-                            f"Not found entity({row_index}) {affected_id} to update"
-                        )
-                        return False
-                else:
+                existing_entity = existing_entities.get(affected_id.lower())
+                if existing_entity is None:
                     logger.error(
-                        f"Failed to improve entity quality({row_index}), which is invalid or empty. {updated_entity}"
+                        f"Not found entity({row_index}) {affected_id} to update"
                     )
                     return False
+
+                new_attributes = updated_entity.get("attributes", {})
+                if isinstance(new_attributes, str):
+                    new_attributes = json.loads(new_attributes)
+                # Safely preserve existing topic_name and category
+                existing_attrs = existing_entity.attributes or {}
+                if "topic_name" in existing_attrs:
+                    new_attributes["topic_name"] = existing_attrs["topic_name"]
+                if "category" in existing_attrs:
+                    new_attributes["category"] = existing_attrs["category"]
+
+                row = {
+                    "id": existing_entity.id,
+                    "name": updated_entity["name"],
+                    "description": updated_entity["description"],
+                    "attributes": new_attributes,
+                }
+                if (
+                    existing_entity.missing_vec
+                    or existing_entity.name != row["name"]
+                    or existing_entity.description != row["description"]
+                ):
+                    pending_embeddings.append(row)
+                update_rows.append(row)
+                logger.debug(
+                    "Success update entity(%s) %s to %s",
+                    row_index,
+                    affected_id,
+                    updated_entity,
+                )
+
+            vectors = get_entity_description_embeddings_batch(
+                [(row["name"], row["description"]) for row in pending_embeddings]
+            )
+            for row, vector in zip(pending_embeddings, vectors):
+                row["description_vec"] = vector
+
+            session.bulk_update_mappings(entity_model, update_rows)
             session.commit()
         except Exception as e:
             logging.error(
@@ -262,25 +567,15 @@ def process_entity_quality_issue(
 ##### merge entities
 
 
+@_cache_improvement("merge_entity", ("name", "description", "attributes"))
 def merge_entity(llm_client, issue, entities, relationships, source_data_list):
 
-    format_relationships = []
-    consumed_tokens = 0
-    for relationship in relationships.values():
-        relationship_str = f"""{relationship['source_entity_name']} -> {relationship['target_entity_name']}: {relationship['relationship_desc']}"""
-        consumed_tokens += calculate_tokens(relationship_str)
-        if consumed_tokens > 30000:
-            break
-        format_relationships.append(relationship_str)
-
-    # make the token won't exceed 65536
-    selected_source_data = []
-    for source_data in source_data_list:
-        consumed_tokens += calculate_tokens(source_data["content"])
-        if consumed_tokens > 70000:
-            selected_source_data = selected_source_data[:-1]
-            break
-        selected_source_data.append(source_data)
+    format_relationships, selected_source_data = _select_prompt_context(
+        relationships,
+        source_data_list,
+        _format_relationship,
+        query_text=_issue_query_text(issue, entities),
+    )
 
     merge_entity_prompt = f"""You are an expert assistant specializing in technologies and knowledge graph curation, tasked with intelligently consolidating redundant entity information into a single, authoritative, and comprehensive entity representation.
 
@@ -297,13 +592,13 @@ Your primary goal is to synthesize a **single, high-quality entity** that:
 ### 1. Redundancy Issue (`issue`)
 Describes why these entities are considered redundant and need merging.
 ```json
-{json.dumps(issue, indent=2)}
+{dumps_compact(issue)}
 ```
 
 ### 2. Entities to Merge (`entities`)
 A list of entity objects that require consolidation, potentially spanning different abstraction levels.
 ```json
-{json.dumps(entities, indent=2)}
+{dumps_compact(entities)}
 ```
 
 ### 3. Background Information
@@ -312,13 +607,13 @@ Additional context to enrich the merged entity:
 #### Relevant Relationships (`relationships`)
 Describes how entities relate to other entities in the knowledge graph.
 ```json
-{json.dumps(format_relationships, indent=2)}
+{dumps_compact(format_relationships)}
 ```
 
 #### Relevant Source Knowledge (`source_data`)
 Text snippets related to the entities for context enhancement.
 ```json
-{json.dumps(selected_source_data, indent=2)}
+{dumps_compact(selected_source_data)}
 ```
 
 ## Core Principles for Merging
@@ -405,13 +700,29 @@ Based on all the provided information and guidelines, exercising your expert jud
     try:
         token_count = calculate_tokens(merge_entity_prompt)
         logger.info(f"merge entity prompt token count: {token_count}")
-        response = llm_client.generate(
-            merge_entity_prompt, max_tokens=token_count + 1024
+        response = _generate_entity_with_embedding_prefetch(
+            llm_client,
+            merge_entity_prompt,
+            max_tokens=token_count + 1024,
+            json_mode=True,
         )
-        return robust_json_parse(response, "object", llm_client)
+        return _parse_improvement(response, llm_client)
     except Exception as e:
         logger.error(f"Failed to merge entity: {e}", exc_info=True)
-        return None
+        return None, False
+
+
+# MySQL/TiDB errors worth retrying with a fresh transaction: deadlock, lock
+# wait timeout and TiDB's optimistic write conflict
+_LOCK_CONFLICT_ERRORS = {1205, 1213, 9007}
+_MERGE_APPLY_ATTEMPTS = 3
+_MERGE_RETRY_DELAY = 0.5
+
+
+def _is_lock_conflict(error):
+    orig = getattr(error, "orig", None)
+    args = getattr(orig, "args", None)
+    return bool(args) and args[0] in _LOCK_CONFLICT_ERRORS
 
 
 def process_redundancy_entity_issue(
@@ -428,20 +739,17 @@ def process_redundancy_entity_issue(
     # Phase 1: Collect data and perform LLM merge (outside of session for database operations)
     with session_factory() as session:
         try:
-            entities = query_entities_by_ids(session, row_issue["affected_ids"])
-            logger.info(f"pending entities({row_key})", entities)
+            bundle = fetch_graph_bundle(session, entity_ids=row_issue["affected_ids"])
+            entities = bundle["entities"]
+            logger.debug("pending entities(%s): %d items", row_key, len(entities))
             if len(entities) == 0:
                 logger.error(
                     f"Failed to find entity({row_key}) {row_issue['affected_ids']}"
                 )
                 return False
 
-            relationships = get_relationship_by_entity_ids(
-                session, row_issue["affected_ids"]
-            )
-            source_data_list = get_source_data_by_entity_ids(
-                session, row_issue["affected_ids"]
-            )
+            relationships = bundle["relationships"]
+            source_data_list = bundle["source_data"]
         except Exception as e:
             logger.error(
                 f"Failed to collect data for entity merge({row_key}): {e}",
@@ -459,142 +767,152 @@ def process_redundancy_entity_issue(
         logger.error(f"Failed to merge entity with LLM({row_key}): {e}", exc_info=True)
         return False
 
-    # Phase 2: Apply database operations in a separate session
-    with session_factory() as session:
-        try:
+    if not (
+        merged_entity is not None
+        and isinstance(merged_entity, dict)
+        and "name" in merged_entity
+        and "description" in merged_entity
+        and "attributes" in merged_entity
+    ):
+        logger.error(f"Failed to merge entity({row_key}), which is invalid or empty.")
+        return False
 
-            if (
-                merged_entity is not None
-                and isinstance(merged_entity, dict)
-                and "name" in merged_entity
-                and "description" in merged_entity
-                and "attributes" in merged_entity
-            ):
-                new_entity = entity_model(
-                    name=merged_entity["name"],
-                    description=merged_entity["description"],
-                    attributes=merged_entity.get("attributes", {}),
-                    description_vec=get_entity_description_embedding(
-                        merged_entity["name"], merged_entity["description"]
-                    ),
-                )
-                session.add(new_entity)
-                session.flush()
-                merged_entity_id = new_entity.id
-                logger.info(
-                    f"Merged entity({row_key}) created with ID: {new_entity.name}({merged_entity_id})"
-                )
-                original_entity_ids = {entity["id"] for entity in entities.values()}
-                # Step 2: Update relationships to reference the merged entity
-                # Bulk update source entity IDs
-                session.execute(
-                    relationship_model.__table__.update()
-                    .where(relationship_model.source_entity_id.in_(original_entity_ids))
-                    .values(source_entity_id=merged_entity_id)
-                )
+    # Phase 2: Apply database operations in a separate session, while the
+    # merged description is embedded in the background. Merges of different
+    # groups run concurrently and both rewrite a relationship that links the
+    # two groups, so a lock conflict is retried with a fresh transaction.
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        embedding_future = executor.submit(
+            get_entity_description_embedding,
+            merged_entity["name"],
+            merged_entity["description"],
+        )
+        for attempt in range(1, _MERGE_APPLY_ATTEMPTS + 1):
+            with session_factory() as session:
+                try:
+                    # The id is generated here so the mapping update can run
+                    # while the embedding is still in flight
+                    merged_entity_id = str(uuid.uuid4())
+                    original_entity_ids = {entity["id"] for entity in entities.values()}
+                    # Step 1: update source graph mapping table
+                    session.execute(
+                        source_graph_mapping_model.__table__.update()
+                        .where(
+                            (source_graph_mapping_model.graph_element_id.in_(original_entity_ids))
+                            & (source_graph_mapping_model.graph_element_type == "entity")
+                        )
+                        .values(graph_element_id=merged_entity_id)
+                    )
 
-                # Bulk update target entity IDs
-                session.execute(
-                    relationship_model.__table__.update()
-                    .where(relationship_model.target_entity_id.in_(original_entity_ids))
-                    .values(target_entity_id=merged_entity_id)
-                )
-                # step 3: update source graph mapping table
-                session.execute(
-                    source_graph_mapping_model.__table__.update()
-                    .where(
-                        (
-                            source_graph_mapping_model.graph_element_id.in_(
-                                original_entity_ids
-                            )
+                    # Step 2: insert the merged entity with its vector in a
+                    # single statement; relationships reference it by foreign
+                    # key, so it has to exist before they are repointed
+                    new_entity = entity_model(
+                        id=merged_entity_id,
+                        name=merged_entity["name"],
+                        description=merged_entity["description"],
+                        attributes=merged_entity.get("attributes", {}),
+                        description_vec=embedding_future.result(),
+                    )
+                    session.add(new_entity)
+                    session.flush()
+                    logger.info(
+                        f"Merged entity({row_key}) created with ID: {new_entity.name}({merged_entity_id})"
+                    )
+
+                    # Step 3: Update relationships to reference the merged entity,
+                    # rewriting both endpoints in a single statement
+                    source_matches = relationship_model.source_entity_id.in_(original_entity_ids)
+                    target_matches = relationship_model.target_entity_id.in_(original_entity_ids)
+                    session.execute(
+                        relationship_model.__table__.update()
+                        .where(or_(source_matches, target_matches))
+                        .values(
+                            source_entity_id=case(
+                                (source_matches, merged_entity_id),
+                                else_=relationship_model.source_entity_id,
+                            ),
+                            target_entity_id=case(
+                                (target_matches, merged_entity_id),
+                                else_=relationship_model.target_entity_id,
+                            ),
                         )
-                        & (source_graph_mapping_model.graph_element_type == "entity")
                     )
-                    .values(graph_element_id=merged_entity_id)
-                )
 
-                # step 4: delete original entities after all references are updated
-                session.execute(
-                    entity_model.__table__.delete().where(
-                        entity_model.id.in_(original_entity_ids)
+                    # step 4: delete original entities after all references are updated
+                    session.execute(
+                        entity_model.__table__.delete().where(
+                            entity_model.id.in_(original_entity_ids)
+                        )
                     )
-                )
 
-                logger.info(
-                    f"Relationships and source mappings updated, original entities deleted for merged entity({row_key}) {merged_entity_id}"
-                )
+                    logger.info(
+                        f"Relationships and source mappings updated, original entities deleted for merged entity({row_key}) {merged_entity_id}"
+                    )
 
-                session.commit()  # Commit the relationship updates
-                logger.info(f"Merged entity({row_key}) processing complete.")
-                return True
-            else:
-                logger.error(
-                    f"Failed to merge entity({row_key}), which is invalid or empty."
-                )
-                return False
-        except Exception as e:
-            logger.error(
-                f"Failed to apply entity merge to database({row_key}): {e}",
-                exc_info=True,
-            )
-            session.rollback()
-            return False
+                    session.commit()  # Commit the relationship updates
+                    logger.info(f"Merged entity({row_key}) processing complete.")
+                    return True
+                except Exception as e:
+                    session.rollback()
+                    if _is_lock_conflict(e) and attempt < _MERGE_APPLY_ATTEMPTS:
+                        logger.warning(
+                            f"Lock conflict applying entity merge({row_key}), retrying (attempt {attempt}): {e}"
+                        )
+                        time.sleep(_MERGE_RETRY_DELAY * attempt)
+                        continue
+                    logger.error(
+                        f"Failed to apply entity merge to database({row_key}): {e}",
+                        exc_info=True,
+                    )
+                    return False
 
 
 ##### refine relationship quality
 
 
-def refine_relationship_quality(
-    llm_client, issue, entities, relationships, source_data_list
-):
-    format_relationships = []
-    consumed_tokens = 0
-    for relationship in relationships.values():
-        relationship_str = f"""{relationship['source_entity_name']} -> {relationship['target_entity_name']}: {relationship['relationship_desc']}"""
-        consumed_tokens += calculate_tokens(relationship_str)
-        if consumed_tokens > 30000:
-            break
-        format_relationships.append(relationship_str)
+# Refined and merged relationships are a few hundred tokens of JSON, so the
+# output reservation is capped instead of growing with the prompt
+_RELATIONSHIP_MAX_OUTPUT_TOKENS = 2048
+_MODEL_CONTEXT_TOKENS = 131072
 
-    consumed_tokens = calculate_tokens(json.dumps(format_relationships, indent=2))
-    selected_source_data = []
-    for source_data in source_data_list:
-        consumed_tokens += calculate_tokens(source_data["content"])
-        if consumed_tokens > 70000:
-            selected_source_data = selected_source_data[:-1]
-            break
-        selected_source_data.append(source_data)
 
-    refine_relationship_quality_prompt = f"""You are an expert assistant specializing in technologies and knowledge graph curation, tasked with rectifying quality issues within a single relationship to ensure its meaning is clear, accurate, and truthful by providing an improved description and optimized attributes.
+def _relationship_output_tokens(prompt_tokens):
+    remaining = _MODEL_CONTEXT_TOKENS - prompt_tokens - 128
+    return max(256, min(_RELATIONSHIP_MAX_OUTPUT_TOKENS, remaining))
 
-## Objective
 
-Your primary goal is to analyze a problematic relationship and its surrounding context to craft:
-1. **An accurate, coherent, and semantically meaningful textual description** of the connection between source and target entities
-2. **Well-curated relationship attributes** that provide valuable metadata and context
+class RefinedRelationship(BaseModel):
+    source_entity_name: str
+    target_entity_name: str
+    relationship_desc: str
+    attributes: dict = Field(default_factory=dict)
 
-Both improvements must correct identified flaws (like vagueness or ambiguity) and be **strictly based on evidence**, avoiding any speculation. The aim is to produce a relationship that is genuinely useful and unambiguous for a knowledgeable audience.
 
-## Input Data
+class MergedRelationship(BaseModel):
+    source_entity_id: str
+    target_entity_id: str
+    relationship_desc: str
+    attributes: dict = Field(default_factory=dict)
 
-You will be provided with the following information:
 
-1.  **Relationship Quality Issue (`issue`):** Describes the specific quality problem(s) with the relationship's existing description or definition that needs to be addressed. Your primary task is to generate a new description that resolves these problems.
-    ```json
-    {json.dumps(issue, indent=2)}
-    ```
+def _parse_structured_response(response, model, llm_client):
+    """
+    Validate a schema-constrained response directly, falling back to
+    robust_json_parse for providers that ignore the schema.
+    """
+    return _parse_improvement(response, llm_client, model)[0]
 
-2.  **Relationship to Improve (`relationship_to_improve`):** The relationship object whose description requires quality improvement.
-    ```json
-    {json.dumps(format_relationships, indent=2)}
-    ```
 
-3.  **Background Information:** Use this to gain a deep understanding of the context, resolve ambiguities/contradictions, and formulate the improved description. **The new description MUST be justifiable by this background information.**
+_REFINE_RELATIONSHIP_QUALITY_INSTRUCTIONS = """You are an expert assistant specializing in technologies and knowledge graph curation, tasked with rectifying quality issues within a single relationship to ensure its meaning is clear, accurate, and truthful by providing an improved description and optimized attributes.
 
-    * **Relevant Knowledge (`source_data`):** Text snippets related to the relationship itself or its connected entities. Extract **verifiable details** from these chunks to formulate the improved description.
-        ```json
-        {json.dumps(selected_source_data, indent=2)}
-        ```
+## Objective
+
+Your primary goal is to analyze a problematic relationship and its surrounding context to craft:
+1. **An accurate, coherent, and semantically meaningful textual description** of the connection between source and target entities
+2. **Well-curated relationship attributes** that provide valuable metadata and context
+
+Both improvements must correct identified flaws (like vagueness or ambiguity) and be **strictly based on evidence**, avoiding any speculation. The aim is to produce a relationship that is genuinely useful and unambiguous for a knowledgeable audience.
 
 ## Core Principles for Relationship Improvement
 
@@ -633,143 +951,234 @@ Step 4: Optimizing Relationship Attributes - Apply the following strategies base
 Return a single JSON object representing the improved relationship. The structure MUST be as follows:
 
 ```json
-{{
+{
     "source_entity_name": "...", # use the entity name in the `relationship_to_improve`
     "target_entity_name": "...", # use the entity name in the `relationship_to_improve`
     "relationship_desc": "...",
-    "attributes": {{
+    "attributes": {
         // Curated attributes based on evidence from source_data
         // Include only attributes that add meaningful value and context
         // If no valid attributes can be derived from evidence, use empty object
-    }}
-}}
+    }
+}
 ```
 
+"""
+
+
+@_cache_improvement(
+    "refine_relationship_quality",
+    ("relationship_desc",),
+    _REFINE_RELATIONSHIP_QUALITY_INSTRUCTIONS,
+)
+def refine_relationship_quality(
+    llm_client, issue, entities, relationships, source_data_list
+):
+    format_relationships, selected_source_data = _select_prompt_context(
+        relationships,
+        source_data_list,
+        _format_relationship,
+        query_text=_issue_query_text(issue, entities),
+    )
+
+    # Instructions come first and never change, so providers can reuse their
+    # prefix cache across calls; the per-issue data follows them
+    prompt_inputs = f"""## Input Data
+
+You will be provided with the following information:
+
+1.  **Relationship Quality Issue (`issue`):** Describes the specific quality problem(s) with the relationship's existing description or definition that needs to be addressed. Your primary task is to generate a new description that resolves these problems.
+    ```json
+    {dumps_compact(issue)}
+    ```
+
+2.  **Relationship to Improve (`relationship_to_improve`):** The relationship object whose description requires quality improvement.
+    ```json
+    {dumps_compact(format_relationships)}
+    ```
+
+3.  **Background Information:** Use this to gain a deep understanding of the context, resolve ambiguities/contradictions, and formulate the improved description. **The new description MUST be justifiable by this background information.**
+
+    * **Relevant Knowledge (`source_data`):** Text snippets related to the relationship itself or its connected entities. Extract **verifiable details** from these chunks to formulate the improved description.
+        ```json
+        {dumps_compact(selected_source_data)}
+        ```
+
 Based on all the provided information and guidelines, exercising your expert judgment with a strict adherence to truthfulness, generate **only the new, improved relationship description string.**
 """
+    refine_relationship_quality_prompt = (
+        _REFINE_RELATIONSHIP_QUALITY_INSTRUCTIONS + prompt_inputs
+    )
 
     try:
-        token_count = calculate_tokens(refine_relationship_quality_prompt)
+        token_count = calculate_tokens(
+            _REFINE_RELATIONSHIP_QUALITY_INSTRUCTIONS
+        ) + calculate_tokens(prompt_inputs)
         logger.info(f"refine relationship quality prompt token count: {token_count}")
         response = llm_client.generate(
-            refine_relationship_quality_prompt, max_tokens=token_count + 1024
+            refine_relationship_quality_prompt,
+            max_tokens=_relationship_output_tokens(token_count),
+            prompt_tokens=token_count,
+            json_schema=RefinedRelationship.model_json_schema(),
         )
-        return robust_json_parse(response, "object", llm_client)
+        return _parse_improvement(response, llm_client, RefinedRelationship)
     except Exception as e:
         logger.error(f"Failed to refine relationship quality: {e}", exc_info=True)
-        return None
+        return None, False
 
 
-def process_relationship_quality_issue(
-    session_factory, llm_client, relationship_model, row_key, row_issue
-):
-    logger.info(f"start to process relationship({row_key})")
-    resolved_relationships = {}
+def _refine_relationships(llm_client, tasks, neighborhoods, max_workers):
+    """
+    Refine relationships concurrently.
 
-    for affected_id in row_issue["affected_ids"]:
+    Args:
+        tasks: (row_key, row_issue, affected_id) tuples
+        neighborhoods: Result of fetch_relationship_neighborhoods covering
+            every affected_id
+
+    Returns:
+        Dict of (row_key, affected_id) -> refined relationship, for the calls
+        that did not raise
+    """
+
+    def refine_one(row_key, row_issue, affected_id):
         relationship_quality_issue = {
             "issue_type": row_issue["issue_type"],
             "reasoning": row_issue["reasoning"],
             "affected_ids": [affected_id],
         }
-
         logger.info(f"process relationship({row_key}), {relationship_quality_issue}")
-        with session_factory() as session:
-            try:
-                relationships = get_relationship_by_ids(
-                    session, relationship_quality_issue["affected_ids"]
-                )
-                logger.info(f"Pendding relationships({row_key})", relationships)
-                if len(relationships) == 0:
-                    logger.error(
-                        f"Failed to find relationship({row_key}) {affected_id}"
-                    )
-                    return False
-
-                source_data_list = get_source_data_by_relationship_ids(
-                    session, relationship_quality_issue["affected_ids"]
-                )
+        bundle = neighborhoods[affected_id]
+        relationships = bundle["relationships"]
+        logger.debug("pending relationships(%s): %d items", row_key, len(relationships))
+        return refine_relationship_quality(
+            llm_client,
+            relationship_quality_issue,
+            [],
+            relationships,
+            bundle["source_data"],
+        )
 
-                updated_relationship = refine_relationship_quality(
-                    llm_client,
-                    relationship_quality_issue,
-                    [],
-                    relationships,
-                    source_data_list,
-                )
-                logger.info("updated relationship", updated_relationship)
-                resolved_relationships[affected_id] = updated_relationship
+    refined = {}
+    # Relationships are refined independently, so their LLM calls can overlap
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(tasks)))) as executor:
+        future_to_task = {
+            executor.submit(refine_one, row_key, row_issue, affected_id): (
+                row_key,
+                affected_id,
+            )
+            for row_key, row_issue, affected_id in tasks
+        }
+        for future in as_completed(future_to_task):
+            row_key, affected_id = future_to_task[future]
+            try:
+                updated_relationship = future.result()
             except Exception as e:
-                # No rollback needed for read-only operations
                 logger.error(
                     f"Failed to refine relationship({row_key}) {affected_id}: {e}"
                 )
                 continue
+            logger.debug(
+                "updated relationship(%s) %s: %s",
+                row_key,
+                affected_id,
+                updated_relationship,
+            )
+            refined[(row_key, affected_id)] = updated_relationship
+    return refined
 
-    # Phase 2: Batch update all successfully processed relationships
-    if not resolved_relationships:
-        logger.warning(
-            f"No relationships were successfully processed for row({row_key})"
-        )
-        return False
 
+def _apply_relationship_refinements(
+    session_factory, relationship_model, row_key, resolved_relationships
+):
+    # Phase 2: Batch update all successfully processed relationships
     logger.info(
         f"Starting batch update for {len(resolved_relationships)} relationships({row_key})"
     )
 
+    valid_relationships = {}
+    for affected_id, updated_relationship in resolved_relationships.items():
+        if (
+            updated_relationship is not None
+            and isinstance(updated_relationship, dict)
+            and "relationship_desc" in updated_relationship
+        ):
+            valid_relationships[affected_id] = updated_relationship
+        else:
+            logger.error(
+                f"Invalid relationship quality result({row_key}) {affected_id}: {updated_relationship}"
+            )
+            # Don't return False here, continue with other relationships
+
     with session_factory() as session:
         try:
-            for affected_id, updated_relationship in resolved_relationships.items():
-                if (
-                    updated_relationship is not None
-                    and isinstance(updated_relationship, dict)
-                    and "relationship_desc" in updated_relationship
-                ):
-                    existing_relationship = (
-                        session.query(relationship_model)
-                        .filter(relationship_model.id == affected_id)
-                        .first()
-                    )
-                    if existing_relationship is not None:
-                        existing_relationship.relationship_desc = updated_relationship[
-                            "relationship_desc"
-                        ]
-                        existing_relationship.relationship_desc_vec = (
-                            get_text_embedding(
-                                updated_relationship["relationship_desc"]
-                            )
-                        )
-                        # Update attributes if provided, preserving important existing fields
-                        if "attributes" in updated_relationship:
-                            new_attributes = updated_relationship["attributes"] or {}
-                            if isinstance(new_attributes, str):
-                                new_attributes = json.loads(new_attributes)
-                            # Safely preserve existing important attributes
-                            existing_attrs = existing_relationship.attributes or {}
-                            # Preserve common important fields that should not be lost
-                            important_fields = ["topic_name", "category"]
-                            for field in important_fields:
-                                if (
-                                    field in existing_attrs
-                                    and field not in new_attributes
-                                ):
-                                    new_attributes[field] = existing_attrs[field]
-                            existing_relationship.attributes = new_attributes
-                        # If no new attributes provided, keep existing ones unchanged
-                        session.add(existing_relationship)
-                        logger.info(
-                            f"Prepared relationship({row_key}) {affected_id} for batch update"
-                        )
-                    else:
-                        logger.error(
-                            f"Failed to find relationship({row_key}) {affected_id}"
-                        )
-                        # Don't return False here, continue with other relationships
-                else:
-                    logger.error(
-                        f"Invalid relationship quality result({row_key}) {affected_id}: {updated_relationship}"
-                    )
+            # Keyed case-insensitively, like fetch_relationship_neighborhoods
+            existing_relationships = {
+                row.id.lower(): row
+                for row in session.query(
+                    relationship_model.id,
+                    relationship_model.relationship_desc,
+                    relationship_model.attributes,
+                    relationship_model.relationship_desc_vec.is_(None).label(
+                        "missing_vec"
+                    ),
+                ).filter(relationship_model.id.in_(list(valid_relationships)))
+            }
+
+            update_rows = []
+            pending_embeddings = []
+            unchanged_count = 0
+            for affected_id, updated_relationship in valid_relationships.items():
+                existing_relationship = existing_relationships.get(affected_id.lower())
+                if existing_relationship is None:
+                    logger.error(f"Failed to find relationship({row_key}) {affected_id}")
                     # Don't return False here, continue with other relationships
+                    continue
+
+                row = {"id": existing_relationship.id}
+                relationship_desc = updated_relationship["relationship_desc"]
+                desc_changed = (relationship_desc or "").strip() != (
+                    existing_relationship.relationship_desc or ""
+                ).strip()
+                if desc_changed:
+                    row["relationship_desc"] = relationship_desc
+                # Update attributes if provided, preserving important existing fields
+                existing_attrs = existing_relationship.attributes or {}
+                if "attributes" in updated_relationship:
+                    new_attributes = updated_relationship["attributes"] or {}
+                    if isinstance(new_attributes, str):
+                        new_attributes = json.loads(new_attributes)
+                    # Preserve common important fields that should not be lost
+                    important_fields = ["topic_name", "category"]
+                    for field in important_fields:
+                        if field in existing_attrs and field not in new_attributes:
+                            new_attributes[field] = existing_attrs[field]
+                    if new_attributes != existing_attrs:
+                        row["attributes"] = new_attributes
+                # If no new attributes provided, keep existing ones unchanged
+
+                if desc_changed or existing_relationship.missing_vec:
+                    pending_embeddings.append((row, relationship_desc))
+                if len(row) == 1 and not existing_relationship.missing_vec:
+                    unchanged_count += 1
+                    continue
+                update_rows.append(row)
+                logger.info(
+                    f"Prepared relationship({row_key}) {affected_id} for batch update"
+                )
+
+            if unchanged_count:
+                logger.info(
+                    f"Skipped {unchanged_count} relationships({row_key}) left unchanged by refinement"
+                )
+
+            vectors = get_cached_text_embeddings(
+                [relationship_desc for _, relationship_desc in pending_embeddings]
+            )
+            for (row, _), vector in zip(pending_embeddings, vectors):
+                row["relationship_desc_vec"] = vector
+
+            session.bulk_update_mappings(relationship_model, update_rows)
 
             # Commit all changes at once
             session.commit()
@@ -787,64 +1196,121 @@ def process_relationship_quality_issue(
     return True
 
 
-##### merge redundancy relationship
-
+def process_relationship_quality_issue(
+    session_factory,
+    llm_client,
+    relationship_model,
+    row_key,
+    row_issue,
+    max_workers=8,
+):
+    logger.info(f"start to process relationship({row_key})")
 
-def merge_relationship(llm_client, issue, entities, relationships, source_data_list):
-    format_relationships = []
-    consumed_tokens = 0
-    for relationship in relationships.values():
-        relationship_str = f"""{relationship['source_entity_name']}(source_entity_id={relationship['source_entity_id']}) -> {relationship['target_entity_name']}(target_entity_id={relationship['target_entity_id']}): {relationship['relationship_desc']}"""
-        consumed_tokens += calculate_tokens(relationship_str)
-        if consumed_tokens > 30000:
-            break
-        format_relationships.append(relationship_str)
+    with session_factory() as session:
+        neighborhoods = fetch_relationship_neighborhoods(
+            session, row_issue["affected_ids"]
+        )
 
-    consumed_tokens = calculate_tokens(json.dumps(format_relationships, indent=2))
+    for affected_id in row_issue["affected_ids"]:
+        if affected_id not in neighborhoods:
+            logger.error(f"Failed to find relationship({row_key}) {affected_id}")
+            return False
 
-    # make the token won't exceed 65536
-    selected_source_data = []
-    for source_data in source_data_list:
-        consumed_tokens += calculate_tokens(source_data["content"])
-        if consumed_tokens > 70000:
-            selected_source_data = selected_source_data[:-1]
-            break
-        selected_source_data.append(source_data)
+    refined = _refine_relationships(
+        llm_client,
+        [(row_key, row_issue, affected_id) for affected_id in row_issue["affected_ids"]],
+        neighborhoods,
+        max_workers,
+    )
+    resolved_relationships = {
+        affected_id: updated_relationship
+        for (_, affected_id), updated_relationship in refined.items()
+    }
+    if not resolved_relationships:
+        logger.warning(
+            f"No relationships were successfully processed for row({row_key})"
+        )
+        return False
 
-    merge_relationship_prompt = f"""You are an expert assistant specializing in technologies and knowledge graph curation, tasked with intelligently consolidating redundant relationship information into a single, authoritative, and comprehensive relationship entry.
+    return _apply_relationship_refinements(
+        session_factory, relationship_model, row_key, resolved_relationships
+    )
 
-## Objective
 
-Your primary goal is to synthesize a **single, authoritative, and structured relationship** from multiple redundant entries that:
-1. **Eliminates redundancy** while preserving all valuable information
-2. **Enhances clarity and comprehensiveness** beyond any individual source entry
-3. **Maintains semantic accuracy** based strictly on provided evidence
-4. **Provides structured attributes** that add meaningful context
+def process_relationship_quality_issues(
+    session_factory, llm_client, relationship_model, rows, max_workers=8
+):
+    """
+    Process several relationship quality issues together: one read for all
+    affected relationships, one pool of LLM calls and one bulk update.
+
+    Args:
+        rows: (row_key, row_issue) pairs
+
+    Returns:
+        Dict of row_key -> whether the issue was resolved, matching what
+        process_relationship_quality_issue would return for it
+    """
+    results = {row_key: False for row_key, _ in rows}
+    all_ids = list(
+        dict.fromkeys(
+            affected_id for _, row_issue in rows for affected_id in row_issue["affected_ids"]
+        )
+    )
+    if not all_ids:
+        return results
 
-## Input Data
+    with session_factory() as session:
+        neighborhoods = fetch_relationship_neighborhoods(session, all_ids)
+
+    tasks = []
+    for row_key, row_issue in rows:
+        missing = [
+            affected_id
+            for affected_id in row_issue["affected_ids"]
+            if affected_id not in neighborhoods
+        ]
+        if missing:
+            logger.error(f"Failed to find relationship({row_key}) {missing}")
+            continue
+        tasks.extend(
+            (row_key, row_issue, affected_id) for affected_id in row_issue["affected_ids"]
+        )
+    if not tasks:
+        return results
+
+    refined = _refine_relationships(llm_client, tasks, neighborhoods, max_workers)
+    refined_rows = {row_key for row_key, _ in refined}
+    for row_key, _ in rows:
+        if row_key not in refined_rows:
+            logger.warning(
+                f"No relationships were successfully processed for row({row_key})"
+            )
 
-You will be provided with the following information:
+    resolved_relationships = {
+        affected_id: updated_relationship
+        for (_, affected_id), updated_relationship in refined.items()
+    }
+    if resolved_relationships and _apply_relationship_refinements(
+        session_factory, relationship_model, "batch", resolved_relationships
+    ):
+        for row_key in refined_rows:
+            results[row_key] = True
+    return results
 
-### 1. Redundancy Issue (`issue`)
 
-Describes why these relationship entries are considered redundant and need merging.
-```json
-{json.dumps(issue, indent=2)}
-```
+##### merge redundancy relationship
 
-### 2. Relationships to Merge (`relationships_to_merge`)
 
-A list of relationship entries that require merging. Each entry contains basic relationship information with potential variations in descriptions and attributes.
-```json
-{json.dumps(format_relationships, indent=2)}
-```
+_MERGE_RELATIONSHIP_INSTRUCTIONS = """You are an expert assistant specializing in technologies and knowledge graph curation, tasked with intelligently consolidating redundant relationship information into a single, authoritative, and comprehensive relationship entry.
 
-### 3. Background Information (`source_data`)
+## Objective
 
-Text snippets related to the entities and their interactions. Use this as your **sole source of external information** for enriching the merged relationship.
-```json
-{json.dumps(selected_source_data, indent=2)}
-```
+Your primary goal is to synthesize a **single, authoritative, and structured relationship** from multiple redundant entries that:
+1. **Eliminates redundancy** while preserving all valuable information
+2. **Enhances clarity and comprehensiveness** beyond any individual source entry
+3. **Maintains semantic accuracy** based strictly on provided evidence
+4. **Provides structured attributes** that add meaningful context
 
 ## Core Principles for Merging Relationships
 
@@ -883,34 +1349,106 @@ Return a single JSON object representing the merged relationship (surrounding by
 The structure MUST be as follows:
 
 ```json
-{{
+{
   "source_entity_id": "...", // entity id from input
   "target_entity_id": "...", // entity id from input
   "relationship_desc": "...",      // Merged/synthesized relationship description
-  "attributes": {{
+  "attributes": {
     // Merged and optimized attributes from all source relationships
     // Include only attributes that add meaningful value
     // Resolve conflicts based on evidence and priority rules
     // Add new attributes only when clearly supported by source_data
-  }}
-}}
+  }
+}
+```
+
+"""
+
+
+def merge_relationship(llm_client, issue, entities, relationships, source_data_list):
+    format_relationships, selected_source_data = _select_prompt_context(
+        relationships,
+        source_data_list,
+        _format_relationship_with_ids,
+        query_text=_issue_query_text(issue, entities),
+    )
+
+    # Same layout as refine_relationship_quality: fixed prefix, then data
+    prompt_inputs = f"""## Input Data
+
+You will be provided with the following information:
+
+### 1. Redundancy Issue (`issue`)
+
+Describes why these relationship entries are considered redundant and need merging.
+```json
+{dumps_compact(issue)}
+```
+
+### 2. Relationships to Merge (`relationships_to_merge`)
+
+A list of relationship entries that require merging. Each entry contains basic relationship information with potential variations in descriptions and attributes.
+```json
+{dumps_compact(format_relationships)}
+```
+
+### 3. Background Information (`source_data`)
+
+Text snippets related to the entities and their interactions. Use this as your **sole source of external information** for enriching the merged relationship.
+```json
+{dumps_compact(selected_source_data)}
 ```
 
 Based on all the provided information and guidelines, exercising your expert judgment to infer and synthesize within the given constraints, generate the merged relationship.
 """
+    merge_relationship_prompt = _MERGE_RELATIONSHIP_INSTRUCTIONS + prompt_inputs
 
     try:
-        token_count = calculate_tokens(merge_relationship_prompt)
+        token_count = calculate_tokens(
+            _MERGE_RELATIONSHIP_INSTRUCTIONS
+        ) + calculate_tokens(prompt_inputs)
         logger.info(f"merge relationship prompt token count: {token_count}")
         response = llm_client.generate(
-            merge_relationship_prompt, max_tokens=token_count + 1024
+            merge_relationship_prompt,
+            max_tokens=_relationship_output_tokens(token_count),
+            prompt_tokens=token_count,
+            json_schema=MergedRelationship.model_json_schema(),
         )
-        return robust_json_parse(response, "object", llm_client)
+        return _parse_structured_response(response, MergedRelationship, llm_client)
     except Exception as e:
         logger.error(f"Failed to merge relationship: {e}", exc_info=True)
         return None
 
 
+def _merge_identical_relationships(relationships):
+    """
+    Merge relationships locally when their descriptions only differ in
+    whitespace, taking the union of their attributes; returns None otherwise.
+    """
+    descriptions = {
+        " ".join((relationship["relationship_desc"] or "").split())
+        for relationship in relationships.values()
+    }
+    if len(descriptions) != 1:
+        return None
+
+    merged_attributes = {}
+    for relationship in relationships.values():
+        attributes = relationship["attributes"] or {}
+        if isinstance(attributes, str):
+            attributes = json.loads(attributes)
+        for key, value in attributes.items():
+            merged_attributes.setdefault(key, value)
+
+    first_relationship = next(iter(relationships.values()))
+    return {
+        "source_entity_id": first_relationship["source_entity_id"],
+        "target_entity_id": first_relationship["target_entity_id"],
+        "relationship_desc": descriptions.pop(),
+        "attributes": merged_attributes,
+    }
+
+
 def process_redundancy_relationship_issue(
     session_factory,
     llm_client,
@@ -926,8 +1464,11 @@ def process_redundancy_relationship_issue(
     # Phase 1: Collect data and validate relationships
     with session_factory() as session:
         try:
-            relationships = get_relationship_by_ids(session, row_issue["affected_ids"])
-            logger.info(f"pending relationships({row_key})", relationships)
+            bundle = fetch_graph_bundle(
+                session, relationship_ids=row_issue["affected_ids"]
+            )
+            relationships = bundle["relationships"]
+            logger.debug("pending relationships(%s): %d items", row_key, len(relationships))
             if len(relationships) < 2:
                 logger.info(
                     f"skip, not enough relationships to merge - ({row_key}) {row_issue['affected_ids']}"
@@ -945,9 +1486,7 @@ def process_redundancy_relationship_issue(
                 )
                 return True
 
-            source_data_list = get_source_data_by_relationship_ids(
-                session, row_issue["affected_ids"]
-            )
+            source_data_list = bundle["source_data"]
         except Exception as e:
             logger.error(
                 f"Failed to collect data for relationship merge({row_key}): {e}",
@@ -957,10 +1496,16 @@ def process_redundancy_relationship_issue(
 
     # Perform LLM merge outside of database session
     try:
-        merged_relationship = merge_relationship(
-            llm_client, row_issue, [], relationships, source_data_list
-        )
-        logger.info("merged relationship", merged_relationship)
+        merged_relationship = _merge_identical_relationships(relationships)
+        if merged_relationship is not None:
+            logger.info(
+                f"Relationships({row_key}) share one description, merging without LLM"
+            )
+        else:
+            merged_relationship = merge_relationship(
+                llm_client, row_issue, [], relationships, source_data_list
+            )
+        logger.debug("merged relationship(%s): %s", row_key, merged_relationship)
     except Exception as e:
         logger.error(
             f"Failed to merge relationship with LLM({row_key}): {e}", exc_info=True
@@ -1002,7 +1547,7 @@ def process_redundancy_relationship_issue(
                     source_entity_id=actual_source_entity_id,
                     target_entity_id=actual_target_entity_id,
                     relationship_desc=merged_relationship["relationship_desc"],
-                    relationship_desc_vec=get_text_embedding(
+                    relationship_desc_vec=get_cached_text_embedding(
                         merged_relationship["relationship_desc"]
                     ),
                     attributes=merged_attributes,
@@ -0,0 +1,74 @@
+import json
+import logging
+import hashlib
+import sqlite3
+import threading
+import time
+from typing import Dict, Any, Optional
+
+from setting.base import IMPROVEMENT_CACHE_PATH, IMPROVEMENT_CACHE_TTL
+
+logger = logging.getLogger(__name__)
+
+
+class ImprovementCache:
+    """Disk-backed store of LLM-produced entity and relationship fixes, expiring after a TTL"""
+
+    def __init__(self, path: str, ttl: int):
+        self.path = path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        with self._lock, sqlite3.connect(self.path) as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS improvements (key TEXT PRIMARY KEY, result TEXT NOT NULL, created_at REAL NOT NULL)"
+            )
+
+    @staticmethod
+    def make_key(task: str, issue: Dict[str, Any], *graph_elements: Any) -> str:
+        """Hash the task, the issue and the graph elements the prompt is built from"""
+        payload = json.dumps(
+            {"task": task, "issue": issue, "graph_elements": graph_elements},
+            sort_keys=True,
+            ensure_ascii=False,
+            default=str,
+        )
+        return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            with self._lock, sqlite3.connect(self.path) as conn:
+                row = conn.execute(
+                    "SELECT result FROM improvements WHERE key = ? AND created_at >= ?",
+                    (key, time.time() - self.ttl),
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to read improvement cache: {e}")
+            return None
+        return json.loads(row[0]) if row else None
+
+    def put(self, key: str, result: Dict[str, Any]) -> None:
+        try:
+            with self._lock, sqlite3.connect(self.path) as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO improvements (key, result, created_at) VALUES (?, ?, ?)",
+                    (key, json.dumps(result, ensure_ascii=False), time.time()),
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to store improvement in cache: {e}")
+
+
+_default_improvement_cache: Optional[ImprovementCache] = None
+
+
+def get_default_improvement_cache() -> Optional[ImprovementCache]:
+    """Return the cache configured by IMPROVEMENT_CACHE_PATH, or None if disabled"""
+    global _default_improvement_cache
+    if _default_improvement_cache is None and IMPROVEMENT_CACHE_PATH:
+        try:
+            _default_improvement_cache = ImprovementCache(
+                IMPROVEMENT_CACHE_PATH, IMPROVEMENT_CACHE_TTL
+            )
+        except sqlite3.Error as e:
+            logger.warning(f"Improvement cache disabled, failed to open {IMPROVEMENT_CACHE_PATH}: {e}")
+            return None
+    return _default_improvement_cache
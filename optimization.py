@@ -1,21 +1,26 @@
 import logging
-import json
+import operator
 import os
 import pandas as pd
 from typing import Tuple
 import concurrent.futures
+import itertools
 
 from knowledge_graph.query import search_relationships_by_vector_similarity
+from setting.base import (
+    GRAPH_OPTIMIZATION_LLM_PROVIDER,
+    GRAPH_OPTIMIZATION_LLM_MODEL,
+    LLM_MAX_CONCURRENCY,
+)
 from setting.db import db_manager
-from opt.helper import GRAPH_OPTIMIZATION_ACTION_SYSTEM_PROMPT_WO_MR
-from opt.evaluator import batch_evaluate_issues
-from opt.helper import extract_issues
+from opt.helper import detect_graph_issues
+from opt.evaluator import batch_evaluate_issues, Issue
 from llm.factory import LLMInterface
 from knowledge_graph.models import Entity, Relationship, SourceGraphMapping
 from opt.optimizer import (
     process_entity_quality_issue,
     process_redundancy_entity_issue,
-    process_relationship_quality_issue,
+    process_relationship_quality_issues,
     process_redundancy_relationship_issue,
 )
 # Configure logging
@@ -28,7 +33,9 @@ logging.basicConfig(
 # Create logger
 logger = logging.getLogger(__name__)
 
-optimization_llm_client = LLMInterface("openai_like", "graph_optimization_14b")
+optimization_llm_client = LLMInterface(
+    GRAPH_OPTIMIZATION_LLM_PROVIDER, GRAPH_OPTIMIZATION_LLM_MODEL
+)
 
 qwen3_critic_client = LLMInterface("bedrock", "us.anthropic.claude-sonnet-4-20250514-v1:0")
 # sonnet_critic_client = LLMInterface("bedrock", "us.anthropic.claude-3-7-sonnet-20250219-v1:0")
@@ -41,11 +48,107 @@ critic_clients = {
 
 session_factory = db_manager.get_session_factory(os.getenv("GRAPH_DATABASE_URI"))
 
+ISSUE_COLUMNS = [
+    "graph",
+    "question",
+    "issue",
+    "confidence",
+    "qwen3-critic",
+    "resolved",
+]
+
+# Rounds of critique for issues whose critic call failed, before moving on
+MAX_CRITIC_RETRIES = 3
+
 
 def get_issue_key(issue: dict) -> Tuple[str, tuple]:
     """Generate a unique key for an issue based on its type and affected IDs."""
     return (issue["issue_type"], tuple(sorted(issue["affected_ids"])))
 
+def add_issue_columns(issue_df: pd.DataFrame) -> pd.DataFrame:
+    """Copy the fields the processing loops read out of each issue dict into columns."""
+    for field in ("issue_type", "affected_ids", "reasoning"):
+        issue_df[field] = issue_df["issue"].map(operator.itemgetter(field))
+    return issue_df
+
+
+def pending_issue_rows(issue_df: pd.DataFrame, issue_type: str) -> pd.DataFrame:
+    """Select unresolved rows of one issue type that passed critique."""
+    mask = (
+        (issue_df["issue_type"] == issue_type)
+        & (issue_df["confidence"] >= 0.9)
+        # resolved is an object column, so compare by value rather than invert it
+        & (issue_df["resolved"] != True)  # noqa: E712
+    )
+    return issue_df.loc[mask]
+
+class DisjointSet:
+    """Union-find over hashable items, with path halving and union by size."""
+
+    def __init__(self):
+        self.parent = {}
+        self.size = {}
+
+    def find(self, item):
+        if item not in self.parent:
+            self.parent[item] = item
+            self.size[item] = 1
+        while self.parent[item] != item:
+            self.parent[item] = self.parent[self.parent[item]]
+            item = self.parent[item]
+        return item
+
+    def union(self, first, second):
+        first, second = self.find(first), self.find(second)
+        if first == second:
+            return first
+        if self.size[first] < self.size[second]:
+            first, second = second, first
+        self.parent[second] = first
+        self.size[first] += self.size[second]
+        return first
+
+
+def group_redundancy_issues(issue_type: str, rows: list) -> list:
+    """
+    Merge redundancy issues whose affected ids overlap, transitively.
+
+    Args:
+        issue_type: "redundancy_entity" or "redundancy_relationship"
+        rows: (row_index, affected_ids, reasoning) tuples
+
+    Returns:
+        One issue per connected group of more than one id, carrying the
+        union of affected ids, the distinct reasonings and the row indexes
+    """
+    dsu = DisjointSet()
+    for _, affected_ids, _ in rows:
+        for affected_id in affected_ids:
+            dsu.union(affected_ids[0], affected_id)
+
+    groups = {}
+    for row_index, affected_ids, reasoning in rows:
+        if not affected_ids:
+            continue
+        group = groups.setdefault(
+            dsu.find(affected_ids[0]),
+            {"affected_ids": {}, "reasoning": {}, "row_indexes": []},
+        )
+        group["affected_ids"].update(dict.fromkeys(affected_ids))
+        group["reasoning"][reasoning] = None
+        group["row_indexes"].append(row_index)
+
+    return [
+        {
+            "issue_type": issue_type,
+            "affected_ids": list(group["affected_ids"]),
+            "reasoning": "\n".join(group["reasoning"]),
+            "row_indexes": group["row_indexes"],
+        }
+        for group in groups.values()
+        if len(group["affected_ids"]) > 1
+    ]
+
 def graph_retrieve(query: str, top_k: int = 10, similarity_threshold: float = 0.3):
     res = search_relationships_by_vector_similarity(
         query,
@@ -56,25 +159,25 @@ def graph_retrieve(query: str, top_k: int = 10, similarity_threshold: float = 0.
     entities = {}
     relationships = {}
 
-    for index, row in res.iterrows():
-        entities[row['source_entity_id']] = {
-            "id": row['source_entity_id'],
-            "name": row['source_entity_name'],
-            "description": row['source_entity_description'],
-            "attributes": row['source_entity_attributes']
+    for row in res.itertuples(index=False):
+        entities[row.source_entity_id] = {
+            "id": row.source_entity_id,
+            "name": row.source_entity_name,
+            "description": row.source_entity_description,
+            "attributes": row.source_entity_attributes
         }
-        entities[row['target_entity_id']] = {
-            "id": row['target_entity_id'],
-            "name": row['target_entity_name'],
-            "description": row['target_entity_description'],
-            "attributes": row['target_entity_attributes']
+        entities[row.target_entity_id] = {
+            "id": row.target_entity_id,
+            "name": row.target_entity_name,
+            "description": row.target_entity_description,
+            "attributes": row.target_entity_attributes
         }
-        relationships[row['id']] = {
-            "id": row['id'],
-            "source_entity": row['source_entity_name'],
-            "target_entity": row['target_entity_name'],
-            "description": row['relationship_desc'],
-            "attributes": row['attributes']
+        relationships[row.id] = {
+            "id": row.id,
+            "source_entity": row.source_entity_name,
+            "target_entity": row.target_entity_name,
+            "description": row.relationship_desc,
+            "attributes": row.attributes
         }
 
     return {
@@ -87,16 +190,7 @@ def improve_graph(query: str, tmp_test_data_file: str = "test_data.pkl"):
     if os.path.exists(tmp_test_data_file):
         issue_df = pd.read_pickle(tmp_test_data_file)
     else:
-        issue_df = pd.DataFrame(
-            columns=[
-                "graph",
-                "question",
-                "issue",
-                "confidence",
-                "qwen3-critic",
-                "resolved",
-            ]
-        )
+        issue_df = pd.DataFrame(columns=ISSUE_COLUMNS)
 
     new_issue_list = []
     # if having unresolved issue, we need to handle these issue first
@@ -123,14 +217,7 @@ def improve_graph(query: str, tmp_test_data_file: str = "test_data.pkl"):
             "relationships": retrieval_results["relationships"],
         }
 
-        prompt = (
-            GRAPH_OPTIMIZATION_ACTION_SYSTEM_PROMPT_WO_MR
-            + " Now Optimize the following graph:\n"
-            + json.dumps(graph_data, indent=2, ensure_ascii=False)
-        )
-        response = optimization_llm_client.generate(prompt)
-
-        analysis_list = extract_issues(response)
+        analysis_list = detect_graph_issues(optimization_llm_client, graph_data)
         print("analysis:", analysis_list)
         for analysis in analysis_list.values():
             for issue in analysis:
@@ -145,8 +232,13 @@ def improve_graph(query: str, tmp_test_data_file: str = "test_data.pkl"):
                 new_issue_list.append(issue_data)
 
         if len(new_issue_list) > 0:
-            issue_df = pd.concat([issue_df, pd.DataFrame(new_issue_list)])
+            # A fresh index keeps row labels unique, so .at updates hit one row
+            issue_df = pd.concat(
+                [issue_df, pd.DataFrame(new_issue_list, columns=ISSUE_COLUMNS)],
+                ignore_index=True,
+            )
 
+    issue_df = add_issue_columns(issue_df)
     issue_df.to_pickle(tmp_test_data_file)
 
     print(f"Found new issues {len(new_issue_list)}, total issues {issue_df.shape[0]}")
@@ -156,66 +248,79 @@ def improve_graph(query: str, tmp_test_data_file: str = "test_data.pkl"):
 
     print("=" * 60)
 
-    # if there are issue that need to be critized, we need to evaluate them
-    while (
-        issue_df[["qwen3-critic"]]
-        .isnull()
-        .any()
-        .any()
-    ):
-        issue_df = batch_evaluate_issues(critic_clients, issue_df)
+    # if there are issue that need to be critized, we need to evaluate them;
+    # critic failures are retried a bounded number of times
+    for _ in range(MAX_CRITIC_RETRIES):
+        pending_critique = issue_df[issue_df["qwen3-critic"].isnull()]
+        if pending_critique.empty:
+            break
+        issues = [
+            Issue(
+                issue_type=row.issue_type,
+                affected_ids=row.affected_ids,
+                reasoning=row.reasoning,
+                source_graph=row.graph,
+                validation_score=row.confidence,
+            )
+            for row in pending_critique.itertuples()
+        ]
+        batch_evaluate_issues(critic_clients, issues)
+        for index, issue in zip(pending_critique.index, issues):
+            for critic_name in critic_clients:
+                evaluation = issue.critic_evaluations.get(critic_name)
+                if evaluation:
+                    issue_df.at[index, critic_name] = evaluation
+            issue_df.at[index, "confidence"] = issue.validation_score
 
     issue_df.to_pickle(tmp_test_data_file)
     print(f"Identified {issue_df[issue_df['confidence'] >= 0.9].shape[0]} valid issues")
 
     issue_cache = {}
-    for index, row in issue_df.iterrows():
-        if row["resolved"] is not True:
+    for row in issue_df.itertuples():
+        if row.resolved is not True:
             continue
 
         if (
-            row["issue"]["issue_type"] == "entity_quality_issue"
-            or row["issue"]["issue_type"] == "relationship_quality_issue"
+            row.issue_type == "entity_quality_issue"
+            or row.issue_type == "relationship_quality_issue"
         ):
-            for affected_id in row["issue"]["affected_ids"]:
+            for affected_id in row.affected_ids:
                 issue = {
-                    "issue_type": row["issue"]["issue_type"],
+                    "issue_type": row.issue_type,
                     "affected_ids": [affected_id],
-                    "reasoning": row["issue"]["reasoning"],
+                    "reasoning": row.reasoning,
                 }
                 issue_cache[get_issue_key(issue)] = True
         else:
-            issue_cache[get_issue_key(row["issue"])] = True
+            issue_cache[get_issue_key(row.issue)] = True
 
     print("issue is resolved", issue_cache, len(issue_cache))
 
     ## process entity quality issue
 
     pending_entity_quality_issue_list = {}
-    for index, row in issue_df.iterrows():
-        if (
-            row["issue"]["issue_type"] != "entity_quality_issue"
-            or row["confidence"] < 0.9
-            or row["resolved"] is True
-        ):
-            continue
-
+    # Per-element issue keys of each row, reused for the resolution check below
+    entity_quality_row_keys = {}
+    for row in pending_issue_rows(issue_df, "entity_quality_issue").itertuples():
+        index = row.Index
+        row_keys = entity_quality_row_keys[index] = []
         # Check if any entities need processing
-        for affected_id in row["issue"]["affected_ids"]:
+        for affected_id in row.affected_ids:
             issue = {
-                "issue_type": row["issue"]["issue_type"],
-                "reasoning": row["issue"]["reasoning"],
+                "issue_type": row.issue_type,
+                "reasoning": row.reasoning,
                 "affected_ids": [affected_id],
                 "row_index": index,
             }
             issue_key = get_issue_key(issue)
+            row_keys.append(issue_key)
             if (
                 issue_cache.get(issue_key, False)
                 or pending_entity_quality_issue_list.get(issue_key, None) is not None
             ):
                 logger.info(f"Entity quality issue {index} already processed or pending, marking as resolved")
                 issue_df.at[index, "resolved"] = True
-                issue_df.to_pickle(tmp_test_data_file)
+                entity_quality_row_keys.pop(index, None)
                 continue
             issue["issue_key"] = issue_key
             pending_entity_quality_issue_list[issue_key] = issue
@@ -224,23 +329,16 @@ def improve_graph(query: str, tmp_test_data_file: str = "test_data.pkl"):
         "pendding entity quality issues number", len(pending_entity_quality_issue_list)
     )
 
-    parallel_count = 1
+    parallel_count = LLM_MAX_CONCURRENCY
     while True:
-        # Find up to 3 issues that need processing
-        keys_for_batch = []
-        for key in pending_entity_quality_issue_list:
-            if len(keys_for_batch) < parallel_count:
-                keys_for_batch.append(key)
-            else:
-                break
+        # Take the next parallel_count issues, in insertion order
+        keys_for_batch = list(itertools.islice(pending_entity_quality_issue_list, parallel_count))
 
         # Exit if no more rows to process
         if len(keys_for_batch) == 0:
             break
 
-        batch_issues = []
-        for key in keys_for_batch:
-            batch_issues.append(pending_entity_quality_issue_list.pop(key))
+        batch_issues = [pending_entity_quality_issue_list.pop(key) for key in keys_for_batch]
 
         with concurrent.futures.ThreadPoolExecutor(
             max_workers=len(batch_issues)
@@ -266,28 +364,13 @@ def improve_graph(query: str, tmp_test_data_file: str = "test_data.pkl"):
                 if success:
                     issue_cache[issue_key] = True
 
-    for index, row in issue_df.iterrows():
-        if (
-            row["issue"]["issue_type"] != "entity_quality_issue"
-            or row["confidence"] < 0.9
-            or row["resolved"] is True
-        ):
-            continue
-        success = True
-        for affected_id in row["issue"]["affected_ids"]:
-            tmp_key = get_issue_key(
-                {
-                    "issue_type": row["issue"]["issue_type"],
-                    "reasoning": row["issue"]["reasoning"],
-                    "affected_ids": [affected_id],
-                }
-            )
-            if issue_cache.get(tmp_key, False) is False:
-                success = False
-                break
-        if success:
-            print(f"Success to resolve entity {index}")
-            issue_df.at[index, "resolved"] = True
+    resolved_indexes = [
+        index
+        for index, row_keys in entity_quality_row_keys.items()
+        if all(issue_cache.get(key, False) for key in row_keys)
+    ]
+    print(f"Success to resolve entity rows {resolved_indexes}")
+    issue_df.loc[resolved_indexes, "resolved"] = True
 
     # Save dataframe after each batch
     issue_df.to_pickle(tmp_test_data_file)
@@ -295,82 +378,38 @@ def improve_graph(query: str, tmp_test_data_file: str = "test_data.pkl"):
     ## process redundancy entity issue
 
     pending_redundancy_entity_issue_list = {}
-    for index, row in issue_df.iterrows():
-        if (
-            row["issue"]["issue_type"] != "redundancy_entity"
-            or row["confidence"] < 0.9
-            or row["resolved"] is True
-        ):
+    redundancy_entity_rows = [
+        (row.Index, row.affected_ids, row.reasoning)
+        for row in pending_issue_rows(issue_df, "redundancy_entity").itertuples()
+    ]
+    for redundancy_entity_issue in group_redundancy_issues(
+        "redundancy_entity", redundancy_entity_rows
+    ):
+        issue_key = get_issue_key(redundancy_entity_issue)
+        if issue_cache.get(issue_key, False):
+            logger.info(f"Redundancy entity issue {issue_key} already processed, marking as resolved")
+            issue_df.loc[redundancy_entity_issue["row_indexes"], "resolved"] = True
             continue
 
-        affected_ids = set(row["issue"]["affected_ids"])
-        need_merge_ids = set(affected_ids)
-        need_merge_reasoning = set([row["issue"]["reasoning"]])
-        handled_index = set([index])
-
-        found = True
-        while found:
-            found = False
-            for other_row_index, other_row in issue_df.iterrows():
-                if other_row_index == index or other_row_index in handled_index:
-                    continue
-                if (
-                    other_row["issue"]["issue_type"] != "redundancy_entity"
-                    or other_row["confidence"] < 0.9
-                    or other_row["resolved"] is True
-                ):
-                    continue
-                other_affected_ids = set(other_row["issue"]["affected_ids"])
-                if need_merge_ids.isdisjoint(other_affected_ids):
-                    continue
-
-                handled_index.add(other_row_index)
-                need_merge_ids.update(other_row["issue"]["affected_ids"])
-                need_merge_reasoning.add(other_row["issue"]["reasoning"])
-                found = True
-
-        if len(need_merge_ids) > 1:
-            redundancy_entity_issue = {
-                "issue_type": "redundancy_entity",
-                "affected_ids": list(need_merge_ids),
-                "reasoning": "\n".join(list(need_merge_reasoning)),
-                "row_indexes": list(handled_index),
-            }
-
-            issue_key = get_issue_key(redundancy_entity_issue)
-            if pending_redundancy_entity_issue_list.get(
-                issue_key, None
-            ) is not None or issue_cache.get(issue_key, False):
-                logger.info(f"Redundancy entity issue {index} already processed or pending, marking as resolved")
-                issue_df.at[index, "resolved"] = True
-                issue_df.to_pickle(tmp_test_data_file)
-                continue
-
-            redundancy_entity_issue["issue_key"] = issue_key
-            pending_redundancy_entity_issue_list[issue_key] = redundancy_entity_issue
+        redundancy_entity_issue["issue_key"] = issue_key
+        pending_redundancy_entity_issue_list[issue_key] = redundancy_entity_issue
 
+    issue_df.to_pickle(tmp_test_data_file)
     print(
         "pendding redundancy entity number", len(pending_redundancy_entity_issue_list)
     )
 
     # Main processing loop with batched concurrency
-    parallel_count = 1
+    parallel_count = LLM_MAX_CONCURRENCY
     while True:
-        # Find up to 3 issues that need processing
-        keys_for_batch = []
-        for key in pending_redundancy_entity_issue_list:
-            if len(keys_for_batch) < parallel_count:
-                keys_for_batch.append(key)
-            else:
-                break
+        # Take the next parallel_count issues, in insertion order
+        keys_for_batch = list(itertools.islice(pending_redundancy_entity_issue_list, parallel_count))
 
         # Exit if no more rows to process
         if len(keys_for_batch) == 0:
             break
 
-        batch_issues = {}
-        for key in keys_for_batch:
-            batch_issues[key] = pending_redundancy_entity_issue_list.pop(key)
+        batch_issues = {key: pending_redundancy_entity_issue_list.pop(key) for key in keys_for_batch}
 
         # Process batch concurrently
         with concurrent.futures.ThreadPoolExecutor(
@@ -398,32 +437,28 @@ def improve_graph(query: str, tmp_test_data_file: str = "test_data.pkl"):
                 if success:
                     issue = batch_issues[issue_key]
                     issue_cache[issue_key] = True
-                    row_indexes = issue["row_indexes"]
-                    for row_index in row_indexes:
-                        issue_df.at[row_index, "resolved"] = True
+                    issue_df.loc[issue["row_indexes"], "resolved"] = True
 
         issue_df.to_pickle(tmp_test_data_file)
 
     ## process relationship quality issue
 
     pending_relationship_quality_issue_list = {}
-    for index, row in issue_df.iterrows():
-        if (
-            row["issue"]["issue_type"] != "relationship_quality_issue"
-            or row["confidence"] < 0.9
-            or row["resolved"] is True
-        ):
-            continue
-
+    # Per-element issue keys of each row, reused for the resolution check below
+    relationship_quality_row_keys = {}
+    for row in pending_issue_rows(issue_df, "relationship_quality_issue").itertuples():
+        index = row.Index
+        row_keys = relationship_quality_row_keys[index] = []
         # Check if any entities need processing
-        for affected_id in row["issue"]["affected_ids"]:
+        for affected_id in row.affected_ids:
             issue = {
-                "issue_type": row["issue"]["issue_type"],
-                "reasoning": row["issue"]["reasoning"],
+                "issue_type": row.issue_type,
+                "reasoning": row.reasoning,
                 "affected_ids": [affected_id],
                 "row_index": index,
             }
             issue_key = get_issue_key(issue)
+            row_keys.append(issue_key)
             if (
                 issue_cache.get(issue_key, False)
                 or pending_relationship_quality_issue_list.get(issue_key, None)
@@ -431,7 +466,7 @@ def improve_graph(query: str, tmp_test_data_file: str = "test_data.pkl"):
             ):
                 logger.info(f"Relationship quality issue {index} already processed or pending, marking as resolved")
                 issue_df.at[index, "resolved"] = True
-                issue_df.to_pickle(tmp_test_data_file)
+                relationship_quality_row_keys.pop(index, None)
                 continue
             issue["issue_key"] = issue_key
             pending_relationship_quality_issue_list[issue_key] = issue
@@ -441,72 +476,39 @@ def improve_graph(query: str, tmp_test_data_file: str = "test_data.pkl"):
         len(pending_relationship_quality_issue_list),
     )
 
-    parallel_count = 1
+    parallel_count = LLM_MAX_CONCURRENCY
     while True:
-        # Find up to 3 issues that need processing
-        keys_for_batch = []
-        for key in pending_relationship_quality_issue_list:
-            if len(keys_for_batch) < parallel_count:
-                keys_for_batch.append(key)
-            else:
-                break
+        # Take the next parallel_count issues, in insertion order
+        keys_for_batch = list(itertools.islice(pending_relationship_quality_issue_list, parallel_count))
 
         # Exit if no more rows to process
         if len(keys_for_batch) == 0:
             break
 
-        batch_issues = []
-        for key in keys_for_batch:
-            batch_issues.append(pending_relationship_quality_issue_list.pop(key))
-
-        # Process batch concurrently
-
-        with concurrent.futures.ThreadPoolExecutor(
-            max_workers=len(batch_issues)
-        ) as executor:
-            futures = {}
-            for row_issue in batch_issues:
-                futures[
-                    executor.submit(
-                        process_relationship_quality_issue,
-                        session_factory,
-                        qwen3_critic_client,
-                        Relationship,
-                        row_issue["row_index"],
-                        row_issue,
-                    )
-                ] = row_issue["issue_key"]
-
-            # Process results and update dataframe
-            for future in concurrent.futures.as_completed(futures):
-                issue_key = futures[future]
-                success = future.result()
-                if success:
-                    print(f"Success to resolve relationship {issue_key}")
-                    issue_cache[issue_key] = True
-
-    for index, row in issue_df.iterrows():
-        if (
-            row["issue"]["issue_type"] != "relationship_quality_issue"
-            or row["confidence"] < 0.9
-            or row["resolved"] is True
-        ):
-            continue
-        success = True
-        for affected_id in row["issue"]["affected_ids"]:
-            tmp_key = get_issue_key(
-                {
-                    "issue_type": row["issue"]["issue_type"],
-                    "reasoning": row["issue"]["reasoning"],
-                    "affected_ids": [affected_id],
-                }
-            )
-            if issue_cache.get(tmp_key, False) is False:
-                success = False
-                break
-        if success:
-            print(f"Success to resolve entity {index}")
-            issue_df.at[index, "resolved"] = True
+        # One read, one pool of LLM calls and one bulk update for the batch
+        batch_rows = [
+            (key, pending_relationship_quality_issue_list.pop(key))
+            for key in keys_for_batch
+        ]
+        results = process_relationship_quality_issues(
+            session_factory,
+            qwen3_critic_client,
+            Relationship,
+            batch_rows,
+            max_workers=parallel_count,
+        )
+        for issue_key, success in results.items():
+            if success:
+                print(f"Success to resolve relationship {issue_key}")
+                issue_cache[issue_key] = True
+
+    resolved_indexes = [
+        index
+        for index, row_keys in relationship_quality_row_keys.items()
+        if all(issue_cache.get(key, False) for key in row_keys)
+    ]
+    print(f"Success to resolve relationship rows {resolved_indexes}")
+    issue_df.loc[resolved_indexes, "resolved"] = True
 
     # Save dataframe after each batch
     issue_df.to_pickle(tmp_test_data_file)
@@ -514,62 +516,25 @@ def improve_graph(query: str, tmp_test_data_file: str = "test_data.pkl"):
     ## process redundancy relationship issue
 
     pending_redundancy_relationships_issue_list = {}
-    for index, row in issue_df.iterrows():
-        if (
-            row["issue"]["issue_type"] != "redundancy_relationship"
-            or row["confidence"] < 0.9
-            or row["resolved"] is True
-        ):
+    redundancy_relationship_rows = [
+        (row.Index, row.affected_ids, row.reasoning)
+        for row in pending_issue_rows(issue_df, "redundancy_relationship").itertuples()
+    ]
+    for redundancy_relationship_issue in group_redundancy_issues(
+        "redundancy_relationship", redundancy_relationship_rows
+    ):
+        issue_key = get_issue_key(redundancy_relationship_issue)
+        if issue_cache.get(issue_key, False):
+            logger.info(f"Redundancy relationship issue {issue_key} already processed, marking as resolved")
+            issue_df.loc[redundancy_relationship_issue["row_indexes"], "resolved"] = True
             continue
 
-        affected_ids = set(row["issue"]["affected_ids"])
-        need_merge_ids = set(affected_ids)
-        need_merge_reasoning = set([row["issue"]["reasoning"]])
-        handled_index = set([index])
-
-        found = True
-        while found:
-            found = False
-            for other_row_index, other_row in issue_df.iterrows():
-                if other_row_index == index or other_row_index in handled_index:
-                    continue
-                if (
-                    other_row["issue"]["issue_type"] != "redundancy_relationship"
-                    or other_row["confidence"] < 0.9
-                    or other_row["resolved"] is True
-                ):
-                    continue
-                other_affected_ids = set(other_row["issue"]["affected_ids"])
-                if need_merge_ids.isdisjoint(other_affected_ids):
-                    continue
-
-                handled_index.add(other_row_index)
-                need_merge_ids.update(other_row["issue"]["affected_ids"])
-                need_merge_reasoning.add(other_row["issue"]["reasoning"])
-                found = True
-
-        if len(need_merge_ids) > 1:
-            redundancy_relationship_issue = {
-                "issue_type": "redundancy_relationship",
-                "affected_ids": list(need_merge_ids),
-                "reasoning": "\n".join(list(need_merge_reasoning)),
-                "row_indexes": list(handled_index),
-            }
-
-            issue_key = get_issue_key(redundancy_relationship_issue)
-            if pending_redundancy_relationships_issue_list.get(
-                issue_key, None
-            ) is not None or issue_cache.get(issue_key, False):
-                logger.info(f"Redundancy relationship issue {index} already processed or pending, marking as resolved")
-                issue_df.at[index, "resolved"] = True
-                issue_df.to_pickle(tmp_test_data_file)
-                continue
-
-            redundancy_relationship_issue["issue_key"] = issue_key
-            pending_redundancy_relationships_issue_list[issue_key] = (
-                redundancy_relationship_issue
-            )
+        redundancy_relationship_issue["issue_key"] = issue_key
+        pending_redundancy_relationships_issue_list[issue_key] = (
+            redundancy_relationship_issue
+        )
 
+    issue_df.to_pickle(tmp_test_data_file)
     print(
         "pendding redundancy relationships number",
         len(pending_redundancy_relationships_issue_list),
@@ -577,23 +542,16 @@ def improve_graph(query: str, tmp_test_data_file: str = "test_data.pkl"):
 
     # Main processing loop with batched concurrency
 
-    parallel_count = 1
+    parallel_count = LLM_MAX_CONCURRENCY
     while True:
-        # Find up to 3 issues that need processing
-        keys_for_batch = []
-        for key in pending_redundancy_relationships_issue_list:
-            if len(keys_for_batch) < parallel_count:
-                keys_for_batch.append(key)
-            else:
-                break
+        # Take the next parallel_count issues, in insertion order
+        keys_for_batch = list(itertools.islice(pending_redundancy_relationships_issue_list, parallel_count))
 
         # Exit if no more rows to process
         if len(keys_for_batch) == 0:
             break
 
-        batch_issues = {}
-        for key in keys_for_batch:
-            batch_issues[key] = pending_redundancy_relationships_issue_list.pop(key)
+        batch_issues = {key: pending_redundancy_relationships_issue_list.pop(key) for key in keys_for_batch}
 
         # Process batch concurrently
         with concurrent.futures.ThreadPoolExecutor(
@@ -620,8 +578,6 @@ def improve_graph(query: str, tmp_test_data_file: str = "test_data.pkl"):
                 if success:
                     issue = batch_issues[issue_key]
                     issue_cache[issue_key] = True
-                    row_indexes = issue["row_indexes"]
-                    for row_index in row_indexes:
-                        issue_df.at[row_index, "resolved"] = True
+                    issue_df.loc[issue["row_indexes"], "resolved"] = True
 
         issue_df.to_pickle(tmp_test_data_file)
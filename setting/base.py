@@ -11,6 +11,9 @@ LLM_MODEL = os.environ.get("LLM_MODEL", "qwen3:1.7b")
 GOOGLE_API_KEY = os.environ.get("GOOGLE_API_KEY")
 OPENAI_API_KEY = os.environ.get("OPENAI_API_KEY")
 OLLAMA_BASE_URL = os.environ.get("OLLAMA_BASE_URL", "http://127.0.0.1:11434")
+# How long Ollama keeps a model loaded after a request, e.g. "30m" or "-1" to pin
+# it; unset leaves the server default
+OLLAMA_KEEP_ALIVE = os.environ.get("OLLAMA_KEEP_ALIVE")
 
 # need 4096 dimension embedding for knowledge graph, fix it later
 EMBEDDING_MODEL = os.environ.get("EMBEDDING_MODEL", "hf.co/Qwen/Qwen3-Embedding-8B-GGUF:Q8_0")
@@ -20,8 +23,31 @@ EMBEDDING_MODEL_API_KEY = os.environ.get("EMBEDDING_MODEL_API_KEY", "ollama")
 # DB settings
 DATABASE_URI = os.environ.get("DATABASE_URI")   # export using environment variable
 SESSION_POOL_SIZE: int = int(os.environ.get("SESSION_POOL_SIZE", 40))
+# Ping connections on checkout; can be turned off when pool_recycle alone keeps
+# them fresh, to save a round trip per short transaction
+DB_POOL_PRE_PING = os.environ.get("DB_POOL_PRE_PING", "true").lower() != "false"
 MAX_PROMPT_TOKENS = 40960
 
+# Optimization settings
+# Model that analyzes graphs for issues; point it at a quantized build to trade
+# a little accuracy for decode throughput
+GRAPH_OPTIMIZATION_LLM_PROVIDER = os.environ.get("GRAPH_OPTIMIZATION_LLM_PROVIDER", "openai_like")
+GRAPH_OPTIMIZATION_LLM_MODEL = os.environ.get("GRAPH_OPTIMIZATION_LLM_MODEL", "graph_optimization_14b")
+# sqlite file caching critic responses across runs; off unless set
+CRITIQUE_CACHE_PATH = os.environ.get("CRITIQUE_CACHE_PATH", "")
+CRITIQUE_CACHE_TTL = int(os.environ.get("CRITIQUE_CACHE_TTL", 7 * 24 * 60 * 60))
+# sqlite file caching issue analyses per graph across runs; off unless set.
+# Entries never expire, so leave it unset for repeated sweeps over a graph that
+# may come back unchanged (improve_graph), which need a fresh analysis each time
+ANALYSIS_CACHE_PATH = os.environ.get("ANALYSIS_CACHE_PATH", "")
+# sqlite file caching LLM entity/relationship fixes so retried runs skip them;
+# off unless set
+IMPROVEMENT_CACHE_PATH = os.environ.get("IMPROVEMENT_CACHE_PATH", "")
+IMPROVEMENT_CACHE_TTL = int(os.environ.get("IMPROVEMENT_CACHE_TTL", 24 * 60 * 60))
+# How many graph issues are fixed concurrently; keep it within what the LLM
+# endpoint serves in parallel (e.g. OLLAMA_NUM_PARALLEL)
+LLM_MAX_CONCURRENCY = int(os.environ.get("LLM_MAX_CONCURRENCY", 4))
+
 
 # Model configurations
 def parse_model_configs() -> dict:
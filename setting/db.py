@@ -1,6 +1,6 @@
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, inspect, text
 from sqlalchemy.orm import sessionmaker
-from setting.base import DATABASE_URI, SESSION_POOL_SIZE
+from setting.base import DATABASE_URI, SESSION_POOL_SIZE, DB_POOL_PRE_PING
 import logging
 from typing import Dict, Optional
 
@@ -9,21 +9,39 @@ logger = logging.getLogger(__name__)
 if DATABASE_URI is None:
     raise ValueError("DATABASE_URI cannot be None when creating the engine.")
 
-engine = create_engine(
-    DATABASE_URI,
-    pool_size=SESSION_POOL_SIZE,
-    max_overflow=20,
-    pool_timeout=60,
-    pool_recycle=1800,
-    pool_pre_ping=True,
-    connect_args={
-        "connect_timeout": 60,
-        "read_timeout": 300,
-        "write_timeout": 300,
-    },
-    echo=False,
+# Generated columns added to models after their tables first shipped; create_all
+# does not alter existing tables, so they are added on startup when missing
+_ADDED_GENERATED_COLUMNS = (
+    ("knowledge_blocks", "topic_name"),
+    ("relationships", "topic_name"),
 )
 
+
+def _engine_options(pool_size: int) -> dict:
+    """Pool and connection settings shared by the local and user database engines"""
+    return dict(
+        pool_size=pool_size,
+        max_overflow=20,
+        pool_timeout=60,
+        # Recycle before idle connections are dropped server side
+        pool_recycle=300,
+        pool_pre_ping=DB_POOL_PRE_PING,
+        # Hand out the most recently used connections so parallel workers reuse
+        # a warm subset and surplus ones age out
+        pool_use_lifo=True,
+        # Room for the compiled statements of every worker's queries
+        query_cache_size=1200,
+        connect_args={
+            "connect_timeout": 60,
+            "read_timeout": 300,
+            "write_timeout": 300,
+        },
+        echo=False,
+    )
+
+
+engine = create_engine(DATABASE_URI, **_engine_options(SESSION_POOL_SIZE))
+
 # Base = declarative_base()
 
 class DatabaseManager:
@@ -66,6 +84,45 @@ class DatabaseManager:
             logger.warning(f"Table creation encountered an issue (this is normal in concurrent environments): {e}")
             logger.info("Database initialization completed (tables may already exist)")
 
+        self._add_missing_generated_columns(engine)
+
+    def _add_missing_generated_columns(self, engine):
+        """
+        Add generated columns, and the indexes over them, that existing tables
+        created before the columns were introduced do not have yet.
+
+        Args:
+            engine: SQLAlchemy engine for the database
+        """
+        from knowledge_graph.models import Base
+
+        try:
+            inspector = inspect(engine)
+            for table_name, column_name in _ADDED_GENERATED_COLUMNS:
+                if not inspector.has_table(table_name):
+                    continue
+                existing = {column["name"] for column in inspector.get_columns(table_name)}
+                if column_name in existing:
+                    continue
+
+                table = Base.metadata.tables[table_name]
+                column = table.c[column_name]
+                column_type = column.type.compile(dialect=engine.dialect)
+                with engine.begin() as conn:
+                    conn.execute(
+                        text(
+                            f"ALTER TABLE {table_name} ADD COLUMN {column_name} "
+                            f"{column_type} AS ({column.computed.sqltext}) VIRTUAL"
+                        )
+                    )
+                for index in table.indexes:
+                    if column_name in index.columns:
+                        index.create(engine, checkfirst=True)
+                logger.info(f"Added generated column {table_name}.{column_name}")
+        except Exception as e:
+            # Another process may be running the same migration
+            logger.warning(f"Generated column migration encountered an issue: {e}")
+
     def get_session_factory(self, database_uri: Optional[str] = None) -> sessionmaker:
         """
         Get database session factory for the given database URI.
@@ -89,20 +146,8 @@ class DatabaseManager:
             if database_uri is None:
                 raise ValueError("database_uri cannot be None when creating a new engine.")
             try:
-                engine = create_engine(
-                    database_uri,
-                    pool_size=10,  # Smaller pool for user databases
-                    max_overflow=20,
-                    pool_timeout=60,
-                    pool_recycle=1800,
-                    pool_pre_ping=True,
-                    connect_args={
-                        "connect_timeout": 60,
-                        "read_timeout": 300,
-                        "write_timeout": 300,
-                    },
-                    echo=False,
-                )
+                # Smaller pool for user databases
+                engine = create_engine(database_uri, **_engine_options(10))
 
                 # Create all tables in user database
                 self._create_user_tables(engine)
@@ -0,0 +1,18 @@
+"""
+Shared setup for the unit tests, which run without a database:
+python -m pytest
+"""
+
+import os
+import sys
+import types
+from unittest.mock import MagicMock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# setting.db builds an engine and creates tables at import time; the code
+# under test only needs the names to exist
+_db = types.ModuleType("setting.db")
+_db.db_manager = MagicMock()
+_db.SessionLocal = MagicMock()
+sys.modules.setdefault("setting.db", _db)
@@ -0,0 +1,82 @@
+import unittest
+from unittest.mock import patch
+
+from opt import evaluator
+from opt.evaluator import Issue, _split_critique_batch
+
+
+def _count_words(text):
+    return len(text.split())
+
+
+def _issue(reasoning):
+    return Issue(
+        issue_type="entity_quality_issue",
+        affected_ids=["a"],
+        reasoning=reasoning,
+        source_graph={},
+    )
+
+
+@patch.object(evaluator, "calculate_tokens", _count_words)
+class TestSplitCritiqueBatch(unittest.TestCase):
+    def setUp(self):
+        self.guideline_tokens = _count_words(
+            evaluator.get_issue_guideline("entity_quality_issue")
+        )
+
+    def test_splits_by_count(self):
+        issues = [_issue("short") for _ in range(5)]
+
+        batches = _split_critique_batch("graph", issues, batch_size=2)
+
+        self.assertEqual([len(batch) for batch in batches], [2, 2, 1])
+        self.assertEqual([issue for batch in batches for issue in batch], issues)
+
+    def test_splits_by_token_budget(self):
+        issues = [_issue("short") for _ in range(3)]
+        cost = 1 + self.guideline_tokens
+
+        with patch.object(evaluator, "MAX_PROMPT_TOKENS", 1 + 2 * cost):
+            batches = _split_critique_batch("graph", issues, batch_size=8)
+
+        self.assertEqual([len(batch) for batch in batches], [2, 1])
+
+    def test_oversized_issue_gets_its_own_batch(self):
+        issues = [_issue("word " * 100), _issue("short")]
+
+        with patch.object(evaluator, "MAX_PROMPT_TOKENS", 10):
+            batches = _split_critique_batch("graph", issues, batch_size=8)
+
+        self.assertEqual(batches, [[issues[0]], [issues[1]]])
+
+    def test_no_issues(self):
+        self.assertEqual(_split_critique_batch("graph", [], batch_size=8), [])
+
+
+class TestCritiqueCacheKey(unittest.TestCase):
+    def test_key_depends_on_template_and_not_on_id_order(self):
+        issue = Issue(
+            issue_type="redundancy_entity",
+            affected_ids=["a", "b"],
+            reasoning="same",
+            source_graph={},
+        )
+        reordered = Issue(
+            issue_type="redundancy_entity",
+            affected_ids=["b", "a"],
+            reasoning=" same ",
+            source_graph={},
+        )
+        make_key = evaluator.CritiqueCache.make_key
+
+        self.assertEqual(
+            make_key("critic", issue, "single"), make_key("critic", reordered, "single")
+        )
+        self.assertNotEqual(
+            make_key("critic", issue, "single"), make_key("critic", issue, "batch")
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+import unittest
+
+from opt.helper import _categorize_issues, extract_issues
+
+
+class TestCategorizeIssues(unittest.TestCase):
+    def test_issues_are_filed_by_type(self):
+        categorized = _categorize_issues(
+            [
+                {
+                    "issue_type": "redundancy_entity",
+                    "affected_ids": ["a", "b"],
+                    "reasoning": "same entity",
+                    "confidence": "high",
+                },
+                {
+                    "issue_type": "relationship_quality_issue",
+                    "affected_ids": ["r"],
+                    "reasoning": "vague",
+                    "confidence": "moderate",
+                },
+            ]
+        )
+
+        self.assertEqual(
+            categorized["entity_redundancy_issues"],
+            [
+                {
+                    "issue_type": "redundancy_entity",
+                    "affected_ids": ["a", "b"],
+                    "reasoning": "same entity",
+                    "confidence": "high",
+                    "facto_search": "",
+                }
+            ],
+        )
+        self.assertEqual(len(categorized["relationship_quality_issues"]), 1)
+        self.assertEqual(categorized["entity_quality_issues"], [])
+        self.assertEqual(categorized["relationship_redundancy_issues"], [])
+        self.assertEqual(categorized["missing_relationship_issues"], [])
+
+    def test_malformed_and_out_of_range_issues_are_dropped(self):
+        base = {"reasoning": "why", "confidence": "high"}
+        categorized = _categorize_issues(
+            [
+                "not an issue",
+                {**base, "issue_type": "unknown", "affected_ids": ["a"]},
+                {**base, "issue_type": "entity_quality_issue", "affected_ids": []},
+                {"issue_type": "entity_quality_issue", "affected_ids": ["a"]},
+                # Redundancy needs at least two ids
+                {**base, "issue_type": "redundancy_entity", "affected_ids": ["a"]},
+                # A missing relationship joins exactly two entities
+                {
+                    **base,
+                    "issue_type": "missing_relationship",
+                    "affected_ids": ["a", "b", "c"],
+                },
+                {**base, "issue_type": "missing_relationship", "affected_ids": ["a", "b"]},
+            ]
+        )
+
+        self.assertEqual(
+            {category: len(issues) for category, issues in categorized.items()},
+            {
+                "entity_redundancy_issues": 0,
+                "relationship_redundancy_issues": 0,
+                "entity_quality_issues": 0,
+                "relationship_quality_issues": 0,
+                "missing_relationship_issues": 1,
+            },
+        )
+
+    def test_repeated_strings_share_one_object(self):
+        issues = [
+            {
+                "issue_type": "".join(["entity_", "quality_issue"]),
+                "affected_ids": [str(i)],
+                "reasoning": "why",
+                "confidence": "".join(["hi", "gh"]),
+            }
+            for i in range(2)
+        ]
+
+        first, second = _categorize_issues(issues)["entity_quality_issues"]
+
+        self.assertIs(first["issue_type"], second["issue_type"])
+        self.assertIs(first["confidence"], second["confidence"])
+
+    def test_extract_issues_reads_the_last_json_block(self):
+        response = (
+            "Thinking about ```json [] ``` first.\n"
+            '```json\n[{"issue_type": "entity_quality_issue", "affected_ids": ["a"], '
+            '"reasoning": "why", "confidence": "high"}]\n```'
+        )
+
+        categorized = extract_issues(response)
+
+        self.assertEqual(len(categorized["entity_quality_issues"]), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+import unittest
+
+from opt.lsh_prefilter import find_redundancy_candidates, find_similar_pairs
+
+DESCRIPTION = (
+    "TiDB is an open-source distributed SQL database that supports hybrid "
+    "transactional and analytical processing workloads."
+)
+
+
+def _text(item):
+    return item["text"]
+
+
+class TestFindSimilarPairs(unittest.TestCase):
+    def test_near_duplicates_are_paired_in_input_order(self):
+        items = [
+            {"id": "a", "text": DESCRIPTION},
+            {"id": "b", "text": "Redis is an in-memory key-value store."},
+            {"id": "c", "text": DESCRIPTION.replace("open-source", "open source")},
+        ]
+
+        self.assertEqual(find_similar_pairs(items, _text), [["a", "c"]])
+
+    def test_case_and_whitespace_are_ignored(self):
+        items = [
+            {"id": "a", "text": DESCRIPTION},
+            {"id": "b", "text": "  " + "\n".join(DESCRIPTION.upper().split())},
+        ]
+
+        self.assertEqual(find_similar_pairs(items, _text), [["a", "b"]])
+
+    def test_unrelated_and_empty_texts_are_not_paired(self):
+        items = [
+            {"id": "a", "text": DESCRIPTION},
+            {"id": "b", "text": "PD schedules regions across TiKV stores."},
+            {"id": "c", "text": ""},
+            {"id": "d", "text": None},
+        ]
+
+        self.assertEqual(find_similar_pairs(items, _text), [])
+
+    def test_redundancy_candidates_cover_entities_and_relationships(self):
+        graph_data = {
+            "entities": [
+                {"id": "e1", "name": "TiDB", "description": DESCRIPTION},
+                {"id": "e2", "name": "TiDB", "description": DESCRIPTION},
+            ],
+            "relationships": [
+                {
+                    "id": "r1",
+                    "source_entity": "TiDB",
+                    "target_entity": "TiKV",
+                    "description": "TiDB stores its data in TiKV.",
+                }
+            ],
+        }
+
+        self.assertEqual(
+            find_redundancy_candidates(graph_data),
+            {"entities": [["e1", "e2"]], "relationships": []},
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,119 @@
+import unittest
+from unittest.mock import patch
+
+import pandas as pd
+
+# optimization builds its LLM clients at import, which needs credentials
+with patch("llm.factory.LLMInterface"):
+    from optimization import DisjointSet, group_redundancy_issues, pending_issue_rows
+
+
+class TestDisjointSet(unittest.TestCase):
+    def test_find_registers_unknown_items_as_singletons(self):
+        dsu = DisjointSet()
+        self.assertEqual(dsu.find("a"), "a")
+        self.assertNotEqual(dsu.find("a"), dsu.find("b"))
+
+    def test_union_is_transitive(self):
+        dsu = DisjointSet()
+        dsu.union("a", "b")
+        dsu.union("c", "d")
+        self.assertNotEqual(dsu.find("a"), dsu.find("c"))
+
+        dsu.union("b", "c")
+        roots = {dsu.find(item) for item in "abcd"}
+        self.assertEqual(len(roots), 1)
+
+    def test_union_of_joined_items_keeps_root(self):
+        dsu = DisjointSet()
+        root = dsu.union("a", "b")
+        self.assertEqual(dsu.union("b", "a"), root)
+        self.assertEqual(dsu.size[root], 2)
+
+
+class TestGroupRedundancyIssues(unittest.TestCase):
+    def test_overlapping_rows_form_one_group(self):
+        rows = [
+            (0, ["a", "b"], "a and b are the same"),
+            (1, ["c", "d"], "c and d are the same"),
+            # Bridges the two groups above
+            (2, ["b", "c"], "b and c are the same"),
+            (3, ["x", "y"], "x and y are the same"),
+        ]
+
+        issues = group_redundancy_issues("redundancy_entity", rows)
+
+        self.assertEqual(len(issues), 2)
+        merged = next(issue for issue in issues if "a" in issue["affected_ids"])
+        self.assertEqual(merged["issue_type"], "redundancy_entity")
+        self.assertEqual(merged["affected_ids"], ["a", "b", "c", "d"])
+        self.assertEqual(sorted(merged["row_indexes"]), [0, 1, 2])
+        self.assertEqual(
+            merged["reasoning"].split("\n"),
+            ["a and b are the same", "c and d are the same", "b and c are the same"],
+        )
+        other = next(issue for issue in issues if "x" in issue["affected_ids"])
+        self.assertEqual(other["row_indexes"], [3])
+
+    def test_every_row_of_a_group_is_reported(self):
+        # A row whose ids are all covered by another row still has to be
+        # marked resolved with its group
+        rows = [
+            (10, ["a", "b", "c"], "three copies"),
+            (11, ["b", "c"], "two copies"),
+        ]
+
+        issues = group_redundancy_issues("redundancy_relationship", rows)
+
+        self.assertEqual(len(issues), 1)
+        self.assertEqual(issues[0]["affected_ids"], ["a", "b", "c"])
+        self.assertEqual(issues[0]["row_indexes"], [10, 11])
+
+    def test_duplicate_reasonings_are_kept_once(self):
+        rows = [(0, ["a", "b"], "same"), (1, ["b", "c"], "same")]
+
+        issues = group_redundancy_issues("redundancy_entity", rows)
+
+        self.assertEqual(issues[0]["reasoning"], "same")
+
+    def test_groups_of_one_id_and_empty_rows_are_dropped(self):
+        rows = [(0, ["a", "a"], "self duplicate"), (1, [], "nothing")]
+
+        self.assertEqual(group_redundancy_issues("redundancy_entity", rows), [])
+
+
+class TestResolvedRowMarking(unittest.TestCase):
+    def _issue_df(self):
+        return pd.DataFrame(
+            {
+                "issue_type": ["redundancy_entity"] * 4 + ["entity_quality_issue"],
+                "affected_ids": [["a", "b"], ["b", "c"], ["x", "y"], ["p", "q"], ["a"]],
+                "reasoning": ["r0", "r1", "r2", "r3", "r4"],
+                "confidence": [0.9, 1.8, 0.9, 0.5, 0.9],
+                "resolved": [False, False, True, False, False],
+            }
+        )
+
+    def test_pending_rows_skip_resolved_low_confidence_and_other_types(self):
+        issue_df = self._issue_df()
+
+        pending = pending_issue_rows(issue_df, "redundancy_entity")
+
+        self.assertEqual(list(pending.index), [0, 1])
+
+    def test_marking_a_group_resolves_all_its_rows(self):
+        issue_df = self._issue_df()
+        rows = [
+            (row.Index, row.affected_ids, row.reasoning)
+            for row in pending_issue_rows(issue_df, "redundancy_entity").itertuples()
+        ]
+
+        (issue,) = group_redundancy_issues("redundancy_entity", rows)
+        issue_df.loc[issue["row_indexes"], "resolved"] = True
+
+        self.assertEqual(list(issue_df["resolved"]), [True, True, True, False, False])
+        self.assertTrue(pending_issue_rows(issue_df, "redundancy_entity").empty)
+
+
+if __name__ == "__main__":
+    unittest.main()
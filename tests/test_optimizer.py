@@ -0,0 +1,91 @@
+import unittest
+from unittest.mock import Mock, patch
+
+from opt import optimizer
+
+
+class TestEntityPrefetchGeneration(unittest.TestCase):
+    """Tests for streaming entity generation with embedding prefetch"""
+
+    def test_stream_failing_midway_falls_back_to_generate(self):
+        # Providers swallow stream errors and yield them as a final chunk
+        llm_client = Mock()
+        llm_client.generate_stream.return_value = iter(
+            ['{"name": "TiDB", "descr', "Error: connection reset by peer"]
+        )
+        llm_client.generate.return_value = '{"name": "TiDB", "description": "db"}'
+
+        with patch.object(optimizer, "get_entity_description_embedding"):
+            response = optimizer._generate_entity_with_embedding_prefetch(
+                llm_client, "prompt", json_mode=True
+            )
+
+        self.assertEqual(response, '{"name": "TiDB", "description": "db"}')
+        llm_client.generate.assert_called_once_with("prompt", json_mode=True)
+
+    def test_complete_stream_is_returned_without_generate(self):
+        llm_client = Mock()
+        llm_client.generate_stream.return_value = iter(
+            ['{"name": "TiDB", ', '"description": "db"}']
+        )
+
+        with patch.object(optimizer, "get_entity_description_embedding"):
+            response = optimizer._generate_entity_with_embedding_prefetch(
+                llm_client, "prompt"
+            )
+
+        self.assertEqual(response, '{"name": "TiDB", "description": "db"}')
+        llm_client.generate.assert_not_called()
+
+    def test_unchanged_entity_is_not_embedded(self):
+        llm_client = Mock()
+        llm_client.generate_stream.return_value = iter(
+            ['{"name": "TiDB", ', '"description": "db"}']
+        )
+
+        with patch.object(optimizer, "get_entity_description_embedding") as embed:
+            optimizer._generate_entity_with_embedding_prefetch(
+                llm_client, "prompt", unchanged_texts={("TiDB", "db")}
+            )
+        embed.assert_not_called()
+
+        llm_client.generate_stream.return_value = iter(
+            ['{"name": "TiDB", ', '"description": "distributed db"}']
+        )
+        with patch.object(optimizer, "get_entity_description_embedding") as embed:
+            optimizer._generate_entity_with_embedding_prefetch(
+                llm_client, "prompt", unchanged_texts={("TiDB", "db")}
+            )
+        embed.assert_called_once_with("TiDB", "distributed db")
+
+
+class TestParseImprovement(unittest.TestCase):
+    def test_omitted_attributes_stay_omitted(self):
+        # A missing key means "keep the stored attributes", unlike an empty dict
+        response = (
+            '{"source_entity_name": "a", "target_entity_name": "b", '
+            '"relationship_desc": "a uses b"}'
+        )
+
+        result, repaired = optimizer._parse_improvement(
+            response, Mock(), optimizer.RefinedRelationship
+        )
+
+        self.assertNotIn("attributes", result)
+        self.assertFalse(repaired)
+
+    def test_given_attributes_are_kept(self):
+        response = (
+            '{"source_entity_name": "a", "target_entity_name": "b", '
+            '"relationship_desc": "a uses b", "attributes": {}}'
+        )
+
+        result, _ = optimizer._parse_improvement(
+            response, Mock(), optimizer.RefinedRelationship
+        )
+
+        self.assertEqual(result["attributes"], {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,50 @@
+import unittest
+
+from utils.uuid_utils import is_valid_uuid, normalize_uuid, validate_uuid_list
+
+UUID = "2d74d3d9-8f17-421c-a56b-0072472ad8a6"
+OTHER_UUID = "3e85e4ea-9028-432d-b67c-1183583be9b7"
+
+
+class TestIsValidUuid(unittest.TestCase):
+    def test_canonical_form_in_any_case(self):
+        self.assertTrue(is_valid_uuid(UUID))
+        self.assertTrue(is_valid_uuid(UUID.upper()))
+
+    def test_rejects_trailing_newline_and_surrounding_text(self):
+        self.assertFalse(is_valid_uuid(UUID + "\n"))
+        self.assertFalse(is_valid_uuid(" " + UUID))
+        self.assertFalse(is_valid_uuid(UUID + "0"))
+
+    def test_rejects_non_canonical_spellings(self):
+        for id_string in (
+            "{" + UUID + "}",
+            "urn:uuid:" + UUID,
+            UUID.replace("-", ""),
+        ):
+            self.assertFalse(is_valid_uuid(id_string), id_string)
+            self.assertEqual(normalize_uuid(id_string), UUID)
+
+    def test_rejects_non_strings(self):
+        for value in (None, 2, ["x"], {"id": UUID}):
+            self.assertFalse(is_valid_uuid(value))
+
+
+class TestValidateUuidList(unittest.TestCase):
+    def test_keeps_first_occurrence_of_valid_ids(self):
+        ids = [OTHER_UUID, "2", UUID, OTHER_UUID]
+
+        self.assertEqual(validate_uuid_list(ids, strict=False), [OTHER_UUID, UUID])
+
+    def test_drops_unhashable_entries(self):
+        ids = [UUID, ["x"], {"id": UUID}, UUID]
+
+        self.assertEqual(validate_uuid_list(ids, strict=False), [UUID])
+
+    def test_empty_input(self):
+        self.assertEqual(validate_uuid_list([]), [])
+        self.assertEqual(validate_uuid_list(None), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
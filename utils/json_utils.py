@@ -5,6 +5,53 @@ from typing import Optional, Tuple, Dict, Any
 
 logger = logging.getLogger(__name__)
 
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def dumps_compact(data: Any) -> str:
+    """
+    Serialize data to compact JSON text, using orjson when it is installed.
+
+    Intended for prompt and log payloads; output is not byte-stable across the
+    two backends, so do not use it for content that gets hashed.
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+
+
+def dumps_pretty(data: Any) -> str:
+    """
+    Serialize data to JSON indented by two spaces, using orjson when it is installed.
+
+    Same caveat as dumps_compact: meant for prompts, not for hashed content.
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(
+            data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+        ).decode("utf-8")
+    return json.dumps(data, indent=2, ensure_ascii=False)
+
+
+def fast_json_loads(json_str: str) -> Any:
+    """
+    Parse JSON text, trying orjson first.
+
+    Falls back to json.loads on failure so callers see the stdlib error
+    (and its messages) and inputs only json accepts (NaN, huge ints) still parse.
+    """
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.loads(json_str)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(json_str)
+
 
 def robust_json_parse(
     response: str, expected_format: str = "auto", llm_client=None
@@ -36,7 +83,7 @@ def robust_json_parse(
             json_str = extract_json_from_response(response)
 
         # Step 2: Try direct parsing first
-        return json.loads(json_str)
+        return fast_json_loads(json_str)
 
     except json.JSONDecodeError as e:
         error_msg = str(e)
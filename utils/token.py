@@ -1,5 +1,23 @@
+import functools
+import hashlib
+import threading
+from collections import OrderedDict
+
 import tiktoken
-from typing import List
+from typing import List, Tuple
+
+
+@functools.lru_cache(maxsize=None)
+def _get_encoding(model: str) -> tiktoken.Encoding:
+    return tiktoken.encoding_for_model(model)
+
+
+# The same relationship and source texts are counted repeatedly while building
+# optimization prompts for overlapping issues. Entries are keyed by a digest so
+# whole prompts counted once do not stay pinned in memory.
+_TOKEN_CACHE_SIZE = 8192
+_token_cache: OrderedDict[Tuple[bytes, str], int] = OrderedDict()
+_token_cache_lock = threading.Lock()
 
 
 def calculate_tokens(text: str, model: str = "gpt-4o") -> int:
@@ -10,8 +28,23 @@ def calculate_tokens(text: str, model: str = "gpt-4o") -> int:
     :param model: The model name to use for token counting (default: gpt-4o)
     :return: Number of tokens
     """
-    encoding = tiktoken.encoding_for_model(model)
-    return len(encoding.encode(text))
+    key = (
+        hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).digest(),
+        model,
+    )
+    with _token_cache_lock:
+        count = _token_cache.get(key)
+        if count is not None:
+            _token_cache.move_to_end(key)
+            return count
+
+    encoding = _get_encoding(model)
+    count = len(encoding.encode(text))
+    with _token_cache_lock:
+        _token_cache[key] = count
+        while len(_token_cache) > _TOKEN_CACHE_SIZE:
+            _token_cache.popitem(last=False)
+    return count
 
 
 def encode_text(text: str, model: str = "gpt-4o") -> List[int]:
@@ -22,7 +55,7 @@ def encode_text(text: str, model: str = "gpt-4o") -> List[int]:
     :param model: The model name to use for encoding (default: gpt-4o)
     :return: Token string
     """
-    encoding = tiktoken.encoding_for_model(model)
+    encoding = _get_encoding(model)
     return encoding.encode(text)
 
 
@@ -34,5 +67,5 @@ def decode_tokens(tokens: List[int], model: str = "gpt-4o") -> str:
     :param model: The model name to use for decoding (default: gpt-4o)
     :return: Text string
     """
-    encoding = tiktoken.encoding_for_model(model)
+    encoding = _get_encoding(model)
     return encoding.decode(tokens)
@@ -1,10 +1,18 @@
+import re
 import uuid
 from typing import List, Optional
 
+# Canonical hyphenated form only, as ids are stored; the braced, urn: and
+# hyphenless spellings uuid.UUID also parses are rejected, since they would
+# not match any stored id. Use normalize_uuid to convert those.
+_UUID_RE = re.compile(
+    r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}", re.IGNORECASE
+)
+
 
 def is_valid_uuid(id_string: str) -> bool:
     """
-    Validate if a string is a valid UUID format.
+    Validate if a string is a UUID in canonical hyphenated format.
 
     Args:
         id_string: String to validate
@@ -19,27 +27,28 @@ def is_valid_uuid(id_string: str) -> bool:
         False
         >>> is_valid_uuid("invalid-uuid")
         False
+        >>> is_valid_uuid("{2d74d3d9-8f17-421c-a56b-0072472ad8a6}")
+        False
     """
     if not isinstance(id_string, str):
         return False
 
-    try:
-        uuid.UUID(id_string)
-        return True
-    except (ValueError, TypeError):
-        return False
+    return _UUID_RE.fullmatch(id_string) is not None
 
 
 def validate_uuid_list(ids: List[str], strict: bool = True) -> List[str]:
     """
     Filter and return only valid UUIDs from a list of ID strings.
 
+    Duplicate IDs are dropped before validation; the first occurrence keeps
+    its position.
+
     Args:
         ids: List of ID strings to validate
         strict: If True, log warnings for invalid UUIDs
 
     Returns:
-        List[str]: List containing only valid UUID strings
+        List[str]: List containing only unique valid UUID strings
 
     Example:
         >>> validate_uuid_list(["2d74d3d9-8f17-421c-a56b-0072472ad8a6", "2", "invalid"])
@@ -55,7 +64,9 @@ def validate_uuid_list(ids: List[str], strict: bool = True) -> List[str]:
         elif strict:
             print(f"Warning: Skipping invalid UUID format: '{id_str}'")
 
-    return valid_ids
+    # Deduplicate only once the unhashable entries (e.g. lists in malformed
+    # LLM output) are filtered out
+    return list(dict.fromkeys(valid_ids))
 
 
 def validate_single_uuid(id_string: str, raise_error: bool = False) -> Optional[str]: